@@ -0,0 +1,519 @@
+"""
+════════════════════════════════════════════════════════════════
+SISTEMA DE TRADUCCIÓN ISOMÓRFICA — VERSIÓN PYTHON
+Extensión: Almacén persistente del Glosario (P8)
+════════════════════════════════════════════════════════════════
+
+PROPÓSITO:
+  Guardar el glosario en un archivo SQLite de forma incremental.
+
+PRINCIPIOS:
+  - Apertura inmediata: las entradas se cargan al primer acceso
+  - Solo se escriben las entradas modificadas (marcadas por el glosario)
+  - Ocurrencias en tramos de solo anexión: una sincronización escribe
+    las ocurrencias nuevas de cada token, no el arreglo completo
+  - Escrituras agrupadas en transacciones de hasta `lote` cambios
+  - Las entradas cargadas o modificadas se conservan en memoria
+
+ESQUEMA:
+  entradas    (token, categoria, token_tgt, status, margen, etiqueta,
+               func_roles JSON, traducciones_por_funcion JSON)
+  ocurrencias (token, desde, datos BLOB uint32 little-endian): tramo de
+               las ocurrencias del token a partir del índice `desde`
+  locuciones  (id, src, tgt, componentes JSON, posiciones JSON, status)
+  meta        (clave, valor)
+"""
+
+import sys
+import json
+import sqlite3
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from constants import TokenStatus, TokenCategoria, FuncRole
+from models import EntradaGlosario, Locucion
+
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS entradas (
+    token TEXT PRIMARY KEY,
+    categoria TEXT NOT NULL,
+    token_tgt TEXT,
+    status TEXT NOT NULL,
+    margen INTEGER NOT NULL,
+    etiqueta TEXT,
+    func_roles TEXT NOT NULL,
+    traducciones_por_funcion TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ocurrencias (
+    token TEXT NOT NULL,
+    desde INTEGER NOT NULL,
+    datos BLOB NOT NULL,
+    PRIMARY KEY (token, desde)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS locuciones (
+    orden INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    src TEXT NOT NULL,
+    tgt TEXT,
+    componentes TEXT NOT NULL,
+    posiciones TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+_COLUMNAS = (
+    "token, categoria, token_tgt, status, margen, etiqueta, "
+    "func_roles, traducciones_por_funcion"
+)
+
+
+class AlmacenError(Exception):
+    """Error del almacén del glosario"""
+    pass
+
+
+# ══════════════════════════════════════════════════════════════
+# ALMACÉN SQLITE
+# ══════════════════════════════════════════════════════════════
+
+class AlmacenGlosario(MutableMapping):
+    """
+    Mapeo token → EntradaGlosario respaldado por SQLite
+    
+    Sustituye al diccionario de entradas del glosario. Las entradas se
+    leen de la base al primer acceso y se guardan en caché; el glosario
+    marca las que modifica (marcar) y sincronizar() las escribe en una
+    sola transacción. Con `lote` cambios pendientes se sincroniza solo.
+    
+    Las ocurrencias solo crecen por el final (P8.A3): de cada token se
+    recuerda cuántas hay en la base y se anexa un tramo con las nuevas.
+    Una entrada reemplazada (asignación) reescribe sus tramos.
+    """
+    
+    # Cambios pendientes que disparan una sincronización
+    LOTE = 1000
+    
+    def __init__(self, ruta: str, lote: int = LOTE):
+        self.ruta = ruta
+        self.lote = max(1, lote)
+        self._conexion = sqlite3.connect(ruta)
+        try:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.executescript(_ESQUEMA)
+        except sqlite3.DatabaseError as e:
+            self._conexion.close()
+            raise AlmacenError(f"No es un almacén de glosario: {ruta}") from e
+        self._solo_lectura = False
+        self._cerrado = False
+        
+        self._cache: Dict[str, EntradaGlosario] = {}
+        self._modificadas: Set[str] = set()
+        self._eliminadas: Set[str] = set()
+        self._locuciones_nuevas: List[Locucion] = []
+        
+        # Ocurrencias: guardadas en la base por token, tokens con
+        # ocurrencias nuevas y tokens cuyos tramos hay que reescribir
+        self._persistidas: Dict[str, int] = {}
+        self._con_ocurrencias: Set[str] = set()
+        self._reescritas: Set[str] = set()
+        
+        (self._total,) = self._conexion.execute("SELECT COUNT(*) FROM entradas").fetchone()
+    
+    # ══════════════════════════════════════════════════════════
+    # MAPEO
+    # ══════════════════════════════════════════════════════════
+    
+    def __getitem__(self, token: str) -> EntradaGlosario:
+        entrada = self._cache.get(token)
+        if entrada is not None:
+            return entrada
+        if token in self._eliminadas:
+            raise KeyError(token)
+        
+        fila = self._conexion.execute(
+            f"SELECT {_COLUMNAS} FROM entradas WHERE token = ?", (token,)
+        ).fetchone()
+        if fila is None:
+            raise KeyError(token)
+        
+        entrada = _fila_a_entrada(fila, self._leer_ocurrencias(token))
+        self._cache[token] = entrada
+        self._persistidas[token] = len(entrada.ocurrencias)
+        return entrada
+    
+    def _leer_ocurrencias(self, token: str) -> array:
+        ocurrencias = array("I")
+        for (datos,) in self._conexion.execute(
+            "SELECT datos FROM ocurrencias WHERE token = ? ORDER BY desde", (token,)
+        ):
+            ocurrencias.frombytes(datos)
+        if sys.byteorder == "big":
+            ocurrencias.byteswap()
+        return ocurrencias
+    
+    def __contains__(self, token: object) -> bool:
+        if token in self._cache:
+            return True
+        if token in self._eliminadas:
+            return False
+        return self._conexion.execute(
+            "SELECT 1 FROM entradas WHERE token = ?", (token,)
+        ).fetchone() is not None
+    
+    def __setitem__(self, token: str, entrada: EntradaGlosario) -> None:
+        nueva = token not in self
+        if nueva:
+            self._total += 1
+        if nueva and token not in self._eliminadas:
+            # Sin tramos en la base: basta con anexar
+            self._persistidas[token] = 0
+            self._con_ocurrencias.add(token)
+        else:
+            self._reescritas.add(token)
+        self._cache[token] = entrada
+        self._eliminadas.discard(token)
+        self.marcar(token)
+    
+    def __delitem__(self, token: str) -> None:
+        if token not in self:
+            raise KeyError(token)
+        self._cache.pop(token, None)
+        self._modificadas.discard(token)
+        self._con_ocurrencias.discard(token)
+        self._reescritas.discard(token)
+        self._persistidas.pop(token, None)
+        self._eliminadas.add(token)
+        self._total -= 1
+        self._sincronizar_si_lleno()
+    
+    def __iter__(self) -> Iterator[str]:
+        # Orden de inserción (rowid); los cambios pendientes se escriben antes
+        self.sincronizar()
+        cursor = self._conexion.execute("SELECT token FROM entradas ORDER BY rowid")
+        
+        if not self._solo_lectura:
+            for (token,) in cursor:
+                yield token
+            return
+        
+        # Solo lectura: la base no refleja los cambios hechos en la copia
+        vistas = set()
+        for (token,) in cursor:
+            if token not in self._eliminadas:
+                vistas.add(token)
+                yield token
+        for token in list(self._cache):
+            if token not in vistas:
+                yield token
+    
+    def __len__(self) -> int:
+        return self._total
+    
+    def contar(self) -> Dict[Tuple[str, str], int]:
+        """Número de entradas por (categoría, status), calculado en SQLite"""
+        self.sincronizar()
+        return {
+            (categoria, status): cantidad
+            for categoria, status, cantidad in self._conexion.execute(
+                "SELECT categoria, status, COUNT(*) FROM entradas GROUP BY categoria, status"
+            )
+        }
+    
+    def iterar_sin_cache(self) -> Iterator[Tuple[str, EntradaGlosario]]:
+        """Recorrer todas las entradas sin guardarlas en la caché"""
+        self.sincronizar()
+        cursor = self._conexion.execute(f"SELECT {_COLUMNAS} FROM entradas ORDER BY rowid")
+        for fila in cursor:
+            if fila[0] in self._eliminadas:
+                continue
+            entrada = self._cache.get(fila[0])
+            if entrada is None:
+                entrada = _fila_a_entrada(fila, self._leer_ocurrencias(fila[0]))
+            yield fila[0], entrada
+        
+        if self._solo_lectura:
+            # La base no refleja las entradas agregadas en la copia
+            for token in [token for token in self._cache if token not in self._eliminadas]:
+                if self._conexion.execute(
+                    "SELECT 1 FROM entradas WHERE token = ?", (token,)
+                ).fetchone() is None:
+                    yield token, self._cache[token]
+    
+    def get(self, token: str, defecto: Any = None) -> Any:
+        try:
+            return self[token]
+        except KeyError:
+            return defecto
+    
+    def values(self):
+        return (self[token] for token in self)
+    
+    def items(self):
+        return ((token, self[token]) for token in self)
+    
+    # ══════════════════════════════════════════════════════════
+    # CAMBIOS PENDIENTES
+    # ══════════════════════════════════════════════════════════
+    
+    def marcar(self, token: str) -> None:
+        """Marcar entrada como modificada"""
+        self._modificadas.add(token)
+        self._sincronizar_si_lleno()
+    
+    def marcar_ocurrencias(self, token: str) -> None:
+        """
+        Marcar entrada con ocurrencias anexadas (el resto no cambia)
+        
+        No cuenta para el lote: las ocurrencias se escriben en la
+        siguiente sincronización explícita (p. ej. al sellar), en un
+        tramo por token.
+        """
+        self._con_ocurrencias.add(token)
+    
+    def marcar_locucion(self, locucion: Locucion) -> None:
+        """Marcar locución nueva"""
+        self._locuciones_nuevas.append(locucion)
+        self._sincronizar_si_lleno()
+    
+    def volcar(self, entradas: Dict[str, EntradaGlosario],
+               locuciones: List[Locucion]) -> None:
+        """Guardar un glosario completo en una sola transacción"""
+        self._cache.update(entradas)
+        self._modificadas.update(entradas)
+        self._reescritas.update(entradas)
+        self._locuciones_nuevas.extend(locuciones)
+        self.sincronizar()
+        (self._total,) = self._conexion.execute("SELECT COUNT(*) FROM entradas").fetchone()
+    
+    def pendientes(self) -> int:
+        """Entradas y locuciones pendientes (sin contar las ocurrencias)"""
+        return len(self._modificadas) + len(self._eliminadas) + len(self._locuciones_nuevas)
+    
+    def _sincronizar_si_lleno(self) -> None:
+        if self.pendientes() >= self.lote:
+            self.sincronizar(ocurrencias=False)
+    
+    def sincronizar(self, meta: Optional[Dict[str, Any]] = None,
+                    ocurrencias: bool = True) -> None:
+        """
+        Escribir los cambios pendientes en una transacción
+        
+        Con ocurrencias=False (sincronización por lote) las ocurrencias
+        anexadas siguen pendientes.
+        """
+        if self._solo_lectura:
+            return
+        ocurrencias = ocurrencias and bool(self._con_ocurrencias or self._reescritas)
+        if not self.pendientes() and not meta and not ocurrencias:
+            return
+        
+        with self._conexion:
+            if self._eliminadas:
+                eliminadas = [(token,) for token in self._eliminadas]
+                self._conexion.executemany("DELETE FROM entradas WHERE token = ?", eliminadas)
+                self._conexion.executemany("DELETE FROM ocurrencias WHERE token = ?", eliminadas)
+            if self._modificadas:
+                self._conexion.executemany(
+                    f"INSERT INTO entradas ({_COLUMNAS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(token) DO UPDATE SET "
+                    "categoria = excluded.categoria, token_tgt = excluded.token_tgt, "
+                    "status = excluded.status, margen = excluded.margen, "
+                    "etiqueta = excluded.etiqueta, func_roles = excluded.func_roles, "
+                    "traducciones_por_funcion = excluded.traducciones_por_funcion",
+                    [_entrada_a_fila(self._cache[token]) for token in self._modificadas]
+                )
+            if ocurrencias:
+                self._escribir_ocurrencias()
+            if self._locuciones_nuevas:
+                self._conexion.executemany(
+                    "INSERT INTO locuciones "
+                    "(id, src, tgt, componentes, posiciones, status) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET tgt = excluded.tgt, status = excluded.status",
+                    [(loc.id, loc.src, loc.tgt, json.dumps(loc.componentes, ensure_ascii=False),
+                      json.dumps(loc.posiciones), loc.status)
+                     for loc in self._locuciones_nuevas]
+                )
+            if meta:
+                self._conexion.executemany(
+                    "INSERT OR REPLACE INTO meta (clave, valor) VALUES (?, ?)",
+                    [(clave, json.dumps(valor)) for clave, valor in meta.items()]
+                )
+        
+        self._modificadas.clear()
+        self._eliminadas.clear()
+        self._locuciones_nuevas.clear()
+    
+    def _escribir_ocurrencias(self) -> None:
+        """Anexar tramos con las ocurrencias nuevas (reescribir los reemplazados)"""
+        reescritas = self._reescritas | (self._con_ocurrencias - self._persistidas.keys())
+        if reescritas:
+            self._conexion.executemany("DELETE FROM ocurrencias WHERE token = ?",
+                                       [(token,) for token in reescritas])
+            for token in reescritas:
+                self._persistidas[token] = 0
+        
+        tramos = []
+        for token in self._con_ocurrencias.union(reescritas):
+            ocurrencias = self._cache[token].ocurrencias
+            desde = self._persistidas[token]
+            if len(ocurrencias) > desde:
+                tramos.append((token, desde, _ocurrencias_a_bytes(ocurrencias[desde:])))
+                self._persistidas[token] = len(ocurrencias)
+        if tramos:
+            self._conexion.executemany(
+                "INSERT INTO ocurrencias (token, desde, datos) VALUES (?, ?, ?)", tramos
+            )
+        
+        self._con_ocurrencias.clear()
+        self._reescritas.clear()
+    
+    # ══════════════════════════════════════════════════════════
+    # LOCUCIONES Y METADATOS
+    # ══════════════════════════════════════════════════════════
+    
+    def cargar_locuciones(self) -> List[Locucion]:
+        """Locuciones guardadas, en orden de registro"""
+        return [
+            Locucion(id=loc_id, src=src, tgt=tgt,
+                     componentes=json.loads(componentes),
+                     posiciones=json.loads(posiciones),
+                     status=status)
+            for loc_id, src, tgt, componentes, posiciones, status in self._conexion.execute(
+                "SELECT id, src, tgt, componentes, posiciones, status FROM locuciones ORDER BY orden"
+            )
+        ]
+    
+    def cargar_meta(self) -> Dict[str, Any]:
+        return {
+            clave: json.loads(valor)
+            for clave, valor in self._conexion.execute("SELECT clave, valor FROM meta")
+        }
+    
+    # ══════════════════════════════════════════════════════════
+    # CICLO DE VIDA
+    # ══════════════════════════════════════════════════════════
+    
+    def cerrar(self) -> None:
+        if self._cerrado:
+            return
+        self.sincronizar()
+        self._conexion.close()
+        self._cerrado = True
+    
+    @property
+    def cerrado(self) -> bool:
+        return self._cerrado
+    
+    def separar(self) -> None:
+        """
+        Reabrir en solo lectura (copias del glosario en otros procesos)
+        
+        Una conexión SQLite no debe usarse tras un fork; la copia lee por
+        su propia conexión y no escribe nunca en la base.
+        """
+        self._conexion = sqlite3.connect(f"file:{self.ruta}?mode=ro", uri=True)
+        self._solo_lectura = True
+    
+    def lector(self) -> 'AlmacenGlosario':
+        """
+        Copia de solo lectura fijada en el estado sincronizado actual
+        
+        Abre una transacción de lectura: con WAL, la copia sigue viendo
+        este estado aunque el almacén siga escribiendo. La transacción
+        impide completar los checkpoints del WAL: liberar() cierra la
+        conexión cuando la suelta el último usuario (ver retener).
+        """
+        self.sincronizar()
+        copia = AlmacenGlosario.__new__(AlmacenGlosario)
+        copia.ruta = self.ruta
+        copia.lote = self.lote
+        copia._cache = {}
+        copia._modificadas = set()
+        copia._eliminadas = set()
+        copia._locuciones_nuevas = []
+        copia._persistidas = {}
+        copia._con_ocurrencias = set()
+        copia._reescritas = set()
+        copia._total = self._total
+        copia._cerrado = False
+        copia._retenciones = 0
+        copia.separar()
+        copia._conexion.execute("BEGIN")
+        copia._conexion.execute("SELECT COUNT(*) FROM entradas").fetchone()
+        return copia
+    
+    def retener(self) -> None:
+        """Sumar un usuario del lector"""
+        self._retenciones += 1
+    
+    def liberar(self) -> None:
+        """Restar un usuario del lector; el último cierra la conexión"""
+        self._retenciones -= 1
+        if self._retenciones <= 0:
+            self.cerrar()
+    
+    @property
+    def en_uso(self) -> bool:
+        return self._retenciones > 0
+    
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado["_conexion"]
+        return estado
+    
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.separar()
+
+
+# ══════════════════════════════════════════════════════════════
+# CONVERSIÓN DE FILAS
+# ══════════════════════════════════════════════════════════════
+
+def _ocurrencias_a_bytes(ocurrencias: array) -> bytes:
+    if sys.byteorder == "big":
+        ocurrencias = array("I", ocurrencias)
+        ocurrencias.byteswap()
+    return ocurrencias.tobytes()
+
+
+def _entrada_a_fila(entrada: EntradaGlosario) -> tuple:
+    return (
+        entrada.token_src,
+        entrada.categoria.name,
+        entrada.token_tgt,
+        entrada.status.name,
+        entrada.margen,
+        entrada.etiqueta,
+        json.dumps({str(pos): rol.name for pos, rol in entrada.func_roles.items()})
+        if entrada.func_roles else "{}",
+        json.dumps({rol.name: tgt for rol, tgt in entrada.traducciones_por_funcion.items()},
+                   ensure_ascii=False)
+        if entrada.traducciones_por_funcion else "{}"
+    )
+
+
+def _fila_a_entrada(fila: tuple, ocurrencias: array) -> EntradaGlosario:
+    (token, categoria, token_tgt, status, margen, etiqueta,
+     func_roles, traducciones) = fila
+    
+    return EntradaGlosario(
+        token_src=token,
+        categoria=TokenCategoria[categoria],
+        token_tgt=token_tgt,
+        status=TokenStatus[status],
+        margen=margen,
+        ocurrencias=ocurrencias,
+        func_roles={int(pos): FuncRole[rol] for pos, rol in json.loads(func_roles).items()},
+        etiqueta=etiqueta,
+        traducciones_por_funcion={
+            FuncRole[rol]: tgt for rol, tgt in json.loads(traducciones).items()
+        }
+    )
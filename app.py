@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from io import StringIO
 from sti_lib import STI_Core, ProtocoloError
+from busqueda import IndiceBusqueda
 
 st.set_page_config(page_title="STI v2.0", layout="wide")
 st.title("Sistema de Traducción Isomórfica v2.0")
@@ -9,6 +10,9 @@ st.title("Sistema de Traducción Isomórfica v2.0")
 # Inicializar Memoria
 if 'sti' not in st.session_state:
     st.session_state.sti = STI_Core()
+# Índice de búsqueda (None = reconstruir tras cambios en el glosario)
+if 'indice_busqueda' not in st.session_state:
+    st.session_state.indice_busqueda = None
 
 # --- SIDEBAR ---
 st.sidebar.header("Control P11")
@@ -25,10 +29,12 @@ if st.sidebar.button("Ejecutar"):
                 "token_src": t.strip(), "token_tgt": trad.strip(),
                 "categoria": "NUCLEO", "status": "ASIGNADO", "ocurrencias": []
             }
+            st.session_state.indice_busqueda = None
             st.sidebar.success(f"Añadido: {t.strip()}")
         except: st.sidebar.error("Error de formato.")
     elif "[REINICIAR]" in cmd:
         st.session_state.sti = STI_Core()
+        st.session_state.indice_busqueda = None
         st.rerun()
 
 # Carga de Glosario TXT
@@ -42,6 +48,7 @@ if uploaded:
                 "token_src": t.strip(), "token_tgt": trad.strip(),
                 "categoria": "NUCLEO", "status": "ASIGNADO", "ocurrencias": []
             }
+    st.session_state.indice_busqueda = None
     st.sidebar.success("Glosario importado.")
 
 # --- FASE 1: INPUT ---
@@ -50,6 +57,7 @@ txt = st.text_area("Texto Fuente:", height=100)
 if st.button("Iniciar (P10.A + P8.A)"):
     st.session_state.sti.p10_a_limpieza(txt)
     msg = st.session_state.sti.p8_a_analisis_lexico()
+    st.session_state.indice_busqueda = None
     st.success(msg)
 
 # --- FASE 2: GLOSARIO ---
@@ -61,19 +69,40 @@ if st.session_state.sti.glossary:
         key = st.text_input("API Key Gemini:", type="password")
         if st.button("Ejecutar IA") and key:
             res = st.session_state.sti.p8_ia_autocompletar(key)
+            st.session_state.indice_busqueda = None
             st.success(res)
             st.rerun()
 
+    # BÚSQUEDA (token, traducción o lema; sin diacríticos)
+    consulta = st.text_input("🔍 Buscar:", placeholder="haqq, verdad...")
+    if consulta:
+        if st.session_state.indice_busqueda is None:
+            st.session_state.indice_busqueda = IndiceBusqueda(
+                (t, e.get("token_tgt")) for t, e in st.session_state.sti.glossary.items()
+            )
+        tokens = [t for t, _ in st.session_state.indice_busqueda.buscar(consulta, limite=200)]
+        filas = {t: st.session_state.sti.glossary[t] for t in tokens}
+    else:
+        filas = st.session_state.sti.glossary
+
     # EDITOR
-    df = pd.DataFrame.from_dict(st.session_state.sti.glossary, orient='index')
+    df = pd.DataFrame.from_dict(filas, orient='index', columns=['categoria', 'token_tgt', 'status'])
     edited = st.data_editor(df[['categoria', 'token_tgt', 'status']], use_container_width=True)
     
     if st.button("Guardar Cambios Manuales"):
-        for t, row in edited.iterrows():
-            st.session_state.sti.glossary[t]['token_tgt'] = row['token_tgt']
-            st.session_state.sti.glossary[t]['categoria'] = row['categoria']
-            if row['token_tgt']: st.session_state.sti.glossary[t]['status'] = "ASIGNADO"
-        st.success("Guardado.")
+        # Solo filas modificadas (comparación por columnas, sin recorrer filas)
+        antes = df[['categoria', 'token_tgt']].fillna("")
+        despues = edited[['categoria', 'token_tgt']].fillna("")
+        cambiadas = (antes != despues).any(axis=1) | ((despues['token_tgt'] != "") != (edited['status'] == "ASIGNADO"))
+        filas_cambiadas = despues[cambiadas]
+        try:
+            n = st.session_state.sti.p8_aplicar_cambios(
+                zip(filas_cambiadas.index, filas_cambiadas['token_tgt'], filas_cambiadas['categoria'])
+            )
+            st.session_state.indice_busqueda = None
+            st.success(f"Guardado ({n} cambios).")
+        except ProtocoloError as e:
+            st.error(f"⛔ {e}")
 
 # --- FASE 3: TRADUCCION ---
 st.header("3. Traducción")
@@ -0,0 +1,89 @@
+"""
+════════════════════════════════════════════════════════════════
+SISTEMA DE TRADUCCIÓN ISOMÓRFICA — VERSIÓN PYTHON
+Herramienta: Medición de memoria del modelo de datos
+════════════════════════════════════════════════════════════════
+
+PROPÓSITO:
+  Medir memoria y número de asignaciones por token al construir las
+  matrices (Mtx_S, Mtx_T) y el glosario de un documento largo.
+
+USO:
+  python bench_memoria.py [oraciones]
+"""
+
+import sys
+import tracemalloc
+
+from constants import TokenCategoria
+from models import MatrizFuente, MatrizTarget
+from glossary import Glosario
+from nucleos import crear_slot_n
+from particulas import crear_slot_p
+from utils import Tokenizador, ClasificadorGramatical
+
+
+# Oración de muestra (se repite para formar el documento)
+_ORACION = "Inna al ʿaql wa al nafs fi al wujūd wa al ḥaqq min al kalima"
+
+
+def _medir(funcion, *args):
+    """Ejecutar función y devolver (resultado, bytes retenidos, bloques retenidos)"""
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    resultado = funcion(*args)
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    
+    diferencias = despues.compare_to(antes, "filename")
+    total_bytes = sum(d.size_diff for d in diferencias)
+    total_bloques = sum(d.count_diff for d in diferencias)
+    return resultado, total_bytes, total_bloques
+
+
+def _construir_matrices(oraciones):
+    """Mtx_S y Mtx_T de cada oración (se retienen todas)"""
+    matrices = []
+    for oracion in oraciones:
+        mtx_s = MatrizFuente()
+        for i, token in enumerate(Tokenizador.tokenizar(oracion)):
+            cat, cat_gram = ClasificadorGramatical.clasificar(token)
+            mtx_s.agregar_celda(token, i)
+            if cat == TokenCategoria.NUCLEO:
+                mtx_s.agregar_slot_n(crear_slot_n(token, cat_gram, i))
+            else:
+                mtx_s.agregar_slot_p(crear_slot_p(token, cat_gram, i))
+        matrices.append((mtx_s, MatrizTarget(mtx_s.size())))
+    return matrices
+
+
+def _construir_glosario(tokens_clasificados):
+    """Registro A3 de todos los tokens"""
+    glosario = Glosario()
+    glosario._a3_registrar_tokens(tokens_clasificados)
+    return glosario
+
+
+def main():
+    num_oraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    oraciones = [_ORACION] * num_oraciones
+    tokens_clasificados = [
+        (token, *ClasificadorGramatical.clasificar(token))
+        for oracion in oraciones
+        for token in Tokenizador.tokenizar(oracion)
+    ]
+    num_tokens = len(tokens_clasificados)
+    
+    print(f"Documento: {num_oraciones} oraciones, {num_tokens} tokens\n")
+    
+    _, total_bytes, total_bloques = _medir(_construir_matrices, oraciones)
+    print(f"Matrices:  {total_bytes / num_tokens:8.1f} bytes/token  "
+          f"{total_bloques / num_tokens:6.2f} asignaciones/token")
+    
+    _, total_bytes, total_bloques = _medir(_construir_glosario, tokens_clasificados)
+    print(f"Glosario:  {total_bytes / num_tokens:8.1f} bytes/token  "
+          f"{total_bloques / num_tokens:6.2f} asignaciones/token")
+
+
+if __name__ == "__main__":
+    main()
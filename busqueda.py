@@ -0,0 +1,189 @@
+"""
+════════════════════════════════════════════════════════════════
+SISTEMA DE TRADUCCIÓN ISOMÓRFICA — VERSIÓN PYTHON
+Extensión: Búsqueda en el Glosario (P8 / P11)
+════════════════════════════════════════════════════════════════
+
+PROPÓSITO:
+  Localizar entradas del glosario por prefijo del token fuente
+  (transliterado), por prefijo de la traducción, por lema y, si no hay
+  coincidencias, de forma aproximada.
+
+PRINCIPIOS:
+  - Formas plegadas: transliteración DIN 31635, sin diacríticos
+    (ḥ → h, ā → a), sin ʿ/ʾ y en minúsculas; "ʿaql" y "aql" coinciden
+  - Esqueleto consonántico para los tokens en escritura árabe, que sin
+    vocalizar no tienen vocales breves: "عقل" → "ql" se encuentra con
+    "aql" y "كتاب" → "ktb" con "kitab" (ver esqueleto)
+  - Listas ordenadas (forma plegada, token): un prefijo es un rango
+    localizado con bisect, en O(log n + resultados)
+  - Mantenimiento incremental: altas y bajas sin reconstruir
+  - Búsqueda aproximada (difflib) solo como último recurso y limitada
+    a las formas con la misma inicial
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from difflib import get_close_matches
+from typing import Iterable, List, Optional, Tuple
+
+from constants import NormaTransliteracion
+from formacion import SistemaTransliteracion
+
+
+# Transliterador propio: las claves no dependen de la norma activa
+_TRANSLITERADOR = SistemaTransliteracion(NormaTransliteracion.DIN_31635)
+
+# Marcas combinantes (tras NFD) y signos de ʿayn/hamza
+_DIACRITICOS = re.compile(r"[\u0300-\u036f]")
+_SIN_SIGNOS = str.maketrans("", "", "ʿʾʻʼ'’`")
+
+# Carácter mayor que cualquier continuación de un prefijo
+_FIN_PREFIJO = "\U0010ffff"
+
+# Esqueleto consonántico: dígrafos habituales → letra DIN plegada,
+# y fuera vocales, w/y no iniciales (ū, ī, matres lectionis) y signos
+_ARABE = re.compile(r"[\u0600-\u06ff]")
+_DIGRAFOS = re.compile(r"kh|sh|th|dh|gh|j")
+_LETRA_DIGRAFO = {"kh": "h", "sh": "s", "th": "t", "dh": "d", "gh": "g", "j": "g"}
+_NO_CONSONANTES = re.compile(r"[aeiou]|(?<=.)[wy]|[^a-z]")
+
+
+def plegar(texto: str) -> str:
+    """Forma de búsqueda: transliterada, sin diacríticos ni ʿ/ʾ, en minúsculas"""
+    texto = unicodedata.normalize("NFD", _TRANSLITERADOR.transliterar(texto))
+    return _DIACRITICOS.sub("", texto).translate(_SIN_SIGNOS).lower()
+
+
+def esqueleto(texto: str) -> str:
+    """
+    Forma consonántica de búsqueda: "ʿaql", "aql" y "عقل" → "ql";
+    "wujūd", "wujud" y "وجود" → "wgd"
+    """
+    texto = _DIGRAFOS.sub(lambda m: _LETRA_DIGRAFO[m.group()], plegar(texto))
+    return _NO_CONSONANTES.sub("", texto)
+
+
+def plegar_lema(texto: str) -> str:
+    """Forma de búsqueda del lema (sin vocales de caso finales)"""
+    return plegar(_TRANSLITERADOR.normalizar_lema(texto))
+
+
+# ══════════════════════════════════════════════════════════════
+# ÍNDICE
+# ══════════════════════════════════════════════════════════════
+
+class IndiceBusqueda:
+    """
+    Índice de búsqueda sobre pares (token fuente, traducción)
+    
+    Tipos de coincidencia devueltos:
+      FUENTE      prefijo del token fuente
+      TRADUCCION  prefijo de la traducción
+      LEMA        prefijo del lema de la consulta
+      ESQUELETO   prefijo consonántico de un token en escritura árabe
+      APROXIMADA  forma fuente parecida (sin coincidencias exactas)
+    """
+    
+    # Similitud mínima de la búsqueda aproximada (difflib)
+    SIMILITUD_MINIMA = 0.75
+    
+    def __init__(self, pares: Iterable[Tuple[str, Optional[str]]] = ()):
+        self._fuente: List[Tuple[str, str]] = []
+        self._traduccion: List[Tuple[str, str]] = []
+        self._esqueleto: List[Tuple[str, str]] = []  # Solo tokens en escritura árabe
+        
+        for token, tgt in pares:
+            self._fuente.append((plegar(token), token))
+            if tgt:
+                self._traduccion.append((plegar(tgt), token))
+            if _ARABE.search(token):
+                self._esqueleto.append((esqueleto(token), token))
+        
+        self._fuente.sort()
+        self._traduccion.sort()
+        self._esqueleto.sort()
+    
+    def __len__(self) -> int:
+        return len(self._fuente)
+    
+    def agregar(self, token: str, tgt: Optional[str]) -> None:
+        insort(self._fuente, (plegar(token), token))
+        if tgt:
+            insort(self._traduccion, (plegar(tgt), token))
+        if _ARABE.search(token):
+            insort(self._esqueleto, (esqueleto(token), token))
+    
+    def quitar(self, token: str, tgt: Optional[str]) -> None:
+        _quitar(self._fuente, (plegar(token), token))
+        if tgt:
+            _quitar(self._traduccion, (plegar(tgt), token))
+        if _ARABE.search(token):
+            _quitar(self._esqueleto, (esqueleto(token), token))
+    
+    def buscar(self, consulta: str, limite: int = 20,
+               aproximada: bool = True) -> List[Tuple[str, str]]:
+        """
+        Buscar tokens
+        
+        Returns:
+            Lista de (token, tipo de coincidencia), sin repetidos, en
+            orden FUENTE, TRADUCCION, LEMA, ESQUELETO, APROXIMADA
+        """
+        clave = plegar(consulta.strip())
+        if not clave:
+            return []
+        
+        resultados: List[Tuple[str, str]] = []
+        vistos = set()
+        
+        def _agregar(tokens: Iterable[str], tipo: str) -> None:
+            for token in tokens:
+                if len(resultados) >= limite:
+                    return
+                if token not in vistos:
+                    vistos.add(token)
+                    resultados.append((token, tipo))
+        
+        _agregar(_prefijo(self._fuente, clave, limite), "FUENTE")
+        _agregar(_prefijo(self._traduccion, clave, limite), "TRADUCCION")
+        
+        lema = plegar_lema(consulta.strip())
+        if lema and lema != clave:
+            _agregar(_prefijo(self._fuente, lema, limite), "LEMA")
+        
+        if self._esqueleto:
+            consonantes = esqueleto(consulta.strip())
+            if consonantes:
+                _agregar(_prefijo(self._esqueleto, consonantes, limite), "ESQUELETO")
+        
+        if not resultados and aproximada:
+            _agregar(self._aproximados(clave, limite), "APROXIMADA")
+        
+        return resultados
+    
+    def _aproximados(self, clave: str, limite: int) -> List[str]:
+        """Formas fuente parecidas a la clave, entre las de la misma inicial"""
+        inicio = bisect_left(self._fuente, (clave[0],))
+        fin = bisect_left(self._fuente, (clave[0] + _FIN_PREFIJO,))
+        formas = {}
+        for forma, token in self._fuente[inicio:fin]:
+            formas.setdefault(forma, []).append(token)
+        
+        parecidas = get_close_matches(clave, formas.keys(), n=limite,
+                                      cutoff=self.SIMILITUD_MINIMA)
+        return [token for forma in parecidas for token in formas[forma]]
+
+
+def _prefijo(lista: List[Tuple[str, str]], clave: str, limite: int) -> Iterable[str]:
+    """Tokens cuya forma plegada empieza por la clave (como mucho `limite`)"""
+    inicio = bisect_left(lista, (clave,))
+    fin = bisect_left(lista, (clave + _FIN_PREFIJO,), lo=inicio)
+    return [token for _, token in lista[inicio:min(fin, inicio + limite)]]
+
+
+def _quitar(lista: List[Tuple[str, str]], par: Tuple[str, str]) -> None:
+    i = bisect_left(lista, par)
+    if i < len(lista) and lista[i] == par:
+        del lista[i]
@@ -0,0 +1,183 @@
+"""
+════════════════════════════════════════════════════════════════
+SISTEMA DE TRADUCCIÓN ISOMÓRFICA — VERSIÓN PYTHON
+Extensión: Caché de oraciones traducidas (P3-P7)
+════════════════════════════════════════════════════════════════
+
+PROPÓSITO:
+  Evitar repetir P3-P7 en oraciones que ya se tradujeron en las mismas
+  condiciones (corpus con fórmulas repetidas).
+
+PRINCIPIOS:
+  - Direccionada por contenido: la clave reúne los tokens de la oración,
+    la huella en el glosario de cada token (entrada y locuciones de las
+    que es componente) y el contexto de configuración (modos, reglas,
+    léxico). Cualquier cambio en una entrada implicada cambia la clave:
+    la invalidación es exacta y no hace falta borrar nada
+  - Cada valor guarda la oración traducida y las escrituras de Fase B
+    que produjo; en un acierto se reaplican, de modo que el glosario
+    queda como lo dejaría la traducción completa
+  - Memoria con desalojo LRU (CacheLRU) y nivel opcional en disco
+    (SQLite), también LRU, compartido entre sesiones
+
+ESQUEMA (disco):
+  oraciones  (clave BLOB, traduccion, escrituras JSON, uso)
+"""
+
+import json
+import sqlite3
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+
+from constants import FuncRole
+from glossary import EscrituraFaseB
+from utils import CacheLRU
+
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS oraciones (
+    clave BLOB PRIMARY KEY,
+    traduccion TEXT NOT NULL,
+    escrituras TEXT NOT NULL,
+    uso INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS oraciones_uso ON oraciones (uso);
+"""
+
+# Oración traducida y escrituras de Fase B que produjo
+ValorCache = Tuple[str, Tuple[EscrituraFaseB, ...]]
+
+
+# ══════════════════════════════════════════════════════════════
+# CACHÉ
+# ══════════════════════════════════════════════════════════════
+
+class CacheOraciones:
+    """
+    Caché de oraciones: memoria LRU + disco opcional
+    
+    Las claves se reducen a un resumen BLAKE2b de 16 bytes de su repr
+    (tuplas de str, int y None: repr estable entre sesiones).
+    """
+    
+    # Oraciones en memoria por defecto
+    CAPACIDAD = 20000
+    
+    # Oraciones en disco por defecto
+    CAPACIDAD_DISCO = 1000000
+    
+    def __init__(self, capacidad: int = CAPACIDAD, ruta: Optional[str] = None,
+                 capacidad_disco: int = CAPACIDAD_DISCO):
+        self._memoria = CacheLRU(capacidad)
+        self.aciertos: int = 0
+        self.fallos: int = 0
+        
+        # Nivel en disco
+        self.ruta = ruta
+        self.capacidad_disco = max(1, capacidad_disco)
+        self._conexion: Optional[sqlite3.Connection] = None
+        self._uso: int = 0
+        if ruta:
+            self._conexion = sqlite3.connect(ruta)
+            self._conexion.executescript(_ESQUEMA)
+            fila = self._conexion.execute("SELECT MAX(uso) FROM oraciones").fetchone()
+            self._uso = fila[0] or 0
+    
+    def __len__(self) -> int:
+        return len(self._memoria)
+    
+    def obtener(self, clave: Tuple) -> Optional[ValorCache]:
+        """Valor guardado para la clave (primero en memoria, luego en disco)"""
+        resumen = _resumir(clave)
+        valor = self._memoria.obtener(resumen)
+        
+        if valor is None and self._conexion is not None:
+            fila = self._conexion.execute(
+                "SELECT traduccion, escrituras FROM oraciones WHERE clave = ?", (resumen,)
+            ).fetchone()
+            if fila is not None:
+                valor = (fila[0], _cargar_escrituras(fila[1]))
+                self._memoria.guardar(resumen, valor)
+                self._tocar(resumen)
+        
+        if valor is None:
+            self.fallos += 1
+        else:
+            self.aciertos += 1
+        return valor
+    
+    def guardar(self, clave: Tuple, traduccion: str,
+                escrituras: List[EscrituraFaseB]) -> None:
+        resumen = _resumir(clave)
+        self._memoria.guardar(resumen, (traduccion, tuple(escrituras)))
+        
+        if self._conexion is not None:
+            self._uso += 1
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO oraciones (clave, traduccion, escrituras, uso) "
+                "VALUES (?, ?, ?, ?)",
+                (resumen, traduccion, _volcar_escrituras(escrituras), self._uso)
+            )
+    
+    def _tocar(self, resumen: bytes) -> None:
+        self._uso += 1
+        self._conexion.execute("UPDATE oraciones SET uso = ? WHERE clave = ?",
+                               (self._uso, resumen))
+    
+    def sincronizar(self) -> None:
+        """Confirmar en disco y desalojar las oraciones usadas hace más tiempo"""
+        if self._conexion is None:
+            return
+        with self._conexion:
+            sobrantes = self._conexion.execute(
+                "SELECT COUNT(*) FROM oraciones"
+            ).fetchone()[0] - self.capacidad_disco
+            if sobrantes > 0:
+                self._conexion.execute(
+                    "DELETE FROM oraciones WHERE clave IN "
+                    "(SELECT clave FROM oraciones ORDER BY uso LIMIT ?)", (sobrantes,)
+                )
+    
+    def cerrar(self) -> None:
+        if self._conexion is not None:
+            self.sincronizar()
+            self._conexion.close()
+            self._conexion = None
+    
+    def limpiar(self) -> None:
+        """Vaciar la memoria (el disco y los contadores se conservan)"""
+        self._memoria.limpiar()
+    
+    def tasa_aciertos(self) -> float:
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+    
+    def estadisticas(self) -> Dict[str, int]:
+        return {
+            "tamano": len(self._memoria),
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self._memoria.desalojos
+        }
+
+
+# ══════════════════════════════════════════════════════════════
+# FUNCIONES DE AYUDA
+# ══════════════════════════════════════════════════════════════
+
+def _resumir(clave: Tuple) -> bytes:
+    return blake2b(repr(clave).encode("utf-8"), digest_size=16).digest()
+
+
+def _volcar_escrituras(escrituras: List[EscrituraFaseB]) -> str:
+    return json.dumps([
+        [token, tgt, margen, etiqueta, func_role.name if func_role else None]
+        for token, tgt, margen, etiqueta, func_role in escrituras
+    ], ensure_ascii=False)
+
+
+def _cargar_escrituras(datos: str) -> Tuple[EscrituraFaseB, ...]:
+    return tuple(
+        (token, tgt, margen, etiqueta, FuncRole[func_role] if func_role else None)
+        for token, tgt, margen, etiqueta, func_role in json.loads(datos)
+    )
@@ -24,10 +24,12 @@ from dataclasses import dataclass
 
 from constants import (
     TokenStatus, TokenCategoria, CategoriaGramatical,
-    Reason, ConsultaCodigo, SUFIJOS, MARGEN_VALORES
+    Reason, ConsultaCodigo, SUFIJOS, MARGEN_VALORES,
+    NormaTransliteracion
 )
 from models import SlotN, Locucion, Consulta, Opcion
 from glossary import Glosario
+from formacion import SistemaTransliteracion
 
 
 # ══════════════════════════════════════════════════════════════
@@ -61,69 +63,23 @@ class ResultadoCasoDificil:
 class Transliterador:
     """
     Sistema de transliteración DIN 31635 (default)
+    
+    Usa la tabla compilada de P9.A (SistemaTransliteracion), única fuente
+    del mapa DIN 31635.
     """
     
-    # Mapeo de caracteres árabes a latino (DIN 31635)
-    _MAPA_DIN_31635 = {
-        'ء': 'ʾ',
-        'ا': 'ā',
-        'ب': 'b',
-        'ت': 't',
-        'ث': 'ṯ',
-        'ج': 'ǧ',
-        'ح': 'ḥ',
-        'خ': 'ḫ',
-        'د': 'd',
-        'ذ': 'ḏ',
-        'ر': 'r',
-        'ز': 'z',
-        'س': 's',
-        'ش': 'š',
-        'ص': 'ṣ',
-        'ض': 'ḍ',
-        'ط': 'ṭ',
-        'ظ': 'ẓ',
-        'ع': 'ʿ',
-        'غ': 'ġ',
-        'ف': 'f',
-        'ق': 'q',
-        'ك': 'k',
-        'ل': 'l',
-        'م': 'm',
-        'ن': 'n',
-        'ه': 'h',
-        'و': 'w',
-        'ي': 'y',
-        'ة': 'a',
-        'ى': 'ā',
-        # Vocales cortas (diacríticos)
-        'َ': 'a',
-        'ُ': 'u',
-        'ِ': 'i',
-        # Vocales largas ya incluidas
-    }
+    _NORMA = NormaTransliteracion.DIN_31635
     
     @classmethod
     def transliterar(cls, texto: str) -> str:
         """Transliterar texto árabe a latino"""
-        resultado = []
-        for char in texto:
-            if char in cls._MAPA_DIN_31635:
-                resultado.append(cls._MAPA_DIN_31635[char])
-            elif char.isascii():
-                resultado.append(char)
-            else:
-                resultado.append(char)  # Mantener si no está en mapa
-        return ''.join(resultado)
+        return texto.translate(SistemaTransliteracion.tabla(cls._NORMA))
     
     @classmethod
     def es_ya_transliterado(cls, texto: str) -> bool:
         """Verificar si el texto ya está transliterado"""
         # Si contiene caracteres árabes, no está transliterado
-        for char in texto:
-            if char in cls._MAPA_DIN_31635:
-                return False
-        return True
+        return SistemaTransliteracion.patron(cls._NORMA).search(texto) is None
 
 
 # ══════════════════════════════════════════════════════════════
@@ -516,7 +472,7 @@ class ProcesadorCasosDificiles:
         n_base = "-".join(partes_etym)
         
         # Actualizar locución
-        locucion.tgt = n_base
+        glosario.asignar_locucion(locucion.id, n_base)
         
         return ResultadoCasoDificil(
             n_base=n_base,
@@ -12,17 +12,20 @@ INVOCACIÓN:
   [COMANDO] o "comando" (minúsculas)
 """
 
+import io
+import os
 import re
-from typing import Dict, List, Optional, Any, Callable, Tuple
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Any, Callable, Iterable, Pattern, Tuple
 from dataclasses import dataclass
 from enum import Enum, auto
 
 from constants import (
     ModoTransliteracion, NormaTransliteracion, ModoSalida,
-    TokenCategoria
+    TokenCategoria, TokenStatus
 )
 from config import obtener_config, ConfiguracionSistema
-from glossary import Glosario
+from glossary import Glosario, GlosarioError
 from consultas import GestorConsultas, obtener_gestor_consultas
 from models import EstadoProceso
 
@@ -73,9 +76,9 @@ COMANDOS = {
         nombre="GLOSARIO",
         aliases=["glosario", "g"],
         categoria=CategoriaComando.CONSULTA,
-        descripcion="Mostrar estado actual del glosario",
-        uso="[GLOSARIO]",
-        ejemplo="[GLOSARIO]"
+        descripcion="Mostrar estado actual del glosario (paginado)",
+        uso="[GLOSARIO [página|más] [pendiente|asignado|bloqueado] [prefijo*]]",
+        ejemplo="[GLOSARIO 2 pendiente al*]"
     ),
     "LOCUCIONES": DefinicionComando(
         nombre="LOCUCIONES",
@@ -89,9 +92,17 @@ COMANDOS = {
         nombre="ALTERNATIVAS",
         aliases=["alternativas", "alt"],
         categoria=CategoriaComando.CONSULTA,
-        descripcion="Mostrar opciones para términos de alto margen",
-        uso="[ALTERNATIVAS]",
-        ejemplo="[ALTERNATIVAS]"
+        descripcion="Mostrar opciones para términos de alto margen (paginado)",
+        uso="[ALTERNATIVAS [página|más] [prefijo*]]",
+        ejemplo="[ALTERNATIVAS más]"
+    ),
+    "BUSCA": DefinicionComando(
+        nombre="BUSCA",
+        aliases=["busca", "buscar"],
+        categoria=CategoriaComando.CONSULTA,
+        descripcion="Buscar en el glosario por token, traducción o lema (sin diacríticos)",
+        uso="[BUSCA texto]",
+        ejemplo="[BUSCA haqq]"
     ),
     "DECISIONES": DefinicionComando(
         nombre="DECISIONES",
@@ -254,8 +265,8 @@ COMANDOS = {
         aliases=["exportar glosario", "export glos"],
         categoria=CategoriaComando.EXPORTACION,
         descripcion="Exportar glosario",
-        uso="[EXPORTAR GLOSARIO txt|csv|json]",
-        ejemplo="[EXPORTAR GLOSARIO json]"
+        uso="[EXPORTAR GLOSARIO txt|csv|json|jsonl [ruta]]",
+        ejemplo="[EXPORTAR GLOSARIO jsonl glosario.jsonl]"
     ),
     "EXPORTAR_TRADUCCION": DefinicionComando(
         nombre="EXPORTAR TRADUCCION",
@@ -265,13 +276,21 @@ COMANDOS = {
         uso="[EXPORTAR TRADUCCION txt|md]",
         ejemplo="[EXPORTAR TRADUCCION md]"
     ),
+    "FUSIONAR_GLOSARIO": DefinicionComando(
+        nombre="FUSIONAR GLOSARIO",
+        aliases=["fusionar glosario", "fusion glos"],
+        categoria=CategoriaComando.EXPORTACION,
+        descripcion="Fusionar un glosario previo (conflictos de sinonimia en bloque)",
+        uso="[FUSIONAR GLOSARIO ruta.json|ruta.jsonl|ruta.csv|ruta.db]",
+        ejemplo="[FUSIONAR GLOSARIO volumen1.jsonl]"
+    ),
     "IMPORTAR_GLOSARIO": DefinicionComando(
         nombre="IMPORTAR GLOSARIO",
         aliases=["importar glosario", "import glos"],
         categoria=CategoriaComando.EXPORTACION,
         descripcion="Importar glosario",
-        uso="[IMPORTAR GLOSARIO fuente]",
-        ejemplo="[IMPORTAR GLOSARIO glosario_anterior.json]"
+        uso="[IMPORTAR GLOSARIO ruta.json|ruta.jsonl|ruta.csv]",
+        ejemplo="[IMPORTAR GLOSARIO glosario_anterior.jsonl]"
     ),
     
     # ══════════════════════════════════════════════════════════
@@ -304,6 +323,39 @@ COMANDOS = {
 }
 
 
+def _forma_canonica(forma: str) -> str:
+    """Nombre o alias en minúsculas con espacios simples"""
+    return " ".join(forma.lower().split())
+
+
+def _compilar_comandos(comandos: Dict[str, DefinicionComando]) -> Tuple[Pattern, Dict[str, str]]:
+    """
+    Compilar la gramática de comandos en una sola expresión regular
+    
+    Nombres y alias se prueban del más largo al más corto (gana la
+    coincidencia más larga: "añade locucion" antes que "añade") y deben
+    acabar en límite de palabra ("g" no captura "gato").
+    
+    Returns:
+        (patrón con grupos (forma, argumentos), forma canónica → nombre)
+    """
+    nombres: Dict[str, str] = {}
+    for defn in comandos.values():
+        for forma in [defn.nombre, *defn.aliases]:
+            nombres.setdefault(_forma_canonica(forma), defn.nombre)
+    
+    alternativas = "|".join(
+        r"\s+".join(re.escape(palabra) for palabra in forma.split())
+        for forma in sorted(nombres, key=len, reverse=True)
+    )
+    patron = re.compile(rf"\s*({alternativas})(?!\w)(.*)", re.IGNORECASE | re.DOTALL)
+    return patron, nombres
+
+
+# Gramática compilada: una sola búsqueda por entrada
+_PATRON_COMANDOS, _NOMBRES_COMANDOS = _compilar_comandos(COMANDOS)
+
+
 # ══════════════════════════════════════════════════════════════
 # PROCESADOR DE COMANDOS
 # ══════════════════════════════════════════════════════════════
@@ -325,6 +377,47 @@ class ProcesadorComandos:
         
         # Estado de confirmación pendiente
         self._confirmacion_pendiente: Optional[Tuple[str, Callable]] = None
+        
+        # Última vista paginada: (comando, filtros), para "más"
+        self._vista_actual: Optional[Tuple[str, Dict[str, Any]]] = None
+        
+        # Despacho: nombre de comando → manejador(args)
+        self._manejadores: Dict[str, Callable[[str], ResultadoComando]] = {
+            # A. Consulta
+            "GLOSARIO": self._cmd_glosario,
+            "LOCUCIONES": lambda args: self._cmd_locuciones(),
+            "ALTERNATIVAS": self._cmd_alternativas,
+            "BUSCA": self._cmd_busca,
+            "DECISIONES": self._cmd_decisiones,
+            "CONFIGURACION": lambda args: self._cmd_configuracion(),
+            "ESTADO": lambda args: self._cmd_estado(),
+            # B. Modificación
+            "ACTUALIZA": self._cmd_actualiza,
+            "AÑADE": self._cmd_añade,
+            "AÑADE LOCUCION": self._cmd_añade_locucion,
+            "ELIMINA": self._cmd_elimina,
+            "REGLA": self._cmd_regla,
+            "BORRA REGLA": self._cmd_borra_regla,
+            "MODO TRANSLITERACION": self._cmd_modo_transliteracion,
+            "MODO BORRADOR": lambda args: self._cmd_modo_salida(ModoSalida.BORRADOR),
+            "MODO FINAL": lambda args: self._cmd_modo_salida(ModoSalida.FINAL),
+            # C. Control
+            "PAUSA": lambda args: self._cmd_pausa(),
+            "CONTINUAR": lambda args: self._cmd_continuar(),
+            "FORZAR": lambda args: self._cmd_forzar(),
+            "REINICIAR": lambda args: self._cmd_reiniciar(),
+            "SALTAR": self._cmd_saltar,
+            "VOLVER": self._cmd_volver,
+            # D. Exportación
+            "EXPORTAR GLOSARIO": self._cmd_exportar_glosario,
+            "EXPORTAR TRADUCCION": self._cmd_exportar_traduccion,
+            "IMPORTAR GLOSARIO": self._cmd_importar_glosario,
+            "FUSIONAR GLOSARIO": self._cmd_fusionar_glosario,
+            # E. Ayuda
+            "AYUDA": self._cmd_ayuda,
+            "PROTOCOLOS": lambda args: self._cmd_protocolos(),
+            "PROTOCOLO": self._cmd_protocolo,
+        }
     
     def set_glosario(self, glosario: Glosario) -> None:
         """Establecer glosario"""
@@ -358,134 +451,62 @@ class ProcesadorComandos:
         # Ejecutar comando
         return self._ejecutar_comando(comando, args)
     
+    def procesar_lote(self, lineas: Iterable[str], confirmar: bool = True) -> List[ResultadoComando]:
+        """
+        Procesar muchos comandos seguidos en una transacción del glosario
+        
+        El almacén del glosario se sincroniza una vez al final (ver
+        Glosario.transaccion). Con `confirmar`, las operaciones que piden
+        confirmación ([ACTUALIZA], [ELIMINA]...) se confirman sin esperar
+        respuesta; sin él, se cancelan y su resultado es un fallo. Se
+        ignoran líneas vacías y comentarios (#).
+        
+        Returns:
+            Un resultado por comando, en orden
+        """
+        resultados: List[ResultadoComando] = []
+        
+        with self.glosario.transaccion() if self.glosario else nullcontext():
+            for linea in lineas:
+                linea = linea.strip()
+                if not linea or linea.startswith('#'):
+                    continue
+                
+                resultado = self.procesar(linea)
+                if resultado.requiere_confirmacion and self._confirmacion_pendiente:
+                    if confirmar:
+                        resultado = self._procesar_confirmacion("sí")
+                    else:
+                        # Cancelar: la línea siguiente no es la respuesta
+                        self._confirmacion_pendiente = None
+                        resultado = ResultadoComando(
+                            exito=False,
+                            mensaje=f"Sin confirmar: {linea}",
+                            requiere_confirmacion=True,
+                            pregunta_confirmacion=resultado.pregunta_confirmacion
+                        )
+                resultados.append(resultado)
+        
+        return resultados
+    
     def _parsear_comando(self, entrada: str) -> Tuple[Optional[str], str]:
         """Parsear entrada para extraer comando y argumentos"""
         # Quitar corchetes si los hay
         if entrada.startswith('[') and entrada.endswith(']'):
             entrada = entrada[1:-1]
         
-        entrada = entrada.strip()
-        
-        # Buscar comando
-        for nombre, defn in COMANDOS.items():
-            # Verificar nombre exacto
-            if entrada.upper().startswith(nombre):
-                args = entrada[len(nombre):].strip()
-                return nombre, args
-            
-            # Verificar aliases
-            for alias in defn.aliases:
-                if entrada.lower().startswith(alias):
-                    args = entrada[len(alias):].strip()
-                    return nombre, args
+        match = _PATRON_COMANDOS.match(entrada)
+        if not match:
+            return None, ""
         
-        return None, ""
+        return _NOMBRES_COMANDOS[_forma_canonica(match.group(1))], match.group(2).strip()
     
     def _ejecutar_comando(self, comando: str, args: str) -> ResultadoComando:
         """Ejecutar comando específico"""
-        
-        # ══════════════════════════════════════════════════════
-        # A. COMANDOS DE CONSULTA
-        # ══════════════════════════════════════════════════════
-        
-        if comando == "GLOSARIO":
-            return self._cmd_glosario(args)
-        
-        elif comando == "LOCUCIONES":
-            return self._cmd_locuciones()
-        
-        elif comando == "ALTERNATIVAS":
-            return self._cmd_alternativas()
-        
-        elif comando == "DECISIONES":
-            return self._cmd_decisiones(args)
-        
-        elif comando == "CONFIGURACION":
-            return self._cmd_configuracion()
-        
-        elif comando == "ESTADO":
-            return self._cmd_estado()
-        
-        # ══════════════════════════════════════════════════════
-        # B. COMANDOS DE MODIFICACIÓN
-        # ══════════════════════════════════════════════════════
-        
-        elif comando == "ACTUALIZA":
-            return self._cmd_actualiza(args)
-        
-        elif comando == "AÑADE":
-            return self._cmd_añade(args)
-        
-        elif comando == "AÑADE LOCUCION":
-            return self._cmd_añade_locucion(args)
-        
-        elif comando == "ELIMINA":
-            return self._cmd_elimina(args)
-        
-        elif comando == "REGLA":
-            return self._cmd_regla(args)
-        
-        elif comando == "BORRA REGLA":
-            return self._cmd_borra_regla(args)
-        
-        elif comando == "MODO TRANSLITERACION":
-            return self._cmd_modo_transliteracion(args)
-        
-        elif comando == "MODO BORRADOR":
-            return self._cmd_modo_salida(ModoSalida.BORRADOR)
-        
-        elif comando == "MODO FINAL":
-            return self._cmd_modo_salida(ModoSalida.FINAL)
-        
-        # ══════════════════════════════════════════════════════
-        # C. COMANDOS DE CONTROL
-        # ══════════════════════════════════════════════════════
-        
-        elif comando == "PAUSA":
-            return self._cmd_pausa()
-        
-        elif comando == "CONTINUAR":
-            return self._cmd_continuar()
-        
-        elif comando == "FORZAR":
-            return self._cmd_forzar()
-        
-        elif comando == "REINICIAR":
-            return self._cmd_reiniciar()
-        
-        elif comando == "SALTAR":
-            return self._cmd_saltar(args)
-        
-        elif comando == "VOLVER":
-            return self._cmd_volver(args)
-        
-        # ══════════════════════════════════════════════════════
-        # D. COMANDOS DE EXPORTACIÓN
-        # ══════════════════════════════════════════════════════
-        
-        elif comando == "EXPORTAR GLOSARIO":
-            return self._cmd_exportar_glosario(args)
-        
-        elif comando == "EXPORTAR TRADUCCION":
-            return self._cmd_exportar_traduccion(args)
-        
-        elif comando == "IMPORTAR GLOSARIO":
-            return self._cmd_importar_glosario(args)
-        
-        # ══════════════════════════════════════════════════════
-        # E. COMANDOS DE AYUDA
-        # ══════════════════════════════════════════════════════
-        
-        elif comando == "AYUDA":
-            return self._cmd_ayuda(args)
-        
-        elif comando == "PROTOCOLOS":
-            return self._cmd_protocolos()
-        
-        elif comando == "PROTOCOLO":
-            return self._cmd_protocolo(args)
-        
-        return ResultadoComando(exito=False, mensaje="Comando no implementado")
+        manejador = self._manejadores.get(comando)
+        if manejador is None:
+            return ResultadoComando(exito=False, mensaje="Comando no implementado")
+        return manejador(args)
     
     # ══════════════════════════════════════════════════════════
     # IMPLEMENTACIÓN: CONSULTA
@@ -496,7 +517,10 @@ class ProcesadorComandos:
         if not self.glosario:
             return ResultadoComando(exito=False, mensaje="Glosario no disponible")
         
-        texto = self.glosario.formatear_glosario()
+        filtros = self._parsear_vista("GLOSARIO", args)
+        texto = self.glosario.formatear_glosario(
+            pagina=filtros["pagina"], prefijo=filtros["prefijo"], status=filtros["status"]
+        )
         return ResultadoComando(exito=True, mensaje=texto)
     
     def _cmd_locuciones(self) -> ResultadoComando:
@@ -507,14 +531,53 @@ class ProcesadorComandos:
         texto = self.glosario.formatear_locuciones()
         return ResultadoComando(exito=True, mensaje=texto)
     
-    def _cmd_alternativas(self) -> ResultadoComando:
+    def _cmd_alternativas(self, args: str) -> ResultadoComando:
         """Comando ALTERNATIVAS"""
         if not self.glosario:
             return ResultadoComando(exito=False, mensaje="Glosario no disponible")
         
-        texto = self.glosario.formatear_alternativas()
+        filtros = self._parsear_vista("ALTERNATIVAS", args)
+        texto = self.glosario.formatear_alternativas(
+            pagina=filtros["pagina"], prefijo=filtros["prefijo"]
+        )
+        return ResultadoComando(exito=True, mensaje=texto)
+    
+    def _cmd_busca(self, args: str) -> ResultadoComando:
+        """Comando BUSCA"""
+        if not self.glosario:
+            return ResultadoComando(exito=False, mensaje="Glosario no disponible")
+        
+        consulta = args.strip()
+        if not consulta:
+            return ResultadoComando(exito=False, mensaje="Formato: [BUSCA texto]")
+        
+        texto = self.glosario.formatear_busqueda(consulta)
         return ResultadoComando(exito=True, mensaje=texto)
     
+    def _parsear_vista(self, comando: str, args: str) -> Dict[str, Any]:
+        """
+        Parsear argumentos de una vista paginada
+        
+        Acepta, en cualquier orden: número de página, "más" (página
+        siguiente de la vista anterior), status y prefijo (con o sin '*').
+        """
+        filtros: Dict[str, Any] = {"pagina": 1, "prefijo": None, "status": None}
+        
+        for parte in args.split():
+            if parte.isdigit():
+                filtros["pagina"] = max(1, int(parte))
+            elif parte.lower() in ("más", "mas"):
+                if self._vista_actual and self._vista_actual[0] == comando:
+                    filtros = dict(self._vista_actual[1])
+                    filtros["pagina"] += 1
+            elif parte.upper() in TokenStatus.__members__:
+                filtros["status"] = TokenStatus[parte.upper()]
+            else:
+                filtros["prefijo"] = parte.rstrip("*")
+        
+        self._vista_actual = (comando, filtros)
+        return filtros
+    
     def _cmd_decisiones(self, args: str) -> ResultadoComando:
         """Comando DECISIONES"""
         filtro = args.strip() if args else None
@@ -557,6 +620,8 @@ class ProcesadorComandos:
     
     def _cmd_estado(self) -> ResultadoComando:
         """Comando ESTADO"""
+        if "ESTADO" in self._callbacks:
+            self._callbacks["ESTADO"]()
         texto = self.estado.formatear()
         return ResultadoComando(exito=True, mensaje=texto)
     
@@ -600,7 +665,7 @@ class ProcesadorComandos:
                     f"Token: {token}\n"
                     f"Actual: {entrada.token_tgt}\n"
                     f"Nuevo: {nueva}\n"
-                    f"Ocurrencias afectadas: {len(entrada.ocurrencias)}\n\n"
+                    f"Ocurrencias afectadas: {entrada.num_ocurrencias()}\n\n"
                     f"¿Confirmar? (sí/no)",
             requiere_confirmacion=True,
             pregunta_confirmacion="¿Confirmar actualización? (sí/no)"
@@ -610,6 +675,8 @@ class ProcesadorComandos:
         """Ejecutar actualización confirmada"""
         exito, ocurrencias = self.glosario.actualizar_entrada(token, nueva)
         if exito:
+            if "ACTUALIZA" in self._callbacks:
+                self._callbacks["ACTUALIZA"](token)
             return ResultadoComando(
                 exito=True,
                 mensaje=f"Actualizado: {token} → {nueva} ({ocurrencias} ocurrencias)"
@@ -660,6 +727,8 @@ class ProcesadorComandos:
         componentes = src.replace("-", " ").split()
         
         loc = self.glosario.agregar_locucion(src, componentes, [], tgt)
+        if "AÑADE LOCUCION" in self._callbacks:
+            self._callbacks["AÑADE LOCUCION"](loc.id)
         
         return ResultadoComando(
             exito=True,
@@ -693,7 +762,7 @@ class ProcesadorComandos:
         
         return ResultadoComando(
             exito=True,
-            mensaje=f"¿Eliminar '{token}'? Ocurrencias afectadas: {len(entrada.ocurrencias)}\n"
+            mensaje=f"¿Eliminar '{token}'? Ocurrencias afectadas: {entrada.num_ocurrencias()}\n"
                     f"(sí/no)",
             requiere_confirmacion=True
         )
@@ -864,19 +933,46 @@ class ProcesadorComandos:
         if not self.glosario:
             return ResultadoComando(exito=False, mensaje="Glosario no disponible")
         
-        formato = args.strip().lower() or "txt"
+        partes = args.strip().split(maxsplit=1)
+        formato = partes[0].lower() if partes else "txt"
+        ruta = partes[1] if len(partes) > 1 else None
+        
+        if ruta is None:
+            if formato == "json":
+                datos = self.glosario.exportar_json()
+            elif formato == "csv":
+                datos = self.glosario.exportar_csv()
+            elif formato == "jsonl":
+                salida = io.StringIO()
+                self.glosario.exportar_jsonl(salida)
+                datos = salida.getvalue()
+            else:
+                datos = self.glosario.exportar_txt()
+            
+            return ResultadoComando(
+                exito=True,
+                mensaje=f"Glosario exportado ({formato.upper()})",
+                datos=datos
+            )
         
-        if formato == "json":
-            datos = self.glosario.exportar_json()
-        elif formato == "csv":
-            datos = self.glosario.exportar_csv()
-        else:
-            datos = self.glosario.exportar_txt()
+        # Exportación a archivo: JSONL y CSV se escriben entrada a entrada
+        try:
+            with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+                if formato == "jsonl":
+                    self.glosario.exportar_jsonl(archivo)
+                elif formato == "csv":
+                    self.glosario.exportar_csv_archivo(archivo)
+                elif formato == "json":
+                    archivo.write(self.glosario.exportar_json())
+                else:
+                    archivo.write(self.glosario.exportar_txt())
+        except OSError as e:
+            return ResultadoComando(exito=False, mensaje=f"Error al exportar: {e}")
         
         return ResultadoComando(
             exito=True,
-            mensaje=f"Glosario exportado ({formato.upper()})",
-            datos=datos
+            mensaje=f"Glosario exportado ({formato.upper()}) → {ruta}",
+            datos={"ruta": ruta}
         )
     
     def _cmd_exportar_traduccion(self, args: str) -> ResultadoComando:
@@ -889,17 +985,62 @@ class ProcesadorComandos:
     
     def _cmd_importar_glosario(self, args: str) -> ResultadoComando:
         """Comando IMPORTAR GLOSARIO"""
+        if not self.glosario:
+            return ResultadoComando(exito=False, mensaje="Glosario no disponible")
+        
         fuente = args.strip()
         if not fuente:
             return ResultadoComando(
                 exito=False,
-                mensaje="Formato: [IMPORTAR GLOSARIO fuente]"
+                mensaje="Formato: [IMPORTAR GLOSARIO ruta.json|ruta.jsonl|ruta.csv]"
             )
         
-        # Implementación depende del sistema de archivos
+        extension = os.path.splitext(fuente)[1].lower()
+        
+        # Carga sobre el glosario actual (entradas con el mismo token se reemplazan)
+        try:
+            with open(fuente, "r", encoding="utf-8", newline="") as archivo:
+                if extension == ".jsonl":
+                    total = self.glosario.cargar_jsonl(archivo)
+                elif extension == ".csv":
+                    total = self.glosario.cargar_csv(archivo)
+                elif extension == ".json":
+                    total = self.glosario.cargar_json(archivo.read())
+                else:
+                    return ResultadoComando(
+                        exito=False,
+                        mensaje=f"Formato no soportado: {extension or fuente}"
+                    )
+        except (OSError, ValueError, KeyError) as e:
+            return ResultadoComando(exito=False, mensaje=f"Error al importar: {e}")
+        
+        return ResultadoComando(
+            exito=True,
+            mensaje=f"Glosario importado desde {fuente}: {total} entradas",
+            datos={"entradas": total}
+        )
+    
+    def _cmd_fusionar_glosario(self, args: str) -> ResultadoComando:
+        """Comando FUSIONAR GLOSARIO"""
+        if not self.glosario:
+            return ResultadoComando(exito=False, mensaje="Glosario no disponible")
+        
+        ruta = args.strip()
+        if not ruta:
+            return ResultadoComando(
+                exito=False,
+                mensaje="Formato: [FUSIONAR GLOSARIO ruta]"
+            )
+        
+        try:
+            informe = self.glosario.fusionar_archivo(ruta)
+        except (OSError, ValueError, KeyError, GlosarioError) as e:
+            return ResultadoComando(exito=False, mensaje=f"Error al fusionar: {e}")
+        
         return ResultadoComando(
             exito=True,
-            mensaje=f"Importando glosario desde: {fuente}"
+            mensaje=informe.formatear(),
+            datos=informe
         )
     
     # ══════════════════════════════════════════════════════════
@@ -931,6 +1072,7 @@ class ProcesadorComandos:
             "CONSULTA:",
             "  [GLOSARIO]          [LOCUCIONES]       [ALTERNATIVAS]",
             "  [DECISIONES]        [CONFIGURACION]    [ESTADO]",
+            "  [BUSCA texto]",
             "",
             "MODIFICACIÓN:",
             "  [ACTUALIZA x = y]   [AÑADE x = y]      [ELIMINA x]",
@@ -944,9 +1086,9 @@ class ProcesadorComandos:
             "  [REINICIAR]         [SALTAR N]         [VOLVER N]",
             "",
             "EXPORTACIÓN:",
-            "  [EXPORTAR GLOSARIO formato]",
+            "  [EXPORTAR GLOSARIO formato [ruta]]",
             "  [EXPORTAR TRADUCCION formato]",
-            "  [IMPORTAR GLOSARIO fuente]",
+            "  [IMPORTAR GLOSARIO ruta]    [FUSIONAR GLOSARIO ruta]",
             "",
             "AYUDA:",
             "  [AYUDA]             [AYUDA comando]",
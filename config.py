@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from constants import ModoTransliteracion, NormaTransliteracion, ModoSalida
+
 
 @dataclass
 class ReglaUsuario:
@@ -32,13 +34,33 @@ class ConfiguracionSistema:
     # Ruta de glosario previo (para importación automática)
     ruta_glosario_previo: Optional[str] = None
     
+    # Léxico etimológico externo (.lex, TSV o JSON); None = léxico de demostración
+    ruta_lexicon: Optional[str] = None
+    
     # Opciones de consulta
     auto_decidir_timeout: bool = True  # Decidir automáticamente si no hay respuesta
     acumular_consultas: bool = True    # Acumular consultas en bloque
     
+    # Paralelismo (P3-P7): procesos para traducir oraciones (1 = serial)
+    workers: int = 1
+    
+    # Almacén SQLite del glosario (None = solo en memoria)
+    ruta_almacen_glosario: Optional[str] = None
+    
+    # Historial del glosario: registros en memoria y diario opcional
+    historial_capacidad: int = 10000
+    ruta_diario_glosario: Optional[str] = None
+    
+    # Caché de oraciones traducidas (0 = desactivada) y archivo SQLite opcional
+    cache_oraciones_capacidad: int = 20000
+    ruta_cache_oraciones: Optional[str] = None
+    
     # Debug
     debug_mode: bool = False
     
+    # Versión de las reglas (cambia al agregar o eliminar reglas)
+    version_reglas: int = 0
+    
     def agregar_regla(self, tipo: str, accion: str, condicion: Optional[str] = None, 
                       permanente: bool = False) -> None:
         """Agregar regla personalizada"""
@@ -47,12 +69,14 @@ class ConfiguracionSistema:
             self.reglas_permanentes.append(regla)
         else:
             self.reglas_sesion.append(regla)
+        self.version_reglas += 1
     
     def eliminar_regla(self, indice: int, permanente: bool = False) -> bool:
         """Eliminar regla por índice"""
         lista = self.reglas_permanentes if permanente else self.reglas_sesion
         if 0 <= indice < len(lista):
             lista.pop(indice)
+            self.version_reglas += 1
             return True
         return False
     
@@ -105,6 +129,13 @@ class ConfiguracionSistema:
                 for r in self.reglas_sesion
             ],
             "locuciones_predefinidas": self.locuciones_predefinidas,
+            "ruta_lexicon": self.ruta_lexicon,
+            "workers": self.workers,
+            "ruta_almacen_glosario": self.ruta_almacen_glosario,
+            "historial_capacidad": self.historial_capacidad,
+            "ruta_diario_glosario": self.ruta_diario_glosario,
+            "cache_oraciones_capacidad": self.cache_oraciones_capacidad,
+            "ruta_cache_oraciones": self.ruta_cache_oraciones,
             "debug_mode": self.debug_mode
         }
     
@@ -127,6 +158,13 @@ class ConfiguracionSistema:
             config.agregar_regla(r["tipo"], r["accion"], r.get("condicion"), permanente=False)
         
         config.locuciones_predefinidas = data.get("locuciones_predefinidas", [])
+        config.ruta_lexicon = data.get("ruta_lexicon")
+        config.workers = data.get("workers", 1)
+        config.ruta_almacen_glosario = data.get("ruta_almacen_glosario")
+        config.historial_capacidad = data.get("historial_capacidad", 10000)
+        config.ruta_diario_glosario = data.get("ruta_diario_glosario")
+        config.cache_oraciones_capacidad = data.get("cache_oraciones_capacidad", 20000)
+        config.ruta_cache_oraciones = data.get("ruta_cache_oraciones")
         config.debug_mode = data.get("debug_mode", False)
         
         return config
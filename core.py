@@ -21,6 +21,7 @@ from models import (
     Locucion, ErrorCritico, CeldaMatriz
 )
 from glossary import Glosario, TokenNoRegistradoError
+from config import obtener_config
 
 
 # ══════════════════════════════════════════════════════════════
@@ -199,6 +200,7 @@ class Core:
         """
         # 1.3. Crear matriz target con mismo tamaño
         self.mtx_t = MatrizTarget(self.mtx_s.size())
+        self.mtx_t.vincular_fuente(self.mtx_s)
         
         # 1.4. Verificar todos los tokens en glosario
         for celda in self.mtx_s.celdas:
@@ -230,7 +232,7 @@ class Core:
         for slot_n in self.mtx_s.slots_n:
             if slot_n.es_bloqueado():
                 # Token pertenece a locución
-                self.mtx_t.celdas[slot_n.pos_index].tipo = "parte_locucion"
+                self.mtx_t.establecer_tipo(slot_n.pos_index, "parte_locucion")
                 continue
             
             # Ejecutar P4
@@ -241,7 +243,7 @@ class Core:
                 slot_n.token_tgt = self.glosario.obtener_traduccion(slot_n.token_src)
             elif resultado.get("bloqueado"):
                 # Era parte de locución
-                self.mtx_t.celdas[slot_n.pos_index].tipo = "parte_locucion"
+                self.mtx_t.establecer_tipo(slot_n.pos_index, "parte_locucion")
             else:
                 # Asignación normal
                 slot_n.token_tgt = resultado.get("token_tgt")
@@ -278,8 +280,7 @@ class Core:
                 if loc:
                     if i == loc.primera_posicion():
                         # Primera posición: insertar traducción completa
-                        celda_t.token_tgt = loc.tgt
-                        celda_t.tipo = "locucion"
+                        self.mtx_t.asignar(i, loc.tgt, "locucion")
                     else:
                         # Posiciones siguientes: marcar absorbido
                         self.mtx_t.marcar_absorbido(i)
@@ -287,11 +288,10 @@ class Core:
             
             # Token normal
             if isinstance(slot, SlotN):
-                celda_t.token_tgt = slot.token_tgt
-                celda_t.tipo = "normal"
+                self.mtx_t.asignar(i, slot.token_tgt, "normal")
             else:
                 # Partícula - pendiente
-                celda_t.tipo = "pendiente"
+                self.mtx_t.establecer_tipo(i, "pendiente")
     
     # ══════════════════════════════════════════════════════════
     # F4-F7. PROCESAMIENTO DE PARTÍCULAS CON COHESIÓN
@@ -320,15 +320,14 @@ class Core:
             
             if not candidatos:
                 # Sin candidatos - marcar como problema
-                self.mtx_t.celdas[slot_p.pos_index].token_tgt = slot_p.token_src
-                self.mtx_t.celdas[slot_p.pos_index].tipo = "sin_traduccion"
+                self.mtx_t.asignar(slot_p.pos_index, slot_p.token_src, "sin_traduccion")
                 continue
             
             # Ciclo de cohesión
             exito = False
             for try_idx, candidato in enumerate(candidatos):
                 # Asignar candidato
-                self.mtx_t.celdas[slot_p.pos_index].token_tgt = candidato
+                self.mtx_t.establecer_token(slot_p.pos_index, candidato)
                 
                 # F5. Ajuste (P7)
                 if self._reparador:
@@ -347,7 +346,7 @@ class Core:
             
             if not exito:
                 # FAIL CRÍTICO - usar primer candidato y marcar nulo
-                self.mtx_t.celdas[slot_p.pos_index].token_tgt = candidatos[0]
+                self.mtx_t.establecer_token(slot_p.pos_index, candidatos[0])
                 self.mtx_t.marcar_nulo(slot_p.pos_index)
             
             # F7. Auditoría de isomorfismo
@@ -396,8 +395,20 @@ class Core:
         F7. Auditoría de isomorfismo
         
         Verificar: Mtx_T[i].pos == Mtx_S[i].pos (ignorando inyecciones)
+        
+        Auditoría incremental O(1). En modo debug se contrasta con el
+        recorrido completo de la matriz.
         """
-        return self.mtx_t.verificar_isomorfismo(self.mtx_s)
+        isomorfo = self.mtx_t.es_isomorfo()
+        
+        if obtener_config().debug_mode:
+            completo = self.mtx_t.verificar_isomorfismo(self.mtx_s)
+            if completo != isomorfo:
+                raise IsomorfismoError(
+                    f"Auditoría incremental ({isomorfo}) difiere de la completa ({completo})"
+                )
+        
+        return isomorfo
     
     # ══════════════════════════════════════════════════════════
     # UTILIDADES
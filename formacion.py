@@ -19,7 +19,8 @@ SECCIONES:
   D. Reglas de Locuciones
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+import re
+from typing import Dict, List, Optional, Any, Tuple, Iterable, Pattern
 from dataclasses import dataclass
 from enum import Enum, auto
 
@@ -89,21 +90,55 @@ class SistemaTransliteracion:
         'َ': 'a', 'ُ': 'u', 'ِ': 'i',
     }
     
+    # Separador para transliterar lotes en una sola llamada (no está en ningún mapa)
+    _SEPARADOR_LOTE = '\x00'
+    
+    # Tablas str.translate y patrones compilados, cacheados por norma
+    _TABLAS: Dict[NormaTransliteracion, Dict[int, str]] = {}
+    _PATRONES: Dict[NormaTransliteracion, Pattern] = {}
+    
     def __init__(self, norma: NormaTransliteracion = None):
         config = obtener_config()
         self.norma = norma or config.norma_transliteracion
         self._seleccionar_mapa()
     
+    @classmethod
+    def mapa(cls, norma: NormaTransliteracion) -> Dict[str, str]:
+        """Mapa carácter → transliteración de una norma"""
+        if norma == NormaTransliteracion.ISO_233:
+            return cls._MAPA_ISO_233
+        if norma == NormaTransliteracion.SIMPLIFICADA:
+            return cls._MAPA_SIMPLIFICADO
+        return cls._MAPA_DIN_31635  # Default
+    
+    @classmethod
+    def tabla(cls, norma: NormaTransliteracion) -> Dict[int, str]:
+        """
+        Tabla str.translate compilada de una norma
+        
+        Admite salidas de varios caracteres ('أ' → 'ʾa') y vacías (shadda).
+        """
+        tabla = cls._TABLAS.get(norma)
+        if tabla is None:
+            tabla = str.maketrans(cls.mapa(norma))
+            cls._TABLAS[norma] = tabla
+        return tabla
+    
+    @classmethod
+    def patron(cls, norma: NormaTransliteracion) -> Pattern:
+        """Patrón que localiza caracteres transliterables de una norma"""
+        patron = cls._PATRONES.get(norma)
+        if patron is None:
+            clase = ''.join(re.escape(c) for c in cls.mapa(norma))
+            patron = re.compile(f'[{clase}]')
+            cls._PATRONES[norma] = patron
+        return patron
+    
     def _seleccionar_mapa(self) -> None:
-        """Seleccionar mapa según norma"""
-        if self.norma == NormaTransliteracion.DIN_31635:
-            self._mapa = self._MAPA_DIN_31635
-        elif self.norma == NormaTransliteracion.ISO_233:
-            self._mapa = self._MAPA_ISO_233
-        elif self.norma == NormaTransliteracion.SIMPLIFICADA:
-            self._mapa = self._MAPA_SIMPLIFICADO
-        else:
-            self._mapa = self._MAPA_DIN_31635  # Default
+        """Seleccionar mapa y tabla compilada según norma"""
+        self._mapa = self.mapa(self.norma)
+        self._tabla = self.tabla(self.norma)
+        self._patron = self.patron(self.norma)
     
     def cambiar_norma(self, norma: NormaTransliteracion) -> None:
         """Cambiar norma de transliteración"""
@@ -119,28 +154,41 @@ class SistemaTransliteracion:
         
         Returns:
             Texto transliterado según norma seleccionada
+            (los caracteres fuera del mapa se mantienen)
+        """
+        return texto.translate(self._tabla)
+    
+    def transliterar_lote(self, textos: Iterable[str]) -> List[str]:
+        """
+        Transliterar muchos textos con una sola llamada a str.translate
+        
+        Returns:
+            Lista de transliteraciones en el mismo orden
         """
-        resultado = []
+        textos = list(textos)
+        if not textos:
+            return []
         
-        for char in texto:
-            if char in self._mapa:
-                resultado.append(self._mapa[char])
-            elif char.isascii():
-                resultado.append(char)
-            elif char.isspace():
-                resultado.append(char)
-            else:
-                # Mantener caracteres desconocidos
-                resultado.append(char)
+        unido = self._SEPARADOR_LOTE.join(textos)
+        if unido.count(self._SEPARADOR_LOTE) != len(textos) - 1:
+            # Algún texto contiene el separador
+            return [texto.translate(self._tabla) for texto in textos]
         
-        return ''.join(resultado)
+        return unido.translate(self._tabla).split(self._SEPARADOR_LOTE)
+    
+    def transliterar_glosario(self, glosario) -> Dict[str, str]:
+        """
+        Transliterar todos los tokens de un glosario en una sola llamada
+        
+        Returns:
+            Dict token_src → transliteración
+        """
+        tokens = glosario.obtener_tokens()
+        return dict(zip(tokens, self.transliterar_lote(tokens)))
     
     def es_transliterado(self, texto: str) -> bool:
         """Verificar si el texto ya está transliterado"""
-        for char in texto:
-            if char in self._mapa:
-                return False
-        return True
+        return self._patron.search(texto) is None
     
     def normalizar_lema(self, texto: str) -> str:
         """
@@ -169,6 +217,11 @@ def transliterar(texto: str) -> str:
     return _sistema_transliteracion.transliterar(texto)
 
 
+def transliterar_lote(textos: Iterable[str]) -> List[str]:
+    """Función de conveniencia para transliterar un lote de textos"""
+    return _sistema_transliteracion.transliterar_lote(textos)
+
+
 # ══════════════════════════════════════════════════════════════
 # SECCIÓN B: NEOLOGISMOS RADICALES
 # ══════════════════════════════════════════════════════════════
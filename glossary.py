@@ -16,11 +16,19 @@ PRINCIPIOS:
   - Registro completo: OBLIGATORIO (FALLO CRÍTICO si incompleto)
 """
 
+import os
 import re
+import io
+import csv
 import json
-from typing import Dict, List, Optional, Tuple, Set, Any
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple, Set, Any, Iterable, Iterator, Mapping, TextIO, Union
+from collections import deque
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from types import MappingProxyType
 
 from constants import (
     TokenStatus, TokenCategoria, CategoriaGramatical,
@@ -29,9 +37,20 @@ from constants import (
 )
 from models import (
     EntradaGlosario, Locucion, SlotN, SlotP,
-    MatrizFuente, ErrorCritico, Consulta, Opcion
+    MatrizFuente, ErrorCritico, Consulta, Opcion,
+    codificar_ocurrencias, decodificar_ocurrencias
 )
 from config import obtener_config
+from historial import HistorialGlosario, leer_diario
+from almacen import AlmacenGlosario
+from busqueda import IndiceBusqueda
+
+
+# Escritura de Fase B: (token, tgt, margen, etiqueta, func_role)
+EscrituraFaseB = Tuple[str, str, int, Optional[str], Optional[FuncRole]]
+
+# Cambio de usuario en bloque: (token, tgt, categoría); None = sin cambio
+CambioGlosario = Tuple[str, Optional[str], Optional[TokenCategoria]]
 
 
 # ══════════════════════════════════════════════════════════════
@@ -70,6 +89,318 @@ class TokenNoRegistradoError(GlosarioError):
         super().__init__(f"Token no registrado: '{token}' en posición {posicion}")
 
 
+class LocucionBloqueadaError(GlosarioError):
+    """Traducción individual de un componente de locución (P8.B2)"""
+    def __init__(self, token: str, locucion_id: Optional[str]):
+        self.token = token
+        self.locucion_id = locucion_id
+        super().__init__(f"Token '{token}' bloqueado por la locución {locucion_id}")
+
+
+class CambiosRechazadosError(GlosarioError):
+    """Lote de cambios con conflictos: no se aplicó ninguno"""
+    def __init__(self, conflictos: List[GlosarioError]):
+        self.conflictos = conflictos
+        super().__init__(f"{len(conflictos)} conflictos en el lote de cambios")
+
+
+# ══════════════════════════════════════════════════════════════
+# AUTÓMATA DE LOCUCIONES (AHO-CORASICK)
+# ══════════════════════════════════════════════════════════════
+
+class AutomataLocuciones:
+    """
+    Autómata Aho-Corasick sobre secuencias de componentes
+    
+    Localiza en una sola pasada todas las locuciones presentes en una
+    secuencia de tokens, con coste lineal en tokens + coincidencias.
+    """
+    
+    def __init__(self, locuciones: Iterable[Locucion]):
+        self._transiciones: List[Dict[str, int]] = [{}]
+        self._fallos: List[int] = [0]
+        # Por estado: (longitud, orden de registro, locución)
+        self._salidas: List[List[Tuple[int, int, Locucion]]] = [[]]
+        
+        for orden, loc in enumerate(locuciones):
+            if loc.componentes:
+                self._insertar(loc, orden)
+        
+        self._construir_fallos()
+    
+    def _insertar(self, locucion: Locucion, orden: int) -> None:
+        estado = 0
+        for comp in locucion.componentes:
+            siguiente = self._transiciones[estado].get(comp)
+            if siguiente is None:
+                siguiente = len(self._transiciones)
+                self._transiciones[estado][comp] = siguiente
+                self._transiciones.append({})
+                self._fallos.append(0)
+                self._salidas.append([])
+            estado = siguiente
+        self._salidas[estado].append((len(locucion.componentes), orden, locucion))
+    
+    def _construir_fallos(self) -> None:
+        cola = deque(self._transiciones[0].values())
+        
+        while cola:
+            estado = cola.popleft()
+            for comp, siguiente in self._transiciones[estado].items():
+                cola.append(siguiente)
+                
+                fallo = self._fallos[estado]
+                while fallo and comp not in self._transiciones[fallo]:
+                    fallo = self._fallos[fallo]
+                destino = self._transiciones[fallo].get(comp, 0)
+                self._fallos[siguiente] = destino
+                
+                self._salidas[siguiente].extend(self._salidas[self._fallos[siguiente]])
+    
+    def buscar(self, tokens: List[str]) -> List[Tuple[Locucion, int]]:
+        """
+        Buscar locuciones en una secuencia de tokens
+        
+        Returns:
+            Lista de (locución, posición inicial), en orden de registro
+            de la locución y luego de posición
+        """
+        coincidencias = []
+        estado = 0
+        
+        for i, token in enumerate(tokens):
+            while estado and token not in self._transiciones[estado]:
+                estado = self._fallos[estado]
+            estado = self._transiciones[estado].get(token, 0)
+            
+            for longitud, orden, loc in self._salidas[estado]:
+                coincidencias.append((orden, i - longitud + 1, loc))
+        
+        coincidencias.sort(key=lambda c: (c[0], c[1]))
+        return [(loc, inicio) for _, inicio, loc in coincidencias]
+
+
+# ══════════════════════════════════════════════════════════════
+# ÍNDICE ORDENADO DE ENTRADAS
+# ══════════════════════════════════════════════════════════════
+
+class IndiceGlosario:
+    """
+    Índices ordenados para las vistas paginadas del glosario
+    
+    - Por (-margen, token): todas las entradas y, aparte, las de cada
+      status. Una página sin filtro de prefijo es una rebanada.
+    - Por token: (token, -margen, status), para filtrar por prefijo
+      con bisect.
+    
+    Se mantiene al día en cada alta, baja o transición de entrada.
+    """
+    
+    def __init__(self, entradas: Iterable[EntradaGlosario]):
+        self._por_margen: List[Tuple[int, str]] = []
+        self._por_status: Dict[TokenStatus, List[Tuple[int, str]]] = {s: [] for s in TokenStatus}
+        self._por_token: List[Tuple[str, int, TokenStatus]] = []
+        
+        for entrada in entradas:
+            clave = (-entrada.margen, entrada.token_src)
+            self._por_margen.append(clave)
+            self._por_status[entrada.status].append(clave)
+            self._por_token.append((entrada.token_src, -entrada.margen, entrada.status))
+        
+        self._por_margen.sort()
+        for lista in self._por_status.values():
+            lista.sort()
+        self._por_token.sort(key=lambda t: t[0])
+    
+    def __len__(self) -> int:
+        return len(self._por_margen)
+    
+    def agregar(self, entrada: EntradaGlosario) -> None:
+        clave = (-entrada.margen, entrada.token_src)
+        insort(self._por_margen, clave)
+        insort(self._por_status[entrada.status], clave)
+        insort(self._por_token, (entrada.token_src, -entrada.margen, entrada.status),
+               key=lambda t: t[0])
+    
+    def quitar(self, entrada: EntradaGlosario) -> None:
+        clave = (-entrada.margen, entrada.token_src)
+        _quitar_ordenado(self._por_margen, clave)
+        _quitar_ordenado(self._por_status[entrada.status], clave)
+        i = bisect_left(self._por_token, entrada.token_src, key=lambda t: t[0])
+        if i < len(self._por_token) and self._por_token[i][0] == entrada.token_src:
+            del self._por_token[i]
+    
+    def pagina(self, inicio: int, limite: int, prefijo: Optional[str] = None,
+               status: Optional[TokenStatus] = None,
+               margen_minimo: Optional[int] = None) -> Tuple[List[str], int]:
+        """
+        Tokens de una página, en orden (margen desc, token)
+        
+        Returns:
+            (tokens de la página, total de entradas que cumplen los filtros)
+        """
+        if prefijo:
+            # Rango del prefijo en el índice por token; solo se ordenan
+            # por margen las entradas que empiezan por él
+            i = bisect_left(self._por_token, prefijo, key=lambda t: t[0])
+            j = bisect_left(self._por_token, prefijo + "\U0010ffff", lo=i, key=lambda t: t[0])
+            candidatas = []
+            for token, clave_margen, status_entrada in self._por_token[i:j]:
+                if status is not None and status_entrada != status:
+                    continue
+                if margen_minimo is not None and -clave_margen < margen_minimo:
+                    continue
+                candidatas.append((clave_margen, token))
+            candidatas.sort()
+            return [token for _, token in candidatas[inicio:inicio + limite]], len(candidatas)
+        
+        lista = self._por_margen if status is None else self._por_status[status]
+        total = len(lista)
+        if margen_minimo is not None:
+            # Las claves con margen >= mínimo son las menores que (-mínimo + 1,)
+            total = bisect_left(lista, (-margen_minimo + 1,))
+        
+        return [token for _, token in lista[inicio:min(inicio + limite, total)]], total
+
+
+def _quitar_ordenado(lista: List[Tuple[int, str]], clave: Tuple[int, str]) -> None:
+    i = bisect_left(lista, clave)
+    if i < len(lista) and lista[i] == clave:
+        del lista[i]
+
+
+# ══════════════════════════════════════════════════════════════
+# INSTANTÁNEAS
+# ══════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class InstantaneaGlosario:
+    """
+    Vista inmutable del glosario en una versión (ver Glosario.instantanea)
+    
+    Admite lecturas concurrentes sin bloqueo: el glosario no modifica
+    nunca los diccionarios ni las entradas que comparte con ella.
+    
+    Con almacén, lee por una conexión propia (lector) y debe usarse en
+    un bloque `with`: la conexión se cierra al salir del último bloque
+    abierto sobre ella, o al sustituirla el glosario por una más reciente
+    si no hay ninguno abierto.
+    
+        with glosario.instantanea() as inst:
+            for token, entrada in inst.iterar_entradas(): ...
+    """
+    version: int
+    entradas: Mapping[str, EntradaGlosario]
+    locuciones: Mapping[str, Locucion]
+    sellado: bool
+    _lector: Optional[AlmacenGlosario] = field(default=None, repr=False, compare=False)
+    
+    def __enter__(self) -> 'InstantaneaGlosario':
+        if self._lector is not None:
+            self._lector.retener()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        if self._lector is not None:
+            self._lector.liberar()
+    
+    def cerrar(self) -> None:
+        """Cerrar ya la conexión del almacén (sin almacén no hace nada)"""
+        if self._lector is not None:
+            self._lector.cerrar()
+    
+    @property
+    def cerrada(self) -> bool:
+        return self._lector is not None and self._lector.cerrado
+    
+    def iterar_entradas(self) -> Iterator[Tuple[str, EntradaGlosario]]:
+        """Recorrer entradas (con almacén, sin retenerlas en memoria)"""
+        if self._lector is not None:
+            return self._lector.iterar_sin_cache()
+        return iter(self.entradas.items())
+    
+    def __len__(self) -> int:
+        return len(self.entradas)
+    
+    def __contains__(self, token: object) -> bool:
+        return token in self.entradas
+    
+    def obtener_entrada(self, token: str) -> Optional[EntradaGlosario]:
+        return self.entradas.get(token)
+    
+    def obtener_locucion(self, loc_id: str) -> Optional[Locucion]:
+        return self.locuciones.get(loc_id)
+    
+    def obtener_tokens(self) -> List[str]:
+        return list(self.entradas)
+
+
+# ══════════════════════════════════════════════════════════════
+# REGISTRO DE DELTAS
+# ══════════════════════════════════════════════════════════════
+
+@dataclass(slots=True)
+class RegistroDelta:
+    """
+    Cambios del glosario desde la última extracción (ver Glosario.extraer_delta)
+    
+    De cada entrada tocada se guarda cuántas ocurrencias tenía antes del
+    primer cambio: el delta lleva solo las anexadas después.
+    """
+    ocurrencias_previas: Dict[str, int] = field(default_factory=dict)
+    # Diccionarios como conjuntos ordenados: el orden de registro se
+    # conserva al aplicar el delta
+    reescritas: Dict[str, None] = field(default_factory=dict)   # Agregadas o reemplazadas
+    eliminadas: Dict[str, None] = field(default_factory=dict)
+    locuciones: Dict[str, None] = field(default_factory=dict)
+    
+    def tocar(self, token: str, entrada: EntradaGlosario) -> None:
+        if token not in self.ocurrencias_previas:
+            self.ocurrencias_previas[token] = len(entrada.ocurrencias)
+    
+    def reescribir(self, token: str) -> None:
+        self.reescritas[token] = None
+    
+    def eliminar(self, token: str) -> None:
+        self.reescritas.pop(token, None)
+        self.ocurrencias_previas.pop(token, None)
+        self.eliminadas[token] = None
+
+
+# ══════════════════════════════════════════════════════════════
+# FUSIÓN DE GLOSARIOS
+# ══════════════════════════════════════════════════════════════
+
+@dataclass
+class InformeFusion:
+    """Resultado de Glosario.fusionar (conflictos en bloque)"""
+    asignadas: int = 0      # Entradas pendientes que reciben la traducción previa
+    agregadas: int = 0      # Entradas nuevas (no estaban en el glosario)
+    coincidentes: int = 0   # Misma traducción en ambos glosarios
+    polivalentes: int = 0   # Partículas con otra traducción (se conservan sus funciones)
+    locuciones: int = 0     # Locuciones que reciben la traducción previa
+    omitidas: int = 0       # Sin traducción previa, bloqueadas o ausentes
+    conflictos: List[SinonimiaError] = field(default_factory=list)
+    
+    @property
+    def total(self) -> int:
+        return (self.asignadas + self.agregadas + self.coincidentes + self.polivalentes
+                + self.locuciones + self.omitidas + len(self.conflictos))
+    
+    def formatear(self) -> str:
+        lineas = [
+            f"Fusión de glosario: {self.total} elementos",
+            f"  Asignadas: {self.asignadas}  Agregadas: {self.agregadas}  "
+            f"Coincidentes: {self.coincidentes}",
+            f"  Partículas polivalentes: {self.polivalentes}  Locuciones: {self.locuciones}  "
+            f"Omitidas: {self.omitidas}",
+            f"  Conflictos de sinonimia: {len(self.conflictos)}"
+        ]
+        for conflicto in self.conflictos:
+            lineas.append(f"    {conflicto.token}: '{conflicto.existente}' ≠ '{conflicto.propuesta}'")
+        return "\n".join(lineas)
+
+
 # ══════════════════════════════════════════════════════════════
 # CLASE PRINCIPAL: GLOSARIO
 # ══════════════════════════════════════════════════════════════
@@ -84,36 +415,104 @@ class Glosario:
       C. Inmutabilidad: Solo usuario puede modificar
     """
     
+    # Margen a partir del cual un término aparece en [ALTERNATIVAS]
+    MARGEN_ALTERNATIVAS = 3
+    
     def __init__(self):
         # Entradas principales
         self._entradas: Dict[str, EntradaGlosario] = {}
         
+        # Contadores por (categoría, status), al día en cada transición
+        self._conteo: Dict[Tuple[TokenCategoria, TokenStatus], int] = {}
+        
+        # Índice ordenado para vistas paginadas (se construye en la
+        # primera consulta y después se mantiene con cada transición)
+        self._indice: Optional[IndiceGlosario] = None
+        
+        # Índice de búsqueda por formas plegadas (se construye en la
+        # primera búsqueda; ver busqueda.py)
+        self._indice_busqueda: Optional[IndiceBusqueda] = None
+        
         # Locuciones detectadas
         self._locuciones: Dict[str, Locucion] = {}
         
         # Contador de locuciones
         self._locucion_counter: int = 0
         
+        # Índices de locuciones: posición → IDs y componente → IDs
+        # (en orden de registro)
+        self._locuciones_por_posicion: Dict[int, List[str]] = {}
+        self._locuciones_por_componente: Dict[str, List[str]] = {}
+        
+        # Autómata de locuciones (se reconstruye al registrar locuciones)
+        self._automata_locuciones: Optional[AutomataLocuciones] = None
+        
         # Estado
         self._sellado: bool = False
         
-        # Historial de cambios
-        self._historial: List[Dict[str, Any]] = []
+        # Historial de cambios (búfer circular + diario opcional)
+        self._historial = HistorialGlosario(obtener_config().historial_capacidad)
         
         # Consultas pendientes
         self._consultas_pendientes: List[Consulta] = []
+        
+        # Registro de escrituras de Fase B (traducción paralela)
+        self._registro_escrituras: Optional[List[EscrituraFaseB]] = None
+        
+        # Registro de deltas (puntos de control incrementales)
+        self._registro_delta: Optional[RegistroDelta] = None
+        
+        # Almacén persistente (None = solo en memoria)
+        self._almacen: Optional[AlmacenGlosario] = None
+        
+        # Instantáneas (copy-on-write): versión actual, última instantánea,
+        # diccionarios compartidos con ella y entradas ya copiadas desde
+        # entonces (None = ninguna entrada compartida)
+        self._version: int = 0
+        self._instantanea: Optional[InstantaneaGlosario] = None
+        self._entradas_compartidas: bool = False
+        self._locuciones_compartidas: bool = False
+        self._copiadas: Optional[Set[str]] = None
+        
+        # Transacciones abiertas (sincronización del almacén diferida)
+        self._transacciones: int = 0
     
     # ══════════════════════════════════════════════════════════
     # FASE A: PRE-TRADUCCIÓN
     # ══════════════════════════════════════════════════════════
     
-    def fase_a_procesar(self, texto: str, tokens_clasificados: List[Tuple[str, TokenCategoria, CategoriaGramatical]]) -> bool:
+    def fase_a_procesar(self, texto: str, tokens_clasificados: List[Tuple[str, TokenCategoria, CategoriaGramatical]],
+                        desplazamiento: int = 0) -> bool:
         """
         Ejecutar Fase A completa (P8.A)
         
         Args:
             texto: Texto fuente limpio
             tokens_clasificados: Lista de (token, categoria, cat_gramatical)
+            desplazamiento: Índice global del primer token (traducción por
+                            lotes: las ocurrencias continúan entre lotes)
+        
+        Returns:
+            True si glosario sellado correctamente
+        
+        Raises:
+            RegistroIncompletoError: Si faltan tokens
+        """
+        return self.fase_a_procesar_flujo([(texto, tokens_clasificados)], desplazamiento)
+    
+    def fase_a_procesar_flujo(self, fragmentos: Iterable[Tuple[str, List[Tuple[str, TokenCategoria, CategoriaGramatical]]]],
+                              desplazamiento: int = 0) -> bool:
+        """
+        Ejecutar Fase A consumiendo el texto por fragmentos (P8.A)
+        
+        Cada fragmento es (texto_limpio, tokens_clasificados) y puede
+        descartarse tras procesarlo: solo se acumulan las entradas y el
+        vocabulario del texto para A4, de modo que la memoria depende del
+        vocabulario y no del tamaño del corpus.
+        
+        Args:
+            fragmentos: Iterable (p. ej. generador) de fragmentos en orden
+            desplazamiento: Índice global del primer token
         
         Returns:
             True si glosario sellado correctamente
@@ -121,15 +520,22 @@ class Glosario:
         Raises:
             RegistroIncompletoError: Si faltan tokens
         """
-        # A1. Detección de locuciones
-        self._a1_detectar_locuciones(texto)
+        vocabulario: Set[str] = set()
         
-        # A2. Tokenización (ya viene clasificado)
-        # A3. Registro inicial
-        self._a3_registrar_tokens(tokens_clasificados)
+        for texto, tokens_clasificados in fragmentos:
+            # A1. Detección de locuciones
+            self._a1_detectar_locuciones(texto)
+            
+            # A2. Tokenización (ya viene clasificado)
+            # A3. Registro inicial
+            self._a3_registrar_tokens(tokens_clasificados, desplazamiento)
+            desplazamiento += len(tokens_clasificados)
+            
+            # Vocabulario para A4
+            vocabulario.update(re.findall(r'\b\w+\b', texto))
         
         # A4. Verificación de completitud
-        return self._a4_verificar_completitud(texto)
+        return self._a4_verificar_vocabulario(vocabulario)
     
     def _a1_detectar_locuciones(self, texto: str) -> List[Locucion]:
         """
@@ -143,7 +549,11 @@ class Glosario:
         config = obtener_config()
         
         # Método 1: Lista predefinida
+        registradas = {loc.src for loc in self._locuciones.values()}
         for loc_predefinida in config.locuciones_predefinidas:
+            if loc_predefinida in registradas:
+                # Ya registrada en un lote anterior
+                continue
             if loc_predefinida in texto:
                 loc = self._crear_locucion_desde_patron(loc_predefinida, texto)
                 if loc:
@@ -189,7 +599,7 @@ class Glosario:
             posiciones=posiciones
         )
         
-        self._locuciones[loc_id] = locucion
+        self._registrar_locucion(locucion)
         return locucion
     
     def _crear_consulta_locucion(self, posible_loc: str, posicion: int) -> Consulta:
@@ -234,16 +644,22 @@ class Glosario:
         if traduccion_etym:
             locucion.generar_traduccion(traduccion_etym)
         
-        self._locuciones[loc_id] = locucion
+        self._registrar_locucion(locucion)
         return locucion
     
-    def _a3_registrar_tokens(self, tokens_clasificados: List[Tuple[str, TokenCategoria, CategoriaGramatical]]) -> None:
+    def _a3_registrar_tokens(self, tokens_clasificados: List[Tuple[str, TokenCategoria, CategoriaGramatical]],
+                             desplazamiento: int = 0) -> None:
         """
         A3. Registro inicial (P8.A3)
         
         Registrar todos los tokens con status PENDIENTE
         """
-        for idx, (token, categoria, cat_gram) in enumerate(tokens_clasificados):
+        almacen = self._almacen
+        registro = self._registro_delta
+        self._escribir_entradas()
+        copiadas = self._copiadas
+        
+        for idx, (token, categoria, cat_gram) in enumerate(tokens_clasificados, desplazamiento):
             # Verificar si token está bloqueado por locución
             locucion_id = self._token_en_locucion(token, idx)
             
@@ -252,20 +668,48 @@ class Glosario:
                     token_src=token,
                     categoria=categoria,
                     status=TokenStatus.BLOQUEADO if locucion_id else TokenStatus.PENDIENTE,
-                    ocurrencias=[idx]
+                    ocurrencias=array('I', (idx,))
                 )
                 self._entradas[token] = entrada
+                self._contar(entrada, 1)
+                if copiadas is not None:
+                    copiadas.add(token)
+                if registro is not None:
+                    registro.reescribir(token)
             else:
                 # Token ya existe, agregar ocurrencia
-                self._entradas[token].ocurrencias.append(idx)
+                entrada = self._entradas[token]
+                if copiadas is not None and token not in copiadas:
+                    entrada = self._entrada_escribible(token)
+                if registro is not None:
+                    registro.tocar(token, entrada)
+                entrada.ocurrencias.append(idx)
+                if almacen is not None:
+                    almacen.marcar_ocurrencias(token)
     
     def _token_en_locucion(self, token: str, posicion: int) -> Optional[str]:
         """Verificar si token pertenece a locución en esta posición"""
-        for loc_id, loc in self._locuciones.items():
-            if token in loc.componentes and posicion in loc.posiciones:
+        for loc_id in self._locuciones_por_posicion.get(posicion, ()):
+            if token in self._locuciones[loc_id].componentes:
                 return loc_id
         return None
     
+    def _registrar_locucion(self, locucion: Locucion) -> None:
+        """Registrar locución y actualizar índices de posición y componente"""
+        self._escribir_locuciones()
+        self._locuciones[locucion.id] = locucion
+        self._automata_locuciones = None
+        if self._almacen is not None:
+            self._almacen.marcar_locucion(locucion)
+        if self._registro_delta is not None:
+            self._registro_delta.locuciones[locucion.id] = None
+        
+        for pos in locucion.posiciones:
+            self._locuciones_por_posicion.setdefault(pos, []).append(locucion.id)
+        
+        for comp in set(locucion.componentes):
+            self._locuciones_por_componente.setdefault(comp, []).append(locucion.id)
+    
     def _a4_verificar_completitud(self, texto: str) -> bool:
         """
         A4. Verificación de completitud (P8.A4)
@@ -273,7 +717,10 @@ class Glosario:
         OBLIGATORIA - FALLO CRÍTICO si incompleto
         """
         # Contar tokens en texto (simplificado)
-        tokens_texto = set(re.findall(r'\b\w+\b', texto))
+        return self._a4_verificar_vocabulario(set(re.findall(r'\b\w+\b', texto)))
+    
+    def _a4_verificar_vocabulario(self, tokens_texto: Set[str]) -> bool:
+        """A4 sobre el vocabulario ya extraído del texto"""
         tokens_registrados = set(self._entradas.keys())
         
         # Agregar componentes de locuciones
@@ -288,10 +735,12 @@ class Glosario:
         
         # Sellar glosario
         self._sellado = True
+        self._version += 1
         self._registrar_historial("GLOSARIO_SELLADO", {
             "total_entradas": len(self._entradas),
             "total_locuciones": len(self._locuciones)
         })
+        self.sincronizar()
         
         return True
     
@@ -328,9 +777,9 @@ class Glosario:
         entrada = self._entradas.get(token)
         if entrada and entrada.status == TokenStatus.BLOQUEADO:
             # Buscar a qué locución pertenece
-            for loc_id, loc in self._locuciones.items():
-                if token in loc.componentes:
-                    return loc_id
+            loc_ids = self._locuciones_por_componente.get(token)
+            if loc_ids:
+                return loc_ids[0]
         
         return None
     
@@ -372,26 +821,34 @@ class Glosario:
         if not entrada:
             return False
         
+        if self._registro_escrituras is not None:
+            self._registro_escrituras.append((token, tgt, margen, etiqueta, func_role))
+        
         # Si es núcleo y ya tiene traducción, verificar sinonimia
         if entrada.es_nucleo() and entrada.token_tgt:
             self.fase_b_verificar_sinonimia(token, tgt)
             return True  # Ya asignado correctamente
         
         # Asignar
+        entrada = self._entrada_escribible(token)
         if entrada.es_particula() and func_role:
             # Partículas pueden tener traducciones por función
             entrada.traducciones_por_funcion[func_role] = tgt
         
+        self._contar(entrada, -1)
         entrada.token_tgt = tgt
         entrada.status = TokenStatus.ASIGNADO
         entrada.margen = margen
         entrada.etiqueta = etiqueta
+        self._contar(entrada, 1)
+        self._marcar_modificada(token)
         
         self._registrar_historial("ASIGNACION", {
             "token": token,
             "traduccion": tgt,
             "margen": margen,
-            "etiqueta": etiqueta
+            "etiqueta": etiqueta,
+            "func_role": func_role.name if func_role else None
         })
         
         return True
@@ -419,6 +876,79 @@ class Glosario:
         loc = self._locuciones.get(locucion_id)
         return loc.tgt if loc else None
     
+    def huella(self, token: str) -> Tuple:
+        """
+        Estado del glosario que interviene en la traducción de un token
+        
+        Entrada (sin ocurrencias) y locuciones de las que es componente;
+        cualquier cambio en ellas cambia la huella. Solo contiene str,
+        int y None (repr estable: claves de la caché de oraciones).
+        """
+        entrada = self._entradas.get(token)
+        if entrada is not None:
+            estado = (
+                entrada.categoria.name, entrada.token_tgt, entrada.status.name,
+                entrada.margen, entrada.etiqueta,
+                tuple((func.name, tgt) for func, tgt in entrada.traducciones_por_funcion.items())
+            )
+        else:
+            estado = None
+        
+        locuciones = tuple(
+            (loc.id, loc.src, loc.tgt, loc.status, tuple(loc.posiciones))
+            for loc in (self._locuciones[loc_id]
+                        for loc_id in self._locuciones_por_componente.get(token, ()))
+        )
+        return estado, locuciones
+    
+    # ══════════════════════════════════════════════════════════
+    # ESCRITURAS DIFERIDAS (TRADUCCIÓN PARALELA)
+    # ══════════════════════════════════════════════════════════
+    
+    def iniciar_registro_escrituras(self) -> None:
+        """
+        Registrar cada llamada a fase_b_asignar a partir de ahora
+        
+        Lo usan los procesos de traducción paralela, que trabajan sobre
+        una copia del glosario sellado y devuelven sus escrituras.
+        """
+        self._registro_escrituras = []
+    
+    def extraer_registro_escrituras(self) -> List[EscrituraFaseB]:
+        """Devolver las escrituras registradas y vaciar el registro"""
+        escrituras = self._registro_escrituras or []
+        if self._registro_escrituras is not None:
+            self._registro_escrituras = []
+        return escrituras
+    
+    @contextmanager
+    def capturar_escrituras(self) -> Iterator[List[EscrituraFaseB]]:
+        """
+        Escrituras de Fase B hechas dentro del bloque
+        
+        Compatible con un registro ya iniciado (procesos trabajadores):
+        al salir, las escrituras capturadas pasan también a ese registro.
+        """
+        exterior = self._registro_escrituras
+        self._registro_escrituras = capturadas = []
+        try:
+            yield capturadas
+        finally:
+            if exterior is not None:
+                exterior.extend(capturadas)
+            self._registro_escrituras = exterior
+    
+    def aplicar_escrituras(self, escrituras: Iterable[EscrituraFaseB]) -> None:
+        """
+        Reproducir escrituras de Fase B en el orden recibido
+        
+        Aplicadas en orden de oración, dejan el glosario exactamente
+        como lo habría dejado la traducción serial.
+        """
+        for token, tgt, margen, etiqueta, func_role in escrituras:
+            self.fase_b_asignar(token, tgt, margen=margen,
+                                etiqueta=etiqueta, func_role=func_role)
+    
     # ══════════════════════════════════════════════════════════
     # FASE C: INMUTABILIDAD - MODIFICACIONES POR USUARIO
     # ══════════════════════════════════════════════════════════
@@ -435,15 +965,20 @@ class Glosario:
             return False, 0
         
         antigua_tgt = entrada.token_tgt
+        entrada = self._entrada_escribible(token)
+        self._contar(entrada, -1)
         entrada.token_tgt = nueva_tgt
+        self._contar(entrada, 1)
+        self._marcar_modificada(token)
         
         self._registrar_historial("ACTUALIZACION_USUARIO", {
             "token": token,
             "anterior": antigua_tgt,
             "nuevo": nueva_tgt
         })
+        self.sincronizar()
         
-        return True, len(entrada.ocurrencias)
+        return True, entrada.num_ocurrencias()
     
     def agregar_entrada(self, token: str, categoria: TokenCategoria, 
                         tgt: Optional[str] = None) -> bool:
@@ -457,13 +992,14 @@ class Glosario:
             token_tgt=tgt,
             status=TokenStatus.ASIGNADO if tgt else TokenStatus.PENDIENTE
         )
-        self._entradas[token] = entrada
+        self._poner_entrada(token, entrada)
         
         self._registrar_historial("ENTRADA_AGREGADA_USUARIO", {
             "token": token,
             "categoria": categoria.name,
             "traduccion": tgt
         })
+        self.sincronizar()
         
         return True
     
@@ -483,18 +1019,22 @@ class Glosario:
             tgt=tgt
         )
         
-        self._locuciones[loc_id] = locucion
+        self._registrar_locucion(locucion)
         
         # Bloquear componentes
         for comp in componentes:
             if comp in self._entradas:
-                self._entradas[comp].status = TokenStatus.BLOQUEADO
+                self._cambiar_status(self._entrada_escribible(comp), TokenStatus.BLOQUEADO)
+                self._marcar_modificada(comp)
         
         self._registrar_historial("LOCUCION_AGREGADA_USUARIO", {
             "id": loc_id,
             "src": src,
-            "tgt": tgt
+            "tgt": tgt,
+            "componentes": componentes,
+            "posiciones": posiciones
         })
+        self.sincronizar()
         
         return locucion
     
@@ -509,16 +1049,146 @@ class Glosario:
         if not entrada:
             return False, 0
         
-        ocurrencias = len(entrada.ocurrencias)
-        del self._entradas[token]
+        ocurrencias = entrada.num_ocurrencias()
+        self._quitar_entrada(token)
         
         self._registrar_historial("ENTRADA_ELIMINADA_USUARIO", {
             "token": token,
             "ocurrencias_afectadas": ocurrencias
         })
+        self.sincronizar()
         
         return True, ocurrencias
     
+    def aplicar_cambios(self, cambios: Iterable[CambioGlosario],
+                        eliminar: Iterable[str] = (),
+                        sobrescribir: bool = True) -> Dict[str, int]:
+        """
+        Aplicar en bloque cambios del usuario (editor de tabla, lotes)
+        
+        Cada cambio (token, tgt, categoría) actualiza la entrada o, si no
+        existe, la agrega (categoría None = NÚCLEO). En entradas
+        existentes, None deja el campo como está; una traducción pasa la
+        entrada PENDIENTE a ASIGNADO y borrarla ("") la devuelve de
+        ASIGNADO a PENDIENTE. Las filas sin diferencias se omiten.
+        
+        El lote se valida completo antes de escribir nada:
+          - Un token no puede recibir dos traducciones distintas
+          - Los componentes bloqueados por una locución no se traducen
+            por separado (P8.B2)
+          - Con sobrescribir=False, un núcleo ya traducido conserva su
+            traducción (sinonimia, P8.B3)
+        
+        Se escribe un único registro de historial (CAMBIOS_USUARIO) y el
+        almacén se sincroniza una vez.
+        
+        Args:
+            cambios: Tuplas (token, tgt, categoría), p. ej.
+                     zip(df.index, df["token_tgt"], df["categoria"])
+            eliminar: Tokens a eliminar (después de aplicar los cambios)
+            sobrescribir: Permitir cambiar la traducción de un núcleo
+        
+        Returns:
+            {"actualizadas", "agregadas", "eliminadas", "sin_cambios"}
+        
+        Raises:
+            CambiosRechazadosError: Con todos los conflictos del lote
+        """
+        propuestas: Dict[str, Tuple[Optional[str], Optional[TokenCategoria]]] = {}
+        conflictos: List[GlosarioError] = []
+        
+        for token, tgt, categoria in cambios:
+            if token in propuestas:
+                anterior = propuestas[token][0]
+                if tgt != anterior:
+                    conflictos.append(SinonimiaError(token, anterior, tgt))
+                continue
+            propuestas[token] = (tgt, categoria)
+        
+        for token, (tgt, _) in propuestas.items():
+            entrada = self._entradas.get(token)
+            if entrada is None or tgt is None or tgt == entrada.token_tgt:
+                continue
+            if entrada.status == TokenStatus.BLOQUEADO:
+                loc_ids = self._locuciones_por_componente.get(token)
+                conflictos.append(LocucionBloqueadaError(token, loc_ids[0] if loc_ids else None))
+            elif not sobrescribir and entrada.es_nucleo() and entrada.token_tgt:
+                conflictos.append(SinonimiaError(token, entrada.token_tgt, tgt))
+        
+        if conflictos:
+            raise CambiosRechazadosError(conflictos)
+        
+        eliminados = [token for token in dict.fromkeys(eliminar) if token in self._entradas]
+        informe = {"actualizadas": 0, "agregadas": 0, "eliminadas": 0, "sin_cambios": 0}
+        registro: List[List[Optional[str]]] = []
+        
+        # Lote grande: reconstruir los índices al consultarlos cuesta
+        # menos que mantenerlos entrada a entrada
+        if len(propuestas) + len(eliminados) > len(self._entradas) // 8:
+            self._indice = None
+            self._indice_busqueda = None
+        
+        with self.transaccion():
+            for token, (tgt, categoria) in propuestas.items():
+                entrada = self._entradas.get(token)
+                if entrada is None:
+                    categoria = categoria or TokenCategoria.NUCLEO
+                    self._poner_entrada(token, EntradaGlosario(
+                        token_src=token,
+                        categoria=categoria,
+                        token_tgt=tgt,
+                        status=TokenStatus.ASIGNADO if tgt else TokenStatus.PENDIENTE
+                    ))
+                    registro.append([token, None, tgt, categoria.name])
+                    informe["agregadas"] += 1
+                    continue
+                
+                nueva_tgt = entrada.token_tgt if tgt is None else tgt
+                nueva_categoria = categoria or entrada.categoria
+                nuevo_status = entrada.status
+                if nueva_tgt and nuevo_status == TokenStatus.PENDIENTE:
+                    nuevo_status = TokenStatus.ASIGNADO
+                elif not nueva_tgt and nuevo_status == TokenStatus.ASIGNADO:
+                    nuevo_status = TokenStatus.PENDIENTE
+                
+                if (nueva_tgt == entrada.token_tgt and nueva_categoria == entrada.categoria
+                        and nuevo_status == entrada.status):
+                    informe["sin_cambios"] += 1
+                    continue
+                
+                anterior = entrada.token_tgt
+                entrada = self._entrada_escribible(token)
+                self._contar(entrada, -1)
+                entrada.token_tgt = nueva_tgt
+                entrada.categoria = nueva_categoria
+                entrada.status = nuevo_status
+                self._contar(entrada, 1)
+                self._marcar_modificada(token)
+                registro.append([token, anterior, nueva_tgt, nueva_categoria.name])
+                informe["actualizadas"] += 1
+            
+            for token in eliminados:
+                self._quitar_entrada(token)
+            informe["eliminadas"] = len(eliminados)
+            
+            if registro or eliminados:
+                self._registrar_historial("CAMBIOS_USUARIO", {
+                    "cambios": registro,
+                    "eliminados": eliminados
+                })
+        
+        return informe
+    
+    def _quitar_entrada(self, token: str) -> None:
+        """Eliminar entrada manteniendo los contadores"""
+        self._escribir_entradas()
+        entrada = self._entradas.pop(token)
+        self._contar(entrada, -1)
+        if self._copiadas is not None:
+            self._copiadas.discard(token)
+        if self._registro_delta is not None:
+            self._registro_delta.eliminar(token)
+    
     # ══════════════════════════════════════════════════════════
     # CONSULTAS Y UTILIDADES
     # ══════════════════════════════════════════════════════════
@@ -527,51 +1197,258 @@ class Glosario:
         """Obtener entrada por token"""
         return self._entradas.get(token)
     
+    def obtener_tokens(self) -> List[str]:
+        """Obtener todos los tokens registrados"""
+        return list(self._entradas)
+    
     def obtener_locucion(self, loc_id: str) -> Optional[Locucion]:
         """Obtener locución por ID"""
         return self._locuciones.get(loc_id)
     
-    def obtener_locuciones(self) -> Dict[str, Locucion]:
-        """Obtener todas las locuciones"""
-        return self._locuciones.copy()
+    def obtener_locuciones(self) -> Mapping[str, Locucion]:
+        """
+        Obtener todas las locuciones (vista de solo lectura, sin copia)
+        
+        La vista no cambia: un registro posterior copia antes el diccionario.
+        """
+        self._locuciones_compartidas = True
+        return MappingProxyType(self._locuciones)
+    
+    def asignar_locucion(self, loc_id: str, tgt: str) -> bool:
+        """Fijar la traducción de una locución (Fase B, estrategia IDIOM)"""
+        locucion = self._locuciones.get(loc_id)
+        if locucion is None:
+            return False
+        
+        # La locución puede estar compartida con instantáneas: se reemplaza
+        self._escribir_locuciones()
+        locucion = replace(locucion, tgt=tgt)
+        self._locuciones[loc_id] = locucion
+        self._automata_locuciones = None
+        if self._almacen is not None:
+            self._almacen.marcar_locucion(locucion)
+        if self._registro_delta is not None:
+            self._registro_delta.locuciones[loc_id] = None
+        
+        return True
+    
+    def buscar_locuciones(self, tokens: List[str]) -> List[Tuple[Locucion, int]]:
+        """
+        Localizar las locuciones presentes en una secuencia de tokens
+        
+        Returns:
+            Lista de (locución, posición inicial en la secuencia)
+        """
+        if not self._locuciones:
+            return []
+        
+        if self._automata_locuciones is None:
+            self._automata_locuciones = AutomataLocuciones(self._locuciones.values())
+        
+        return self._automata_locuciones.buscar(tokens)
     
     def obtener_entradas_por_margen(self) -> List[EntradaGlosario]:
         """Obtener entradas ordenadas por margen (mayor a menor)"""
-        return sorted(
-            self._entradas.values(),
-            key=lambda e: e.margen,
-            reverse=True
-        )
+        entradas, _ = self.obtener_pagina(limite=len(self._entradas))
+        return entradas
+    
+    def buscar(self, consulta: str, limite: int = 20) -> List[Tuple[EntradaGlosario, str]]:
+        """
+        Buscar entradas por token fuente, traducción o lema (ver busqueda.py)
+        
+        Insensible a diacríticos y a ʿ/ʾ; los tokens en escritura árabe
+        se encuentran también por sus consonantes ("aql" → عقل). Sin
+        coincidencias exactas, recurre a una búsqueda aproximada.
+        
+        Returns:
+            Lista de (entrada, tipo de coincidencia)
+        """
+        if self._indice_busqueda is None:
+            self._indice_busqueda = IndiceBusqueda(
+                (token, entrada.token_tgt) for token, entrada in self._iterar_entradas()
+            )
+        
+        return [
+            (self._entradas[token], tipo)
+            for token, tipo in self._indice_busqueda.buscar(consulta, limite)
+        ]
     
     def obtener_alternativas(self) -> List[EntradaGlosario]:
         """Obtener entradas de alto margen (para comando [ALTERNATIVAS])"""
-        return [e for e in self._entradas.values() if e.margen >= 3]
+        entradas, _ = self.obtener_pagina(limite=len(self._entradas),
+                                          margen_minimo=self.MARGEN_ALTERNATIVAS)
+        return entradas
+    
+    def obtener_pagina(self, limite: int = 50, pagina: int = 1,
+                       prefijo: Optional[str] = None,
+                       status: Optional[TokenStatus] = None,
+                       margen_minimo: Optional[int] = None) -> Tuple[List[EntradaGlosario], int]:
+        """
+        Obtener una página de entradas en orden (margen desc, token)
+        
+        Args:
+            limite: Entradas por página
+            pagina: Página (desde 1)
+            prefijo: Solo tokens que empiezan por este prefijo
+            status: Solo entradas con este status
+            margen_minimo: Solo entradas con margen >= este valor
+        
+        Returns:
+            (entradas de la página, total de entradas que cumplen los filtros)
+        """
+        if self._indice is None:
+            self._indice = IndiceGlosario(entrada for _, entrada in self._iterar_entradas())
+        
+        inicio = (max(1, pagina) - 1) * limite
+        tokens, total = self._indice.pagina(inicio, limite, prefijo, status, margen_minimo)
+        return [self._entradas[token] for token in tokens], total
     
     def obtener_estadisticas(self) -> Dict[str, int]:
-        """Obtener estadísticas del glosario"""
-        total = len(self._entradas)
-        asignadas = sum(1 for e in self._entradas.values() 
-                        if e.status == TokenStatus.ASIGNADO)
-        pendientes = sum(1 for e in self._entradas.values() 
-                         if e.status == TokenStatus.PENDIENTE)
-        bloqueadas = sum(1 for e in self._entradas.values() 
-                         if e.status == TokenStatus.BLOQUEADO)
+        """Obtener estadísticas del glosario (desde los contadores, O(1))"""
+        por_status = {status: 0 for status in TokenStatus}
+        for (_, status), cantidad in self._conteo.items():
+            por_status[status] += cantidad
         
         return {
-            "total": total,
-            "asignadas": asignadas,
-            "pendientes": pendientes,
-            "bloqueadas": bloqueadas,
+            "total": len(self._entradas),
+            "asignadas": por_status[TokenStatus.ASIGNADO],
+            "pendientes": por_status[TokenStatus.PENDIENTE],
+            "bloqueadas": por_status[TokenStatus.BLOQUEADO],
             "locuciones": len(self._locuciones)
         }
     
-    def obtener_consultas_pendientes(self) -> List[Consulta]:
-        """Obtener consultas pendientes"""
-        return self._consultas_pendientes.copy()
+    def obtener_estadisticas_categoria(self) -> Dict[str, Dict[str, int]]:
+        """Desglose de entradas por categoría y status: {categoria: {status: n}}"""
+        desglose: Dict[str, Dict[str, int]] = {}
+        for (categoria, status), cantidad in self._conteo.items():
+            if cantidad:
+                desglose.setdefault(categoria.name, {})[status.name] = cantidad
+        return desglose
+    
+    def verificar_contadores(self) -> bool:
+        """Comprobar que los contadores coinciden con un recuento completo"""
+        recuento: Dict[Tuple[TokenCategoria, TokenStatus], int] = {}
+        for _, entrada in self._iterar_entradas():
+            clave = (entrada.categoria, entrada.status)
+            recuento[clave] = recuento.get(clave, 0) + 1
+        
+        return recuento == {clave: n for clave, n in self._conteo.items() if n}
     
-    def limpiar_consultas_pendientes(self) -> None:
-        """Limpiar consultas pendientes"""
-        self._consultas_pendientes.clear()
+    def _contar(self, entrada: EntradaGlosario, delta: int) -> None:
+        """Sumar (delta=1) o restar (delta=-1) una entrada de contadores e índice"""
+        clave = (entrada.categoria, entrada.status)
+        self._conteo[clave] = self._conteo.get(clave, 0) + delta
+        
+        if self._indice is not None:
+            if delta > 0:
+                self._indice.agregar(entrada)
+            else:
+                self._indice.quitar(entrada)
+        
+        if self._indice_busqueda is not None:
+            if delta > 0:
+                self._indice_busqueda.agregar(entrada.token_src, entrada.token_tgt)
+            else:
+                self._indice_busqueda.quitar(entrada.token_src, entrada.token_tgt)
+    
+    def _cambiar_status(self, entrada: EntradaGlosario, status: TokenStatus) -> None:
+        """Transición de status manteniendo los contadores"""
+        if entrada.status != status:
+            self._contar(entrada, -1)
+            entrada.status = status
+            self._contar(entrada, 1)
+    
+    def _poner_entrada(self, token: str, entrada: EntradaGlosario) -> None:
+        """Agregar o reemplazar entrada manteniendo los contadores"""
+        self._escribir_entradas()
+        anterior = self._entradas.get(token)
+        if anterior is not None:
+            self._contar(anterior, -1)
+        self._entradas[token] = entrada
+        self._contar(entrada, 1)
+        if self._copiadas is not None:
+            self._copiadas.add(token)
+        if self._registro_delta is not None:
+            self._registro_delta.reescribir(token)
+    
+    # ══════════════════════════════════════════════════════════
+    # INSTANTÁNEAS (COPY-ON-WRITE)
+    # ══════════════════════════════════════════════════════════
+    
+    @property
+    def version(self) -> int:
+        """Versión del glosario (crece con cada escritura)"""
+        return self._version
+    
+    def instantanea(self) -> InstantaneaGlosario:
+        """
+        Vista inmutable del estado actual, sin copiar el glosario
+        
+        La instantánea comparte diccionarios y entradas con el glosario.
+        La primera escritura posterior copia el diccionario afectado, y
+        cada entrada se copia antes de modificarla por primera vez
+        (copy-on-write). Sin escrituras intermedias se devuelve la misma
+        instantánea.
+        
+        Con almacén, la instantánea lee por una conexión propia con una
+        transacción de lectura abierta (estado sincronizado al crearla),
+        que se cierra al terminar de usarla (ver InstantaneaGlosario).
+        """
+        anterior = self._instantanea
+        if anterior is not None and anterior.version == self._version and not anterior.cerrada:
+            return anterior
+        
+        lector = None
+        if self._almacen is not None:
+            lector = entradas = self._almacen.lector()
+        else:
+            entradas = self._entradas
+            self._entradas_compartidas = True
+            self._copiadas = set()
+        self._locuciones_compartidas = True
+        
+        self._instantanea = InstantaneaGlosario(
+            version=self._version,
+            entradas=MappingProxyType(entradas),
+            locuciones=MappingProxyType(self._locuciones),
+            sellado=self._sellado,
+            _lector=lector
+        )
+        if anterior is not None and anterior._lector is not None and not anterior._lector.en_uso:
+            anterior.cerrar()
+        return self._instantanea
+    
+    def _escribir_entradas(self) -> None:
+        """Preparar escritura en entradas: copiar el diccionario si está compartido"""
+        self._version += 1
+        if self._entradas_compartidas:
+            self._entradas = dict(self._entradas)
+            self._entradas_compartidas = False
+    
+    def _escribir_locuciones(self) -> None:
+        """Preparar escritura en locuciones: copiar el diccionario si está compartido"""
+        self._version += 1
+        if self._locuciones_compartidas:
+            self._locuciones = dict(self._locuciones)
+            self._locuciones_compartidas = False
+    
+    def _entrada_escribible(self, token: str) -> EntradaGlosario:
+        """Entrada que puede modificarse sin alterar ninguna instantánea"""
+        self._escribir_entradas()
+        entrada = self._entradas[token]
+        if self._copiadas is not None and token not in self._copiadas:
+            entrada = _copiar_entrada(entrada)
+            self._entradas[token] = entrada
+            self._copiadas.add(token)
+        return entrada
+    
+    def __getstate__(self):
+        # Las instantáneas (vistas sobre diccionarios) y el registro de
+        # deltas no se copian
+        estado = self.__dict__.copy()
+        estado["_instantanea"] = None
+        estado["_registro_delta"] = None
+        return estado
     
     # ══════════════════════════════════════════════════════════
     # HISTORIAL
@@ -579,48 +1456,252 @@ class Glosario:
     
     def _registrar_historial(self, accion: str, datos: Dict[str, Any]) -> None:
         """Registrar acción en historial"""
-        self._historial.append({
-            "accion": accion,
-            "datos": datos,
-            "timestamp": datetime.now().isoformat()
-        })
+        self._historial.registrar(accion, datos)
+    
+    def obtener_historial(self, accion: Optional[str] = None, token: Optional[str] = None,
+                          limite: Optional[int] = None, pagina: int = 1) -> List[Dict[str, Any]]:
+        """
+        Obtener historial de cambios (registros en memoria)
+        
+        Args:
+            accion: Filtrar por acción (ASIGNACION, ACTUALIZACION_USUARIO...)
+            token: Filtrar por token
+            limite: Registros por página (None = todos)
+            pagina: Página (desde 1)
+        """
+        return self._historial.consultar(accion, token, limite, pagina)
+    
+    def activar_diario(self, ruta: str) -> str:
+        """
+        Escribir el historial también en un diario JSON Lines
+        
+        Returns:
+            Identificador de la sesión del diario (ver reproducir_diario)
+        """
+        return self._historial.abrir_diario(ruta)
+    
+    def cerrar_diario(self) -> None:
+        self._historial.cerrar_diario()
+    
+    def reproducir_diario(self, ruta: str, sesion: Optional[str] = None) -> int:
+        """
+        Reaplicar los cambios de un diario sobre este glosario
+        
+        El glosario debe estar en el estado en que empezó el diario, o la
+        sesión `sesion` (normalmente, recién sellado en Fase A sobre el
+        mismo texto): con `sesion` se omiten las sesiones anteriores, ya
+        incluidas en el glosario. No debe tener activo el mismo diario.
+        
+        Args:
+            ruta: Diario JSON Lines
+            sesion: Primera sesión a reaplicar (la devuelta por activar_diario)
+        
+        Returns:
+            Número de registros aplicados
+        """
+        aplicados = 0
+        
+        for registro in leer_diario(ruta, sesion):
+            accion, datos = registro["accion"], registro["datos"]
+            
+            if accion == "ASIGNACION":
+                func_role = datos.get("func_role")
+                self.fase_b_asignar(datos["token"], datos["traduccion"],
+                                    margen=datos["margen"], etiqueta=datos["etiqueta"],
+                                    func_role=FuncRole[func_role] if func_role else None)
+            elif accion == "ACTUALIZACION_USUARIO":
+                self.actualizar_entrada(datos["token"], datos["nuevo"])
+            elif accion == "ENTRADA_AGREGADA_USUARIO":
+                self.agregar_entrada(datos["token"], TokenCategoria[datos["categoria"]],
+                                     datos["traduccion"])
+                if "margen" in datos:
+                    # Agregada por una fusión: margen y etiqueta de la previa
+                    entrada = self._entrada_escribible(datos["token"])
+                    self._contar(entrada, -1)
+                    entrada.margen = datos["margen"]
+                    entrada.etiqueta = datos["etiqueta"]
+                    self._contar(entrada, 1)
+                    self._marcar_modificada(datos["token"])
+            elif accion == "LOCUCION_AGREGADA_USUARIO":
+                self.agregar_locucion(datos["src"], datos["componentes"],
+                                      datos["posiciones"], datos["tgt"])
+            elif accion == "ENTRADA_ELIMINADA_USUARIO":
+                self.eliminar_entrada(datos["token"])
+            elif accion == "CAMBIOS_USUARIO":
+                self.aplicar_cambios(
+                    ((token, tgt, TokenCategoria[categoria])
+                     for token, _, tgt, categoria in datos["cambios"]),
+                    eliminar=datos["eliminados"]
+                )
+            elif accion == "GLOSARIO_FUSIONADO":
+                for token, rol, tgt in datos.get("funciones", ()):
+                    self._fusionar_funciones(token, {FuncRole[rol]: tgt})
+                for loc_id, tgt in datos.get("locuciones", ()):
+                    self.asignar_locucion(loc_id, tgt)
+            elif accion == "GLOSARIO_SELLADO":
+                self._sellado = True
+            else:
+                continue
+            
+            aplicados += 1
+        
+        return aplicados
+    
+    # ══════════════════════════════════════════════════════════
+    # DELTAS (PUNTOS DE CONTROL)
+    # ══════════════════════════════════════════════════════════
+    
+    def iniciar_registro_delta(self) -> None:
+        """Registrar los cambios a partir de ahora (ver extraer_delta)"""
+        self._registro_delta = RegistroDelta()
+    
+    def detener_registro_delta(self) -> None:
+        self._registro_delta = None
+    
+    def extraer_delta(self) -> Dict[str, Any]:
+        """
+        Cambios desde iniciar_registro_delta o la extracción anterior
+        
+        Las entradas tocadas van completas salvo las ocurrencias: solo las
+        anexadas desde entonces ("desde" = cuántas había). El resultado es
+        serializable en JSON y el registro sigue activo, vacío.
+        """
+        registro = self._registro_delta
+        self._registro_delta = RegistroDelta()
+        
+        entradas = {
+            token: _entrada_a_dict(self._entradas[token], desde)
+            for token, desde in registro.ocurrencias_previas.items()
+            if token not in registro.reescritas
+        }
+        for token in registro.reescritas:
+            entradas[token] = _entrada_a_dict(self._entradas[token])
+        
+        return self._delta(entradas, list(registro.eliminadas),
+                           {loc_id: self._locuciones[loc_id] for loc_id in registro.locuciones})
     
-    def obtener_historial(self) -> List[Dict[str, Any]]:
-        """Obtener historial de cambios"""
-        return self._historial.copy()
+    def delta_completo(self) -> Dict[str, Any]:
+        """Delta con el glosario entero: aplicado a un glosario vacío, lo reproduce"""
+        return self._delta(
+            {token: _entrada_a_dict(entrada) for token, entrada in self._iterar_entradas()},
+            [], self._locuciones
+        )
+    
+    def _delta(self, entradas: Dict[str, Dict[str, Any]], eliminadas: List[str],
+               locuciones: Mapping[str, Locucion]) -> Dict[str, Any]:
+        return {
+            "entradas": entradas,
+            "eliminadas": eliminadas,
+            "locuciones": {loc_id: _locucion_a_dict(loc) for loc_id, loc in locuciones.items()},
+            "locucion_counter": self._locucion_counter,
+            "sellado": self._sellado
+        }
+    
+    def aplicar_delta(self, delta: Dict[str, Any]) -> None:
+        """
+        Aplicar un delta de extraer_delta o delta_completo
+        
+        Raises:
+            GlosarioError: Si las ocurrencias de una entrada no continúan
+                           donde indica el delta (delta de otro estado)
+        """
+        with self.transaccion():
+            for token in delta["eliminadas"]:
+                if token in self._entradas:
+                    self._quitar_entrada(token)
+            
+            for token, datos in delta["entradas"].items():
+                nueva = _dict_a_entrada(token, datos)
+                desde = datos.get("desde", 0)
+                if not desde:
+                    self._poner_entrada(token, nueva)
+                    continue
+                
+                entrada = self._entradas.get(token)
+                if entrada is None or len(entrada.ocurrencias) != desde:
+                    raise GlosarioError(
+                        f"Delta no aplicable a '{token}': se esperaban {desde} ocurrencias"
+                    )
+                entrada = self._entrada_escribible(token)
+                self._contar(entrada, -1)
+                entrada.categoria = nueva.categoria
+                entrada.token_tgt = nueva.token_tgt
+                entrada.status = nueva.status
+                entrada.margen = nueva.margen
+                entrada.etiqueta = nueva.etiqueta
+                entrada.func_roles = nueva.func_roles
+                entrada.traducciones_por_funcion = nueva.traducciones_por_funcion
+                entrada.ocurrencias.extend(nueva.ocurrencias)
+                self._contar(entrada, 1)
+                self._marcar_modificada(token)
+                if self._almacen is not None:
+                    self._almacen.marcar_ocurrencias(token)
+            
+            for loc_id, datos in delta["locuciones"].items():
+                if loc_id in self._locuciones:
+                    self.asignar_locucion(loc_id, datos.get("tgt"))
+                else:
+                    self._registrar_locucion(_dict_a_locucion(loc_id, datos))
+            
+            self._locucion_counter = delta["locucion_counter"]
+            self._sellado = delta["sellado"]
     
     # ══════════════════════════════════════════════════════════
     # EXPORTACIÓN E IMPORTACIÓN
     # ══════════════════════════════════════════════════════════
     
+    # Columnas de la exportación CSV
+    COLUMNAS_CSV = ["token_src", "token_tgt", "categoria", "status", "margen", "etiqueta"]
+    
     def exportar_json(self) -> str:
-        """Exportar glosario a JSON"""
-        data = {
-            "entradas": {
-                token: {
-                    "categoria": e.categoria.name,
-                    "token_tgt": e.token_tgt,
-                    "status": e.status.name,
-                    "margen": e.margen,
-                    "ocurrencias": e.ocurrencias,
-                    "etiqueta": e.etiqueta
-                }
-                for token, e in self._entradas.items()
-            },
-            "locuciones": {
-                loc_id: {
-                    "src": loc.src,
-                    "tgt": loc.tgt,
-                    "componentes": loc.componentes,
-                    "posiciones": loc.posiciones
-                }
-                for loc_id, loc in self._locuciones.items()
-            },
-            "sellado": self._sellado,
-            "exportado": datetime.now().isoformat()
-        }
+        """Exportar glosario a JSON (desde una instantánea)"""
+        with self.instantanea() as inst:
+            data = {
+                "entradas": {
+                    token: _entrada_a_dict(e)
+                    for token, e in inst.iterar_entradas()
+                },
+                "locuciones": {
+                    loc_id: _locucion_a_dict(loc)
+                    for loc_id, loc in inst.locuciones.items()
+                },
+                "sellado": inst.sellado,
+                "exportado": datetime.now().isoformat()
+            }
         return json.dumps(data, ensure_ascii=False, indent=2)
     
+    def exportar_jsonl(self, archivo: TextIO) -> int:
+        """
+        Exportar glosario a JSON Lines, registro a registro
+        
+        Primera línea: {"tipo": "glosario", ...}; después una línea por
+        entrada ({"tipo": "entrada", "token": ...}) y por locución
+        ({"tipo": "locucion", "id": ...}). Se lee de una instantánea.
+        
+        Returns:
+            Número de entradas escritas
+        """
+        with self.instantanea() as inst:
+            archivo.write(json.dumps({
+                "tipo": "glosario",
+                "sellado": inst.sellado,
+                "exportado": datetime.now().isoformat()
+            }) + "\n")
+            
+            total = 0
+            for token, entrada in inst.iterar_entradas():
+                registro = {"tipo": "entrada", "token": token}
+                registro.update(_entrada_a_dict(entrada))
+                archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                total += 1
+            
+            for loc_id, loc in inst.locuciones.items():
+                registro = {"tipo": "locucion", "id": loc_id}
+                registro.update(_locucion_a_dict(loc))
+                archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        
+        return total
+    
     def exportar_txt(self) -> str:
         """Exportar glosario a texto plano"""
         lineas = ["GLOSARIO", "=" * 40, ""]
@@ -641,58 +1722,418 @@ class Glosario:
     
     def exportar_csv(self) -> str:
         """Exportar glosario a CSV"""
-        lineas = ["token_src,token_tgt,categoria,status,margen,etiqueta"]
+        salida = io.StringIO()
+        self.exportar_csv_archivo(salida)
+        return salida.getvalue()
+    
+    def exportar_csv_archivo(self, archivo: TextIO) -> int:
+        """
+        Exportar glosario a CSV (RFC 4180), entrada a entrada
         
-        for token, entrada in self._entradas.items():
-            linea = f'"{token}","{entrada.token_tgt or ""}",{entrada.categoria.name},{entrada.status.name},{entrada.margen},"{entrada.etiqueta or ""}"'
-            lineas.append(linea)
+        El archivo debe abrirse con newline="". Se lee de una instantánea.
         
-        return "\n".join(lineas)
+        Returns:
+            Número de entradas escritas
+        """
+        escritor = csv.writer(archivo)
+        escritor.writerow(self.COLUMNAS_CSV)
+        
+        total = 0
+        with self.instantanea() as inst:
+            for token, entrada in inst.iterar_entradas():
+                escritor.writerow([
+                    token, entrada.token_tgt or "", entrada.categoria.name,
+                    entrada.status.name, entrada.margen, entrada.etiqueta or ""
+                ])
+                total += 1
+        
+        return total
+    
+    def _iterar_entradas(self) -> Iterator[Tuple[str, EntradaGlosario]]:
+        """Recorrer entradas sin retener en memoria las del almacén"""
+        if self._almacen is not None:
+            return self._almacen.iterar_sin_cache()
+        return iter(self._entradas.items())
+    
+    # ══════════════════════════════════════════════════════════
+    # ALMACÉN PERSISTENTE
+    # ══════════════════════════════════════════════════════════
+    
+    @classmethod
+    def abrir(cls, ruta: str) -> 'Glosario':
+        """
+        Abrir (o crear) un glosario en un almacén SQLite
+        
+        Las entradas se cargan al primer acceso; los cambios se guardan
+        de forma incremental (ver AlmacenGlosario).
+        """
+        glosario = cls()
+        almacen = AlmacenGlosario(ruta)
+        glosario._entradas = almacen
+        
+        for locucion in almacen.cargar_locuciones():
+            glosario._registrar_locucion(locucion)
+        
+        meta = almacen.cargar_meta()
+        glosario._locucion_counter = meta.get("locucion_counter", 0)
+        glosario._sellado = meta.get("sellado", False)
+        
+        glosario._almacen = almacen
+        glosario._conteo = {
+            (TokenCategoria[categoria], TokenStatus[status]): cantidad
+            for (categoria, status), cantidad in almacen.contar().items()
+        }
+        return glosario
+    
+    def guardar_almacen(self, ruta: str) -> None:
+        """Volcar el glosario a un almacén SQLite y seguir guardando en él"""
+        almacen = AlmacenGlosario(ruta)
+        almacen.volcar(dict(self._entradas.items()), list(self._locuciones.values()))
+        
+        self._entradas = almacen
+        self._almacen = almacen
+        self.sincronizar()
+    
+    @contextmanager
+    def transaccion(self) -> Iterator['Glosario']:
+        """
+        Agrupar escrituras: el almacén se sincroniza una sola vez al salir
+        
+        Anidable (sincroniza la transacción exterior). No deshace cambios:
+        ante una excepción, lo aplicado se guarda y la excepción sigue.
+        """
+        self._transacciones += 1
+        try:
+            yield self
+        finally:
+            self._transacciones -= 1
+            if not self._transacciones:
+                self.sincronizar()
+    
+    def sincronizar(self) -> None:
+        """Escribir en el almacén (si hay) y en el diario los cambios pendientes"""
+        if self._transacciones:
+            return
+        self._historial.sincronizar()
+        if self._almacen is not None:
+            self._almacen.sincronizar(meta={
+                "sellado": self._sellado,
+                "locucion_counter": self._locucion_counter
+            })
+    
+    def separar_almacen(self) -> None:
+        """Usar el almacén en solo lectura (copias en procesos trabajadores)"""
+        if self._almacen is not None:
+            self._almacen.separar()
+    
+    def _marcar_modificada(self, token: str) -> None:
+        if self._almacen is not None:
+            self._almacen.marcar(token)
+        if self._registro_delta is not None:
+            self._registro_delta.tocar(token, self._entradas[token])
     
     @classmethod
     def importar_json(cls, json_str: str) -> 'Glosario':
         """Importar glosario desde JSON"""
         data = json.loads(json_str)
         glosario = cls()
+        glosario._cargar_datos_json(data)
+        glosario._sellado = data.get("sellado", False)
+        return glosario
+    
+    @classmethod
+    def importar_archivo(cls, ruta: str) -> 'Glosario':
+        """Importar glosario según extensión: .json, .jsonl, .csv o almacén (.db, .sqlite)"""
+        extension = os.path.splitext(ruta)[1].lower()
+        if extension in (".db", ".sqlite"):
+            return cls.abrir(ruta)
+        
+        with open(ruta, "r", encoding="utf-8", newline="") as archivo:
+            if extension == ".jsonl":
+                return cls.importar_jsonl(archivo)
+            if extension == ".csv":
+                return cls.importar_csv(archivo)
+            if extension == ".json":
+                return cls.importar_json(archivo.read())
+        
+        raise GlosarioError(f"Formato de glosario no soportado: {ruta}")
+    
+    @classmethod
+    def importar_jsonl(cls, archivo: TextIO) -> 'Glosario':
+        """Importar glosario desde JSON Lines (ver exportar_jsonl)"""
+        glosario = cls()
+        _, glosario._sellado = glosario._cargar_jsonl(archivo)
+        return glosario
+    
+    @classmethod
+    def importar_csv(cls, archivo: TextIO) -> 'Glosario':
+        """Importar glosario desde CSV (ver exportar_csv_archivo)"""
+        glosario = cls()
+        glosario.cargar_csv(archivo)
+        return glosario
+    
+    def cargar_json(self, json_str: str) -> int:
+        """
+        Cargar entradas y locuciones de un JSON en este glosario
+        
+        Las entradas existentes con el mismo token se reemplazan. El
+        sellado de este glosario se conserva (el del archivo solo cuenta
+        en importar_json).
         
+        Returns:
+            Número de entradas cargadas
+        """
+        return self._cargar_datos_json(json.loads(json_str))
+    
+    def _cargar_datos_json(self, data: Dict[str, Any]) -> int:
         for token, e_data in data.get("entradas", {}).items():
-            entrada = EntradaGlosario(
-                token_src=token,
-                categoria=TokenCategoria[e_data["categoria"]],
-                token_tgt=e_data.get("token_tgt"),
-                status=TokenStatus[e_data["status"]],
-                margen=e_data.get("margen", 0),
-                ocurrencias=e_data.get("ocurrencias", []),
-                etiqueta=e_data.get("etiqueta")
-            )
-            glosario._entradas[token] = entrada
+            self._poner_entrada(token, _dict_a_entrada(token, e_data))
         
         for loc_id, l_data in data.get("locuciones", {}).items():
-            locucion = Locucion(
-                id=loc_id,
-                src=l_data["src"],
-                tgt=l_data.get("tgt"),
-                componentes=l_data["componentes"],
-                posiciones=l_data["posiciones"]
-            )
-            glosario._locuciones[loc_id] = locucion
+            if loc_id not in self._locuciones:
+                self._registrar_locucion(_dict_a_locucion(loc_id, l_data))
         
-        glosario._sellado = data.get("sellado", False)
+        self._ajustar_contador_locuciones()
+        self.sincronizar()
         
-        return glosario
+        return len(data.get("entradas", {}))
+    
+    def cargar_jsonl(self, archivo: TextIO) -> int:
+        """
+        Cargar un JSON Lines en este glosario, línea a línea
+        
+        El sellado de este glosario se conserva (el del archivo solo
+        cuenta en importar_jsonl).
+        
+        Returns:
+            Número de entradas cargadas
+        """
+        return self._cargar_jsonl(archivo)[0]
+    
+    def _cargar_jsonl(self, archivo: TextIO) -> Tuple[int, bool]:
+        """(entradas cargadas, sellado según la cabecera del archivo)"""
+        total = 0
+        sellado = False
+        
+        for elemento in _leer_jsonl(archivo):
+            if isinstance(elemento, EntradaGlosario):
+                self._poner_entrada(elemento.token_src, elemento)
+                total += 1
+            elif isinstance(elemento, Locucion):
+                if elemento.id not in self._locuciones:
+                    self._registrar_locucion(elemento)
+            else:
+                sellado = elemento.get("sellado", False)
+        
+        self._ajustar_contador_locuciones()
+        self.sincronizar()
+        return total, sellado
+    
+    def cargar_csv(self, archivo: TextIO) -> int:
+        """
+        Cargar un CSV en este glosario, fila a fila
+        
+        El CSV no lleva ocurrencias: se conservan las de la entrada
+        existente, si la hay.
+        
+        Returns:
+            Número de entradas cargadas
+        """
+        total = 0
+        
+        for entrada in _leer_csv(archivo):
+            existente = self._entradas.get(entrada.token_src)
+            if existente is not None:
+                entrada.ocurrencias = array('I', existente.ocurrencias)
+            self._poner_entrada(entrada.token_src, entrada)
+            total += 1
+        
+        self.sincronizar()
+        return total
+    
+    # ══════════════════════════════════════════════════════════
+    # FUSIÓN
+    # ══════════════════════════════════════════════════════════
+    
+    def fusionar(self, elementos: Iterable[Union[EntradaGlosario, Locucion]],
+                 solo_existentes: bool = False) -> InformeFusion:
+        """
+        Fusionar un glosario previo en este, en una sola pasada
+        
+        Por cada entrada previa con traducción:
+          - Token pendiente → recibe la traducción previa (fase_b_asignar)
+          - Token ausente → se agrega (salvo `solo_existentes`)
+          - Misma traducción → coincidente
+          - Otra traducción en NÚCLEO → conflicto de sinonimia (P8.B3); se
+            conserva la actual y el conflicto se acumula en el informe
+          - Otra traducción en PARTÍCULA → polivalente: se añaden las
+            traducciones por función que falten
+          - Token bloqueado por locución → omitida
+        Las locuciones previas traducen las locuciones actuales con el
+        mismo texto fuente (sus posiciones son de otro texto).
+        
+        Args:
+            elementos: Entradas y locuciones del glosario previo
+            solo_existentes: No agregar tokens que no estén en este glosario
+        
+        Returns:
+            Informe con los contadores y los conflictos
+        """
+        informe = InformeFusion()
+        locuciones_por_src: Optional[Dict[str, List[str]]] = None
+        # Para el historial: traducciones por función y de locuciones añadidas
+        funciones: List[List[str]] = []
+        locuciones: List[List[str]] = []
+        
+        with self.transaccion():
+            for elemento in elementos:
+                if isinstance(elemento, Locucion):
+                    if not elemento.tgt:
+                        informe.omitidas += 1
+                        continue
+                    if locuciones_por_src is None:
+                        locuciones_por_src = {}
+                        for loc in self._locuciones.values():
+                            locuciones_por_src.setdefault(loc.src, []).append(loc.id)
+                    
+                    for loc_id in locuciones_por_src.get(elemento.src, ()):
+                        actual = self._locuciones[loc_id].tgt
+                        if not actual:
+                            self.asignar_locucion(loc_id, elemento.tgt)
+                            locuciones.append([loc_id, elemento.tgt])
+                            informe.locuciones += 1
+                        elif actual == elemento.tgt:
+                            informe.coincidentes += 1
+                        else:
+                            informe.conflictos.append(SinonimiaError(elemento.src, actual, elemento.tgt))
+                    continue
+                
+                previa = elemento
+                token = previa.token_src
+                if not previa.token_tgt:
+                    informe.omitidas += 1
+                    continue
+                
+                actual = self._entradas.get(token)
+                if actual is None:
+                    if solo_existentes:
+                        informe.omitidas += 1
+                        continue
+                    self._poner_entrada(token, EntradaGlosario(
+                        token_src=token,
+                        categoria=previa.categoria,
+                        token_tgt=previa.token_tgt,
+                        status=TokenStatus.ASIGNADO,
+                        margen=previa.margen,
+                        etiqueta=previa.etiqueta,
+                        traducciones_por_funcion=dict(previa.traducciones_por_funcion)
+                    ))
+                    self._registrar_historial("ENTRADA_AGREGADA_USUARIO", {
+                        "token": token,
+                        "categoria": previa.categoria.name,
+                        "traduccion": previa.token_tgt,
+                        "margen": previa.margen,
+                        "etiqueta": previa.etiqueta
+                    })
+                    funciones.extend([token, rol.name, tgt]
+                                     for rol, tgt in previa.traducciones_por_funcion.items())
+                    informe.agregadas += 1
+                elif actual.status == TokenStatus.BLOQUEADO:
+                    informe.omitidas += 1
+                elif not actual.token_tgt:
+                    self.fase_b_asignar(token, previa.token_tgt, margen=previa.margen,
+                                        etiqueta=previa.etiqueta)
+                    añadidas = self._fusionar_funciones(token, previa.traducciones_por_funcion)
+                    funciones.extend([token, rol.name, tgt] for rol, tgt in añadidas.items())
+                    informe.asignadas += 1
+                elif actual.token_tgt == previa.token_tgt:
+                    informe.coincidentes += 1
+                elif actual.es_nucleo():
+                    informe.conflictos.append(SinonimiaError(token, actual.token_tgt, previa.token_tgt))
+                else:
+                    añadidas = self._fusionar_funciones(token, previa.traducciones_por_funcion)
+                    funciones.extend([token, rol.name, tgt] for rol, tgt in añadidas.items())
+                    informe.polivalentes += 1
+            
+            self._registrar_historial("GLOSARIO_FUSIONADO", {
+                "asignadas": informe.asignadas,
+                "agregadas": informe.agregadas,
+                "conflictos": len(informe.conflictos),
+                "funciones": funciones,
+                "locuciones": locuciones
+            })
+        
+        return informe
+    
+    def fusionar_archivo(self, ruta: str, solo_existentes: bool = False) -> InformeFusion:
+        """
+        Fusionar un glosario previo guardado en archivo
+        
+        Formatos: .jsonl y .csv (leídos línea a línea), .json y almacén
+        SQLite (.db, .sqlite).
+        """
+        extension = os.path.splitext(ruta)[1].lower()
+        
+        if extension in (".db", ".sqlite"):
+            previo = Glosario.abrir(ruta)
+            try:
+                return self.fusionar(self._elementos_de(previo), solo_existentes)
+            finally:
+                previo._almacen.cerrar()
+        
+        if extension == ".jsonl":
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                elementos = (e for e in _leer_jsonl(archivo) if not isinstance(e, dict))
+                return self.fusionar(elementos, solo_existentes)
+        if extension == ".csv":
+            with open(ruta, "r", encoding="utf-8", newline="") as archivo:
+                return self.fusionar(_leer_csv(archivo), solo_existentes)
+        
+        return self.fusionar(self._elementos_de(Glosario.importar_archivo(ruta)), solo_existentes)
+    
+    @staticmethod
+    def _elementos_de(glosario: 'Glosario') -> Iterator[Union[EntradaGlosario, Locucion]]:
+        for _, entrada in glosario._iterar_entradas():
+            yield entrada
+        yield from glosario._locuciones.values()
+    
+    def _fusionar_funciones(self, token: str,
+                            funciones: Mapping[FuncRole, str]) -> Dict[FuncRole, str]:
+        """Añadir las traducciones por función (partículas) que falten; devuelve las añadidas"""
+        actuales = self._entradas[token].traducciones_por_funcion
+        añadidas = {rol: tgt for rol, tgt in funciones.items() if rol not in actuales}
+        if añadidas:
+            entrada = self._entrada_escribible(token)
+            entrada.traducciones_por_funcion.update(añadidas)
+            self._marcar_modificada(token)
+        return añadidas
+    
+    def _ajustar_contador_locuciones(self) -> None:
+        """Continuar la numeración de IDs tras las locuciones importadas"""
+        for loc_id in self._locuciones:
+            sufijo = loc_id.rsplit("_", 1)[-1]
+            if sufijo.isdigit():
+                self._locucion_counter = max(self._locucion_counter, int(sufijo))
     
     # ══════════════════════════════════════════════════════════
     # FORMATEO PARA PRESENTACIÓN
     # ══════════════════════════════════════════════════════════
     
-    def formatear_glosario(self, limite: int = 50, pagina: int = 1) -> str:
-        """Formatear glosario para presentación"""
-        entradas = self.obtener_entradas_por_margen()
-        total = len(entradas)
+    def formatear_glosario(self, limite: int = 50, pagina: int = 1,
+                           prefijo: Optional[str] = None,
+                           status: Optional[TokenStatus] = None) -> str:
+        """Formatear glosario para presentación (una página)"""
+        pagina = max(1, pagina)
+        entradas, total = self.obtener_pagina(limite, pagina, prefijo, status)
         total_paginas = (total + limite - 1) // limite
         
+        if not total:
+            return "Sin resultados en el glosario."
+        if not entradas:
+            return _fuera_de_rango(pagina, total_paginas)
+        
         inicio = (pagina - 1) * limite
-        fin = min(inicio + limite, total)
+        fin = inicio + len(entradas)
         
         lineas = [
             "═" * 50,
@@ -701,7 +2142,7 @@ class Glosario:
             ""
         ]
         
-        for entrada in entradas[inicio:fin]:
+        for entrada in entradas:
             tgt = entrada.token_tgt or "[PENDIENTE]"
             linea = f"  {tgt} ({entrada.token_src}) [{entrada.categoria.name}]"
             if entrada.etiqueta:
@@ -740,12 +2181,17 @@ class Glosario:
         lineas.append("═" * 50)
         return "\n".join(lineas)
     
-    def formatear_alternativas(self) -> str:
-        """Formatear alternativas para presentación"""
-        alternativas = self.obtener_alternativas()
-        
-        if not alternativas:
+    def formatear_alternativas(self, limite: int = 20, pagina: int = 1,
+                               prefijo: Optional[str] = None) -> str:
+        """Formatear alternativas para presentación (una página)"""
+        pagina = max(1, pagina)
+        alternativas, total = self.obtener_pagina(limite, pagina, prefijo,
+                                                  margen_minimo=self.MARGEN_ALTERNATIVAS)
+        
+        if not total:
             return "No hay términos de alto margen."
+        if not alternativas:
+            return _fuera_de_rango(pagina, (total + limite - 1) // limite)
         
         lineas = [
             "═" * 50,
@@ -766,10 +2212,147 @@ class Glosario:
                 ""
             ])
         
+        total_paginas = (total + limite - 1) // limite
+        if total_paginas > 1:
+            lineas.append(f"[Página {pagina}/{total_paginas}] — 'más' para continuar")
+        lineas.append("═" * 50)
+        return "\n".join(lineas)
+    
+    def formatear_busqueda(self, consulta: str, limite: int = 20) -> str:
+        """Formatear resultados de búsqueda para presentación"""
+        resultados = self.buscar(consulta, limite)
+        
+        if not resultados:
+            return f"Sin resultados para '{consulta}'."
+        
+        lineas = [
+            "═" * 50,
+            f"BÚSQUEDA: {consulta} [{len(resultados)} resultados]",
+            "═" * 50,
+            ""
+        ]
+        
+        for entrada, tipo in resultados:
+            tgt = entrada.token_tgt or "[PENDIENTE]"
+            lineas.append(f"  {tgt} ({entrada.token_src}) [{entrada.categoria.name}] — {tipo}")
+        
+        lineas.append("")
         lineas.append("═" * 50)
         return "\n".join(lineas)
 
 
+def _fuera_de_rango(pagina: int, total_paginas: int) -> str:
+    return f"Página {pagina} fuera de rango (1-{total_paginas})."
+
+
+# ══════════════════════════════════════════════════════════════
+# SERIALIZACIÓN
+# ══════════════════════════════════════════════════════════════
+
+def _entrada_a_dict(entrada: EntradaGlosario, desde: int = 0) -> Dict[str, Any]:
+    """Entrada serializable; con `desde`, solo las ocurrencias a partir de ese índice"""
+    datos = {
+        "categoria": entrada.categoria.name,
+        "token_tgt": entrada.token_tgt,
+        "status": entrada.status.name,
+        "margen": entrada.margen,
+        "ocurrencias": codificar_ocurrencias(
+            entrada.ocurrencias[desde:] if desde else entrada.ocurrencias
+        ),
+        "etiqueta": entrada.etiqueta
+    }
+    if desde:
+        datos["desde"] = desde
+    if entrada.func_roles:
+        datos["func_roles"] = {str(pos): rol.name for pos, rol in entrada.func_roles.items()}
+    if entrada.traducciones_por_funcion:
+        datos["traducciones_por_funcion"] = {
+            rol.name: tgt for rol, tgt in entrada.traducciones_por_funcion.items()
+        }
+    return datos
+
+
+def _dict_a_entrada(token: str, datos: Dict[str, Any]) -> EntradaGlosario:
+    return EntradaGlosario(
+        token_src=token,
+        categoria=TokenCategoria[datos["categoria"]],
+        token_tgt=datos.get("token_tgt"),
+        status=TokenStatus[datos["status"]],
+        margen=datos.get("margen", 0),
+        ocurrencias=decodificar_ocurrencias(datos.get("ocurrencias", [])),
+        func_roles={int(pos): FuncRole[rol] for pos, rol in datos.get("func_roles", {}).items()},
+        etiqueta=datos.get("etiqueta"),
+        traducciones_por_funcion={
+            FuncRole[rol]: tgt for rol, tgt in datos.get("traducciones_por_funcion", {}).items()
+        }
+    )
+
+
+def _copiar_entrada(entrada: EntradaGlosario) -> EntradaGlosario:
+    # Constructor directo: dataclasses.replace introspecciona los campos
+    # en cada llamada y domina el coste de las escrituras en bloque
+    return EntradaGlosario(
+        token_src=entrada.token_src,
+        categoria=entrada.categoria,
+        token_tgt=entrada.token_tgt,
+        status=entrada.status,
+        margen=entrada.margen,
+        ocurrencias=array('I', entrada.ocurrencias),
+        func_roles=dict(entrada.func_roles),
+        etiqueta=entrada.etiqueta,
+        traducciones_por_funcion=dict(entrada.traducciones_por_funcion)
+    )
+
+
+def _leer_jsonl(archivo: TextIO) -> Iterator[Union[EntradaGlosario, Locucion, Dict[str, Any]]]:
+    """Registros de un JSON Lines (ver exportar_jsonl); la cabecera como dict"""
+    for linea in archivo:
+        linea = linea.strip()
+        if not linea:
+            continue
+        registro = json.loads(linea)
+        tipo = registro.get("tipo")
+        
+        if tipo == "entrada":
+            yield _dict_a_entrada(registro["token"], registro)
+        elif tipo == "locucion":
+            yield _dict_a_locucion(registro["id"], registro)
+        elif tipo == "glosario":
+            yield registro
+
+
+def _leer_csv(archivo: TextIO) -> Iterator[EntradaGlosario]:
+    """Entradas de un CSV (ver exportar_csv_archivo), sin ocurrencias"""
+    for fila in csv.DictReader(archivo):
+        yield EntradaGlosario(
+            token_src=fila["token_src"],
+            categoria=TokenCategoria[fila["categoria"]],
+            token_tgt=fila["token_tgt"] or None,
+            status=TokenStatus[fila["status"]],
+            margen=int(fila["margen"] or 0),
+            etiqueta=fila["etiqueta"] or None
+        )
+
+
+def _locucion_a_dict(locucion: Locucion) -> Dict[str, Any]:
+    return {
+        "src": locucion.src,
+        "tgt": locucion.tgt,
+        "componentes": locucion.componentes,
+        "posiciones": locucion.posiciones
+    }
+
+
+def _dict_a_locucion(loc_id: str, datos: Dict[str, Any]) -> Locucion:
+    return Locucion(
+        id=loc_id,
+        src=datos["src"],
+        tgt=datos.get("tgt"),
+        componentes=datos["componentes"],
+        posiciones=datos["posiciones"]
+    )
+
+
 # ══════════════════════════════════════════════════════════════
 # FUNCIONES DE AYUDA
 # ══════════════════════════════════════════════════════════════
@@ -0,0 +1,257 @@
+"""
+════════════════════════════════════════════════════════════════
+SISTEMA DE TRADUCCIÓN ISOMÓRFICA — VERSIÓN PYTHON
+Extensión: Historial del Glosario (P8)
+════════════════════════════════════════════════════════════════
+
+PROPÓSITO:
+  Historial de cambios del glosario con memoria acotada.
+
+PRINCIPIOS:
+  - Búfer circular: solo se conservan en memoria los últimos registros
+  - Diario opcional en disco (JSON Lines), solo de escritura al final;
+    se vuelca al disco al sincronizar el glosario, al sellarlo y al
+    cerrarlo, y una última línea incompleta (caída) se descarta
+  - Marcas de tiempo monótonas (no retroceden con ajustes de reloj)
+  - Consultas filtradas y paginadas sin copiar el historial completo
+  - El diario se puede reproducir sobre el glosario sellado (Fase A)
+    para reconstruir su estado
+
+FORMATO DEL DIARIO:
+  Una línea de cabecera por sesión:
+    {"diario": 1, "inicio": "<ISO 8601>", "sesion": "<id>"}
+  Una línea por registro:
+    {"n": secuencia, "t": segundos desde el inicio, "accion": ..., "datos": {...}}
+"""
+
+import os
+import json
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# ══════════════════════════════════════════════════════════════
+# ESTRUCTURAS DE DATOS
+# ══════════════════════════════════════════════════════════════
+
+@dataclass(slots=True)
+class RegistroHistorial:
+    """Registro individual del historial"""
+    secuencia: int
+    tiempo: float  # Segundos monótonos desde el inicio de la sesión
+    accion: str
+    datos: Dict[str, Any]
+
+
+# ══════════════════════════════════════════════════════════════
+# HISTORIAL
+# ══════════════════════════════════════════════════════════════
+
+class HistorialGlosario:
+    """
+    Historial del glosario: búfer circular + diario opcional
+    
+    Cada registro recibe un número de secuencia creciente; los registros
+    desalojados del búfer siguen disponibles en el diario.
+    """
+    
+    # Registros conservados en memoria por defecto
+    CAPACIDAD = 10000
+    
+    def __init__(self, capacidad: int = CAPACIDAD):
+        self._registros: deque = deque(maxlen=max(1, capacidad))
+        self._secuencia: int = 0
+        
+        # Origen de las marcas de tiempo
+        self._inicio = datetime.now()
+        self._inicio_monotonico = time.monotonic()
+        
+        # Diario en disco
+        self._diario = None
+        self.ruta_diario: Optional[str] = None
+        self.sesion_diario: Optional[str] = None
+    
+    @property
+    def capacidad(self) -> int:
+        return self._registros.maxlen
+    
+    @property
+    def total(self) -> int:
+        """Registros totales de la sesión (incluidos los desalojados)"""
+        return self._secuencia
+    
+    def __len__(self) -> int:
+        return len(self._registros)
+    
+    def registrar(self, accion: str, datos: Dict[str, Any]) -> RegistroHistorial:
+        """Agregar registro al búfer y, si está activo, al diario"""
+        self._secuencia += 1
+        registro = RegistroHistorial(
+            secuencia=self._secuencia,
+            tiempo=time.monotonic() - self._inicio_monotonico,
+            accion=accion,
+            datos=datos
+        )
+        self._registros.append(registro)
+        
+        if self._diario is not None:
+            self._diario.write(json.dumps({
+                "n": registro.secuencia,
+                "t": round(registro.tiempo, 6),
+                "accion": accion,
+                "datos": datos
+            }, ensure_ascii=False) + "\n")
+        
+        return registro
+    
+    # ══════════════════════════════════════════════════════════
+    # DIARIO EN DISCO
+    # ══════════════════════════════════════════════════════════
+    
+    def abrir_diario(self, ruta: str) -> str:
+        """
+        Abrir diario (se añade al final) y escribir cabecera de sesión
+        
+        Returns:
+            Identificador de la sesión (ver leer_diario)
+        """
+        self.cerrar_diario()
+        if os.path.exists(ruta):
+            _recortar_linea_incompleta(ruta)
+        self._diario = open(ruta, "a", encoding="utf-8")
+        self.ruta_diario = ruta
+        self.sesion_diario = uuid.uuid4().hex
+        self._diario.write(json.dumps({
+            "diario": 1,
+            "inicio": self._inicio.isoformat(),
+            "sesion": self.sesion_diario
+        }) + "\n")
+        return self.sesion_diario
+    
+    def sincronizar(self) -> None:
+        """Volcar al disco los registros pendientes del diario"""
+        if self._diario is not None:
+            self._diario.flush()
+    
+    def cerrar_diario(self) -> None:
+        if self._diario is not None:
+            self._diario.close()
+            self._diario = None
+            self.ruta_diario = None
+            self.sesion_diario = None
+    
+    def __getstate__(self):
+        # Las copias (procesos trabajadores) no escriben en el diario
+        estado = {
+            "_registros": self._registros,
+            "_secuencia": self._secuencia,
+            "_inicio": self._inicio,
+            "_inicio_monotonico": self._inicio_monotonico
+        }
+        return estado
+    
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._diario = None
+        self.ruta_diario = None
+        self.sesion_diario = None
+    
+    # ══════════════════════════════════════════════════════════
+    # CONSULTAS
+    # ══════════════════════════════════════════════════════════
+    
+    def consultar(self, accion: Optional[str] = None, token: Optional[str] = None,
+                  limite: Optional[int] = None, pagina: int = 1) -> List[Dict[str, Any]]:
+        """
+        Consultar registros en memoria, en orden cronológico
+        
+        Args:
+            accion: Solo registros de esta acción
+            token: Solo registros cuyo dato "token" coincide
+            limite: Registros por página (None = todos)
+            pagina: Página (desde 1)
+        """
+        registros: Iterator[RegistroHistorial] = iter(self._registros)
+        if accion is not None:
+            registros = (r for r in registros if r.accion == accion)
+        if token is not None:
+            registros = (r for r in registros if r.datos.get("token") == token)
+        if limite is not None:
+            inicio = (max(1, pagina) - 1) * limite
+            registros = islice(registros, inicio, inicio + limite)
+        
+        return [self._a_dict(r) for r in registros]
+    
+    def ultimos(self, cantidad: int) -> List[Dict[str, Any]]:
+        """Últimos registros en memoria (el más reciente al final)"""
+        inicio = max(0, len(self._registros) - cantidad)
+        return [self._a_dict(r) for r in islice(self._registros, inicio, None)]
+    
+    def _a_dict(self, registro: RegistroHistorial) -> Dict[str, Any]:
+        return {
+            "secuencia": registro.secuencia,
+            "accion": registro.accion,
+            "datos": registro.datos,
+            "timestamp": (self._inicio + timedelta(seconds=registro.tiempo)).isoformat()
+        }
+
+
+# ══════════════════════════════════════════════════════════════
+# LECTURA DEL DIARIO
+# ══════════════════════════════════════════════════════════════
+
+def leer_diario(ruta: str, sesion: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Leer registros de un diario en orden (omite las cabeceras de sesión)
+    
+    Cada registro es {"n", "t", "accion", "datos"}. Con `sesion`, la
+    lectura empieza en la cabecera de esa sesión (ver abrir_diario).
+    Termina en la primera línea incompleta o ilegible: la última, si
+    hubo una caída a mitad de escritura.
+    
+    Raises:
+        ValueError: Si la sesión no está en el diario
+    """
+    en_sesion = sesion is None
+    
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            if not linea.endswith("\n"):
+                break
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                break
+            if "accion" not in registro:
+                en_sesion = en_sesion or registro.get("sesion") == sesion
+            elif en_sesion:
+                yield registro
+    
+    if not en_sesion:
+        raise ValueError(f"Sesión no encontrada en el diario: {sesion}")
+
+
+def _recortar_linea_incompleta(ruta: str) -> None:
+    """Quitar del final del archivo una línea sin salto de línea"""
+    with open(ruta, "rb+") as f:
+        fin = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            bloque = min(pos, 4096)
+            f.seek(pos - bloque)
+            datos = f.read(bloque)
+            if pos == fin and datos.endswith(b"\n"):
+                return
+            salto = datos.rfind(b"\n")
+            if salto >= 0:
+                f.truncate(pos - bloque + salto + 1)
+                return
+            pos -= bloque
+        f.truncate(0)
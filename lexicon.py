@@ -0,0 +1,320 @@
+"""
+════════════════════════════════════════════════════════════════
+SISTEMA DE TRADUCCIÓN ISOMÓRFICA — VERSIÓN PYTHON
+Extensión: Léxico Etimológico en Disco (P4.F3)
+════════════════════════════════════════════════════════════════
+
+PROPÓSITO:
+  Backends intercambiables para la búsqueda de raíces de BaseEtimologica.
+
+BACKENDS:
+  - LexiconMemoria: diccionario en memoria (léxico de demostración)
+  - LexiconArchivo: archivo compacto proyectado en memoria (mmap);
+    el arranque no carga el léxico y cada búsqueda es binaria
+
+FORMATO DE ARCHIVO (.lex):
+  Cabecera:   MAGIA (8 bytes) + número de claves (uint32) + reservado (uint32)
+  Tabla:      un desplazamiento uint64 por clave, en orden de clave (UTF-8)
+  Registros:  long. clave (uint16) + clave + long. datos (uint32) + datos
+  Datos:      candidatos separados por \\x1e; campos por \\x1f
+              (termino, origen, raiz, derivacion_existe: "1"/"0")
+
+CONSTRUCCIÓN (una sola vez):
+  python lexicon.py entrada.tsv salida.lex
+  TSV:  token  termino  origen  raiz  derivacion_existe
+  JSON: {"token": [[termino, origen, raiz, derivacion_existe], ...]}
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple, Iterable
+
+
+# ══════════════════════════════════════════════════════════════
+# ESTRUCTURAS DE DATOS
+# ══════════════════════════════════════════════════════════════
+
+# Registro de raíz: (termino_es, origen, raiz, derivacion_existe)
+RegistroRaiz = Tuple[str, str, str, bool]
+
+
+class LexiconError(Exception):
+    """Error del léxico etimológico"""
+    pass
+
+
+# ══════════════════════════════════════════════════════════════
+# INTERFAZ DE BACKEND
+# ══════════════════════════════════════════════════════════════
+
+class LexiconEtimologico(ABC):
+    """
+    Backend de léxico etimológico
+    
+    Las claves son tokens en minúsculas. `version` cambia cuando cambia
+    el contenido del léxico.
+    """
+    
+    version: str = ""
+    
+    @abstractmethod
+    def obtener(self, token: str) -> List[RegistroRaiz]:
+        """Registros de raíz de un token (lista vacía si no existe)"""
+    
+    def __contains__(self, token: str) -> bool:
+        return bool(self.obtener(token))
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Número de tokens del léxico"""
+    
+    def cerrar(self) -> None:
+        """Liberar recursos"""
+        pass
+
+
+# ══════════════════════════════════════════════════════════════
+# BACKEND EN MEMORIA
+# ══════════════════════════════════════════════════════════════
+
+class LexiconMemoria(LexiconEtimologico):
+    """Léxico en un diccionario de Python"""
+    
+    def __init__(self, raices: Optional[Dict[str, List[RegistroRaiz]]] = None):
+        self._raices: Dict[str, List[RegistroRaiz]] = {
+            token.lower(): list(registros)
+            for token, registros in (raices or {}).items()
+        }
+        self._revision = 0
+        self.version = "memoria:0"
+    
+    def obtener(self, token: str) -> List[RegistroRaiz]:
+        return self._raices.get(token, [])
+    
+    def __len__(self) -> int:
+        return len(self._raices)
+    
+    def agregar(self, token: str, registros: List[RegistroRaiz]) -> None:
+        """Agregar o reemplazar los registros de un token"""
+        self._raices[token.lower()] = list(registros)
+        self._revision += 1
+        self.version = f"memoria:{self._revision}"
+
+
+# ══════════════════════════════════════════════════════════════
+# BACKEND EN DISCO (MMAP)
+# ══════════════════════════════════════════════════════════════
+
+_MAGIA = b"LEXETIM1"
+_CABECERA = struct.Struct("<8sII")
+_DESPLAZAMIENTO = struct.Struct("<Q")
+_LONG_CLAVE = struct.Struct("<H")
+_LONG_DATOS = struct.Struct("<I")
+
+_SEP_CANDIDATO = "\x1e"
+_SEP_CAMPO = "\x1f"
+
+
+class LexiconArchivo(LexiconEtimologico):
+    """
+    Léxico en archivo .lex proyectado en memoria
+    
+    Abrir el archivo no lee las claves: la tabla de desplazamientos se
+    consulta con búsqueda binaria directamente sobre el mmap. Un índice
+    disperso (una clave de cada _PASO_DISPERSO), construido en la primera
+    búsqueda, acota el tramo de la búsqueda binaria.
+    """
+    
+    _PASO_DISPERSO = 128
+    
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mmap = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._archivo.close()
+            raise LexiconError(f"Léxico vacío: {ruta}")
+        
+        magia, self._num_claves, _ = _CABECERA.unpack_from(self._mmap, 0)
+        if magia != _MAGIA:
+            self.cerrar()
+            raise LexiconError(f"Formato de léxico no reconocido: {ruta}")
+        
+        self._indice_disperso: Optional[List[bytes]] = None
+        
+        estado = os.stat(ruta)
+        self.version = f"archivo:{ruta}:{estado.st_size}:{estado.st_mtime_ns}"
+    
+    def __len__(self) -> int:
+        return self._num_claves
+    
+    def _clave_en(self, indice: int) -> Tuple[bytes, int]:
+        """Clave del índice dado y desplazamiento tras ella"""
+        (desp,) = _DESPLAZAMIENTO.unpack_from(
+            self._mmap, _CABECERA.size + indice * _DESPLAZAMIENTO.size
+        )
+        (long_clave,) = _LONG_CLAVE.unpack_from(self._mmap, desp)
+        inicio = desp + _LONG_CLAVE.size
+        return self._mmap[inicio:inicio + long_clave], inicio + long_clave
+    
+    def obtener(self, token: str) -> List[RegistroRaiz]:
+        clave = token.encode("utf-8")
+        
+        if self._indice_disperso is None:
+            self._indice_disperso = [
+                self._clave_en(i)[0]
+                for i in range(0, self._num_claves, self._PASO_DISPERSO)
+            ]
+        
+        tramo = bisect_right(self._indice_disperso, clave) - 1
+        if tramo < 0:
+            return []
+        bajo = tramo * self._PASO_DISPERSO
+        alto = min(bajo + self._PASO_DISPERSO, self._num_claves)
+        
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            clave_medio, fin_clave = self._clave_en(medio)
+            if clave_medio < clave:
+                bajo = medio + 1
+            elif clave_medio > clave:
+                alto = medio
+            else:
+                (long_datos,) = _LONG_DATOS.unpack_from(self._mmap, fin_clave)
+                inicio = fin_clave + _LONG_DATOS.size
+                return _decodificar(self._mmap[inicio:inicio + long_datos])
+        
+        return []
+    
+    def cerrar(self) -> None:
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._archivo.close()
+    
+    def __getstate__(self):
+        # Los procesos trabajadores reabren el archivo
+        return {"ruta": self.ruta}
+    
+    def __setstate__(self, estado):
+        self.__init__(estado["ruta"])
+
+
+def _codificar(registros: List[RegistroRaiz]) -> bytes:
+    return _SEP_CANDIDATO.join(
+        _SEP_CAMPO.join((termino, origen, raiz, "1" if deriv else "0"))
+        for termino, origen, raiz, deriv in registros
+    ).encode("utf-8")
+
+
+def _decodificar(datos: bytes) -> List[RegistroRaiz]:
+    registros = []
+    for candidato in datos.decode("utf-8").split(_SEP_CANDIDATO):
+        termino, origen, raiz, deriv = candidato.split(_SEP_CAMPO)
+        registros.append((termino, origen, raiz, deriv == "1"))
+    return registros
+
+
+# ══════════════════════════════════════════════════════════════
+# CONSTRUCCIÓN DEL LÉXICO
+# ══════════════════════════════════════════════════════════════
+
+def _leer_tsv(ruta: str) -> Iterable[Tuple[str, RegistroRaiz]]:
+    with open(ruta, "r", encoding="utf-8") as f:
+        for num, linea in enumerate(f, 1):
+            linea = linea.rstrip("\n")
+            if not linea or linea.startswith("#"):
+                continue
+            campos = linea.split("\t")
+            if len(campos) < 4:
+                raise LexiconError(f"{ruta}:{num}: se esperaban al menos 4 columnas")
+            deriv = campos[4].strip().lower() not in ("0", "false", "no") if len(campos) > 4 else True
+            yield campos[0], (campos[1], campos[2], campos[3], deriv)
+
+
+def _leer_json(ruta: str) -> Iterable[Tuple[str, RegistroRaiz]]:
+    with open(ruta, "r", encoding="utf-8") as f:
+        datos = json.load(f)
+    for token, registros in datos.items():
+        for registro in registros:
+            termino, origen, raiz = registro[:3]
+            deriv = bool(registro[3]) if len(registro) > 3 else True
+            yield token, (termino, origen, raiz, deriv)
+
+
+def construir_lexicon(origen: str, destino: str) -> int:
+    """
+    Construir archivo .lex desde TSV o JSON
+    
+    Los tokens se pasan a minúsculas y sus registros se acumulan en el
+    orden del archivo de origen.
+    
+    Returns:
+        Número de claves escritas
+    """
+    lector = _leer_json if origen.lower().endswith(".json") else _leer_tsv
+    
+    raices: Dict[str, List[RegistroRaiz]] = {}
+    for token, registro in lector(origen):
+        raices.setdefault(token.lower(), []).append(registro)
+    
+    return escribir_lexicon(raices, destino)
+
+
+def escribir_lexicon(raices: Dict[str, List[RegistroRaiz]], destino: str) -> int:
+    """Escribir un diccionario de raíces en formato .lex"""
+    claves = sorted((token.encode("utf-8"), token) for token in raices)
+    
+    inicio_registros = _CABECERA.size + len(claves) * _DESPLAZAMIENTO.size
+    desplazamientos = []
+    registros = bytearray()
+    
+    for clave, token in claves:
+        desplazamientos.append(inicio_registros + len(registros))
+        datos = _codificar(raices[token])
+        registros += _LONG_CLAVE.pack(len(clave)) + clave
+        registros += _LONG_DATOS.pack(len(datos)) + datos
+    
+    temporal = destino + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(_CABECERA.pack(_MAGIA, len(claves), 0))
+        for desp in desplazamientos:
+            f.write(_DESPLAZAMIENTO.pack(desp))
+        f.write(registros)
+    os.replace(temporal, destino)
+    
+    return len(claves)
+
+
+def abrir_lexicon(ruta: str) -> LexiconEtimologico:
+    """Abrir léxico: .lex en disco, o TSV/JSON cargado en memoria"""
+    if ruta.lower().endswith((".tsv", ".json")):
+        lector = _leer_json if ruta.lower().endswith(".json") else _leer_tsv
+        raices: Dict[str, List[RegistroRaiz]] = {}
+        for token, registro in lector(ruta):
+            raices.setdefault(token.lower(), []).append(registro)
+        return LexiconMemoria(raices)
+    return LexiconArchivo(ruta)
+
+
+# ══════════════════════════════════════════════════════════════
+# PUNTO DE ENTRADA
+# ══════════════════════════════════════════════════════════════
+
+def main():
+    """Construir un léxico .lex: python lexicon.py entrada.(tsv|json) salida.lex"""
+    if len(sys.argv) != 3:
+        print("Uso: python lexicon.py entrada.(tsv|json) salida.lex")
+        sys.exit(1)
+    
+    total = construir_lexicon(sys.argv[1], sys.argv[2])
+    print(f"Léxico construido: {total} claves → {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import os
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
 from constants import (
     TokenStatus, TokenCategoria, CategoriaGramatical,
     ModoSalida, ModoTransliteracion, ConsultaCodigo
@@ -7,9 +10,9 @@ from models import (
     SlotN, SlotP, MatrizFuente, MatrizTarget,
     MorfologiaFuente, EstadoProceso
 )
-from glossary import Glosario, RegistroIncompletoError, SinonimiaError
+from glossary import Glosario, RegistroIncompletoError, SinonimiaError, InformeFusion
 from core import Core, CoreResult
-from nucleos import ProcesadorNucleos, crear_slot_n
+from nucleos import ProcesadorNucleos, crear_slot_n, cargar_lexicon
 from particulas import ProcesadorParticulas, crear_slot_p
 from casos_dificiles import ProcesadorCasosDificiles
 from reparacion import ReparadorSintactico
@@ -17,6 +20,13 @@ from formacion import ControladorFormacionLexica
 from renderizado import ControladorRenderizado
 from consultas import GestorConsultas, obtener_gestor_consultas
 from comandos import ProcesadorComandos, obtener_procesador_comandos
+from paralelo import TraductorParalelo, normalizar_workers
+from cache_oraciones import CacheOraciones
+from punto_control import PuntoControl, PuntoControlError
+from utils import (
+    Tokenizador, ClasificadorGramatical, GestorArchivos, Logger,
+    FlujoTokens, TokenClasificado
+)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -46,8 +56,17 @@ class SistemaTraduccion:
         # Configuración
         self.config = obtener_config()
         
+        # Léxico etimológico externo (P4.F3)
+        if self.config.ruta_lexicon:
+            cargar_lexicon(self.config.ruta_lexicon)
+        
         # Componentes principales
-        self.glosario = Glosario()
+        if self.config.ruta_almacen_glosario:
+            self.glosario = Glosario.abrir(self.config.ruta_almacen_glosario)
+        else:
+            self.glosario = Glosario()
+        if self.config.ruta_diario_glosario:
+            self.glosario.activar_diario(self.config.ruta_diario_glosario)
         self.core = Core(self.glosario)
         
         # Procesadores
@@ -81,6 +100,24 @@ class SistemaTraduccion:
         self._texto_traducido: str = ""
         self._oraciones_fuente: List[str] = []
         self._oraciones_traducidas: List[str] = []
+        self._flujo: FlujoTokens = FlujoTokens()
+        
+        # Posición en el glosario del primer token del flujo (None = las
+        # ocurrencias no corresponden al flujo y no se puede retraducir)
+        self._desplazamiento_flujo: Optional[int] = None
+        
+        # Tokens ya registrados en el glosario (traducción por lotes)
+        self._tokens_registrados: int = 0
+        
+        # Glosario previo (config.ruta_glosario_previo), cargado una vez
+        self._glosario_previo: Optional[Glosario] = None
+        
+        # Caché de oraciones traducidas (None = desactivada)
+        self.cache_oraciones: Optional[CacheOraciones] = None
+        if self.config.cache_oraciones_capacidad > 0:
+            self.cache_oraciones = CacheOraciones(self.config.cache_oraciones_capacidad,
+                                                  self.config.ruta_cache_oraciones)
+        self._contexto_cache: Optional[Tuple[Tuple, Tuple]] = None  # (firma, contexto)
         
         # Callbacks de control
         self._configurar_callbacks()
@@ -91,17 +128,25 @@ class SistemaTraduccion:
         self.proc_comandos.set_callback("CONTINUAR", self._on_continuar)
         self.proc_comandos.set_callback("FORZAR", self._on_forzar)
         self.proc_comandos.set_callback("REINICIAR", self._on_reiniciar)
+        self.proc_comandos.set_callback("ESTADO", self._on_estado)
+        self.proc_comandos.set_callback("ACTUALIZA", self._on_actualiza)
+        self.proc_comandos.set_callback("AÑADE LOCUCION", self._on_añade_locucion)
     
     # ══════════════════════════════════════════════════════════
     # FLUJO PRINCIPAL
     # ══════════════════════════════════════════════════════════
     
-    def traducir(self, texto_fuente: str) -> str:
+    def traducir(self, texto_fuente: str, workers: Optional[int] = None) -> str:
         """
         Traducir texto completo
         
         Flujo macro (P0):
           [INPUT] → [P10.A] → [P8.A] → [CONSULTAS] → [P3-P7] → [P10.B] → [OUTPUT]
+        
+        Args:
+            texto_fuente: Texto a traducir
+            workers: Procesos para P3-P7 (None = config.workers, 0 = todos
+                     los núcleos). El resultado es idéntico al serial.
         """
         self.logger.info("Iniciando traducción")
         self._texto_fuente = texto_fuente
@@ -118,6 +163,10 @@ class SistemaTraduccion:
             self.estado.total_oraciones = len(self._oraciones_fuente)
             self.logger.info(f"Oraciones detectadas: {self.estado.total_oraciones}")
             
+            # Tokenización y clasificación únicas (compartidas por P8.A y Mtx_S)
+            self._flujo = FlujoTokens.construir(texto_limpio, self._oraciones_fuente)
+            self._desplazamiento_flujo = 0
+            
             # P8.A: Análisis léxico (detección + tokenización + registro)
             self.estado.fase_actual = "P8.A: Análisis léxico"
             self._fase_analisis_lexico(texto_limpio)
@@ -130,20 +179,22 @@ class SistemaTraduccion:
             self.estado.fase_actual = "P3-P7: Traducción"
             self._oraciones_traducidas = []
             
-            for i, oracion in enumerate(self._oraciones_fuente):
-                if self.estado.pausado:
-                    self.logger.info("Proceso pausado")
-                    break
-                
-                self.logger.debug(f"Traduciendo oración {i+1}/{self.estado.total_oraciones}")
-                oracion_traducida = self._traducir_oracion(oracion)
-                self._oraciones_traducidas.append(oracion_traducida)
-                self.estado.oraciones_traducidas = i + 1
+            workers = normalizar_workers(
+                self.config.workers if workers is None else workers
+            )
+            if workers > 1 and len(self._oraciones_fuente) > 1:
+                self._traducir_oraciones_paralelo(workers)
+            else:
+                self._traducir_oraciones_serial()
             
             # P10.B: Presentación
             self.estado.fase_actual = "P10.B: Presentación"
             self._texto_traducido = " ".join(self._oraciones_traducidas)
+            self.glosario.sincronizar()
+            if self.cache_oraciones is not None:
+                self.cache_oraciones.sincronizar()
             
+            self._on_estado()
             self.estado.fase_actual = "COMPLETADO"
             self.logger.info("Traducción completada")
             
@@ -163,7 +214,7 @@ class SistemaTraduccion:
             self.logger.error(f"Error inesperado: {e}")
             raise
     
-    def _fase_analisis_lexico(self, texto: str) -> None:
+    def _fase_analisis_lexico(self, texto: str, desplazamiento: int = 0) -> None:
         """
         P8.A: Análisis léxico completo
         
@@ -172,34 +223,353 @@ class SistemaTraduccion:
         3. Registro inicial
         4. Verificación de completitud
         """
-        # Tokenizar
-        tokens = Tokenizador.tokenizar(texto)
-        
-        # Clasificar tokens
-        tokens_clasificados = []
-        for token in tokens:
-            cat, cat_gram = ClasificadorGramatical.clasificar(token)
-            tokens_clasificados.append((token, cat, cat_gram))
+        # Tokens ya clasificados en el flujo
+        tokens_clasificados = self._flujo.tokens_clasificados()
         
         # Procesar en glosario
-        self.glosario.fase_a_procesar(texto, tokens_clasificados)
+        self.glosario.fase_a_procesar(texto, tokens_clasificados, desplazamiento)
+        self._fusionar_glosario_previo()
+        self._actualizar_estado_glosario()
+    
+    def _fusionar_glosario_previo(self) -> Optional[InformeFusion]:
+        """
+        Aplicar el glosario previo (config.ruta_glosario_previo) tras P8.A
+        
+        Se carga una sola vez; en cada P8.A solo se buscan en él los tokens
+        pendientes (y las locuciones), de modo que la traducción por lotes
+        no recorre el glosario previo entero en cada lote.
+        """
+        ruta = self.config.ruta_glosario_previo
+        if not ruta:
+            return None
         
-        # Actualizar estado
+        if self._glosario_previo is None:
+            self._glosario_previo = Glosario.importar_archivo(ruta)
+        previo = self._glosario_previo
+        
+        pendientes, _ = self.glosario.obtener_pagina(
+            limite=self.glosario.obtener_estadisticas()["pendientes"],
+            status=TokenStatus.PENDIENTE
+        )
+        elementos = [
+            previa for previa in (previo.obtener_entrada(e.token_src) for e in pendientes)
+            if previa is not None
+        ]
+        elementos.extend(previo.obtener_locuciones().values())
+        
+        informe = self.glosario.fusionar(elementos, solo_existentes=True)
+        self.logger.info(f"Glosario previo: {informe.asignadas} asignadas, "
+                         f"{informe.locuciones} locuciones, {len(informe.conflictos)} conflictos")
+        for conflicto in informe.conflictos:
+            self.logger.warning(str(conflicto))
+        
+        return informe
+    
+    def _actualizar_estado_glosario(self, registrar: bool = True) -> None:
+        """Volcar estadísticas del glosario en el estado (contadores, O(1))"""
         stats = self.glosario.obtener_estadisticas()
         self.estado.glosario_entradas = stats["total"]
         self.estado.glosario_asignadas = stats["asignadas"]
         self.estado.glosario_pendientes = stats["pendientes"]
         
-        self.logger.info(f"Glosario: {stats['total']} entradas, {stats['locuciones']} locuciones")
+        if registrar:
+            self.logger.info(f"Glosario: {stats['total']} entradas, {stats['locuciones']} locuciones")
+    
+    # ══════════════════════════════════════════════════════════
+    # TRADUCCIÓN DE ARCHIVOS POR LOTES
+    # ══════════════════════════════════════════════════════════
+    
+    # Párrafos por lote en la traducción de archivos
+    LOTE_PARRAFOS = 100
+    
+    def traducir_archivo(self, ruta_entrada: str, ruta_salida: str,
+                         lote_parrafos: int = LOTE_PARRAFOS,
+                         reanudar: bool = False,
+                         workers: Optional[int] = None,
+                         dos_pasadas: bool = False) -> int:
+        """
+        Traducir un archivo párrafo a párrafo con memoria acotada
+        
+        Lee la fuente por párrafos (separados por línea en blanco), traduce
+        lotes de `lote_parrafos` párrafos sobre el mismo glosario y añade
+        cada lote a la salida. Tras cada lote se añade un punto de control
+        a <salida>.checkpoint: el control del lote y los cambios del glosario
+        en una sola línea (ver punto_control). Si no se puede guardar, la
+        traducción se detiene con PuntoControlError. Al reanudar, un punto
+        de control de otra entrada, o con la salida ausente o más corta de
+        lo registrado, se descarta y se empieza de cero.
+        
+        Con `dos_pasadas`, una primera lectura completa del archivo registra
+        y sella el glosario (P8.A por fragmentos) antes de traducir; cada
+        lote se traduce entonces sobre el glosario ya sellado.
+        
+        Args:
+            ruta_entrada: Archivo fuente
+            ruta_salida: Archivo de salida
+            lote_parrafos: Párrafos por lote
+            reanudar: Continuar desde el último punto de control
+            workers: Procesos para P3-P7 (como en traducir)
+            dos_pasadas: Sellar el glosario sobre todo el archivo antes de traducir
+        
+        Returns:
+            Número total de párrafos escritos
+        """
+        ruta_control = ruta_salida + ".checkpoint"
+        punto = PuntoControl(ruta_control)
+        reanudado = punto.cargar() if reanudar else None
+        if reanudado and not self._punto_control_aplicable(reanudado[1], ruta_entrada,
+                                                           ruta_salida):
+            punto.cerrar()
+            reanudado = None
+        
+        if reanudado:
+            glosario, control = reanudado
+            # Descartar lo escrito tras el último punto de control
+            os.truncate(ruta_salida, control["bytes_salida"])
+            self.establecer_glosario(glosario)
+            parrafos_escritos = control["parrafos"]
+            self._tokens_registrados = control["tokens"]
+            dos_pasadas = control.get("dos_pasadas", False)
+            self.logger.info(f"Reanudando tras {parrafos_escritos} párrafos")
+        else:
+            open(ruta_salida, 'wb').close()
+            parrafos_escritos = 0
+            self._tokens_registrados = 0
+            if dos_pasadas:
+                self.sellar_glosario_archivo(ruta_entrada)
+            if not punto.iniciar(self.glosario, self._control_archivo(
+                    ruta_entrada, parrafos_escritos, 0, dos_pasadas)):
+                self._fallo_punto_control(ruta_control)
+        
+        parrafos = GestorArchivos.leer_parrafos(ruta_entrada, desde=parrafos_escritos)
+        
+        try:
+            with open(ruta_salida, 'ab') as salida:
+                for lote in _agrupar(parrafos, max(1, lote_parrafos)):
+                    traducciones = self._traducir_parrafos(lote, workers,
+                                                           registrar=not dos_pasadas)
+                    if traducciones is None:
+                        # Pausa: el lote incompleto no se escribe
+                        break
+                    
+                    for traduccion in traducciones:
+                        separador = "\n\n" if parrafos_escritos else ""
+                        salida.write((separador + traduccion).encode('utf-8'))
+                        parrafos_escritos += 1
+                    salida.flush()
+                    os.fsync(salida.fileno())
+                    
+                    # Punto de control: glosario y control en una sola línea
+                    self.glosario.sincronizar()
+                    if self.cache_oraciones is not None:
+                        self.cache_oraciones.sincronizar()
+                    if not punto.guardar(self.glosario, self._control_archivo(
+                            ruta_entrada, parrafos_escritos, salida.tell(), dos_pasadas)):
+                        self._fallo_punto_control(ruta_control)
+                    self.logger.info(f"Párrafos escritos: {parrafos_escritos}")
+        finally:
+            punto.cerrar()
+        
+        self._on_estado()
+        if not self.estado.pausado:
+            self.estado.fase_actual = "COMPLETADO"
+        return parrafos_escritos
+    
+    def _control_archivo(self, ruta_entrada: str, parrafos: int,
+                         bytes_salida: int, dos_pasadas: bool) -> dict:
+        """Control de un punto de control de traducir_archivo"""
+        return {
+            "entrada": os.path.abspath(ruta_entrada),
+            "parrafos": parrafos,
+            "bytes_salida": bytes_salida,
+            "tokens": self._tokens_registrados,
+            "dos_pasadas": dos_pasadas
+        }
+    
+    def _punto_control_aplicable(self, control: dict, ruta_entrada: str,
+                                 ruta_salida: str) -> bool:
+        """Reanudar solo sobre la misma entrada y una salida no recortada"""
+        if control["entrada"] != os.path.abspath(ruta_entrada):
+            self.logger.warning(
+                f"El punto de control es de otra entrada ({control['entrada']}): se empieza de cero"
+            )
+            return False
+        if not os.path.exists(ruta_salida) or os.path.getsize(ruta_salida) < control["bytes_salida"]:
+            self.logger.warning(
+                "La salida falta o es más corta que el punto de control: se empieza de cero"
+            )
+            return False
+        return True
+    
+    def _fallo_punto_control(self, ruta_control: str) -> None:
+        """Detener la traducción por archivo: no hay punto de control fiable"""
+        self.logger.error(f"No se pudo guardar el punto de control: {ruta_control}")
+        self.estado.errores_criticos += 1
+        raise PuntoControlError(ruta_control)
+    
+    def sellar_glosario_archivo(self, ruta_entrada: str) -> None:
+        """
+        P8.A sobre un archivo completo sin cargarlo en memoria
+        
+        Primera pasada de la traducción en dos pasadas: cada párrafo se
+        limpia, tokeniza y registra en el glosario, y se descarta.
+        """
+        self.estado.fase_actual = "P8.A: Análisis léxico"
+        
+        def fragmentos():
+            for parrafo in GestorArchivos.leer_parrafos(ruta_entrada):
+                limpio = self.renderizado.limpiar_texto(parrafo).texto_limpio
+                flujo = FlujoTokens.construir(limpio, Tokenizador.dividir_oraciones(limpio))
+                self._tokens_registrados += len(flujo)
+                yield limpio, flujo.tokens_clasificados()
+        
+        self.glosario.fase_a_procesar_flujo(fragmentos(), self._tokens_registrados)
+        self._fusionar_glosario_previo()
+        self._actualizar_estado_glosario()
+        
+        if self.gestor_consultas.hay_pendientes():
+            self._procesar_consultas()
+    
+    def _traducir_parrafos(self, parrafos: List[str],
+                           workers: Optional[int] = None,
+                           registrar: bool = True) -> Optional[List[str]]:
+        """
+        Traducir un lote de párrafos (P10.A → P8.A → P3-P7)
+        
+        El glosario se amplía con los tokens del lote; las ocurrencias
+        continúan la numeración de los lotes anteriores. Con
+        `registrar=False` se omite P8.A (glosario ya sellado).
+        
+        Returns:
+            Un texto traducido por párrafo, o None si se pausó el proceso
+        """
+        # P10.A: Limpieza por párrafo
+        self.estado.fase_actual = "P10.A: Limpieza"
+        limpios = [self.renderizado.limpiar_texto(p).texto_limpio for p in parrafos]
+        oraciones_por_parrafo = [Tokenizador.dividir_oraciones(p) for p in limpios]
+        texto_limpio = "\n\n".join(limpios)
+        
+        self._oraciones_fuente = [o for oraciones in oraciones_por_parrafo for o in oraciones]
+        self.estado.total_oraciones = len(self._oraciones_fuente)
+        self._flujo = FlujoTokens.construir(texto_limpio, self._oraciones_fuente)
+        
+        # P8.A: Análisis léxico del lote
+        self._desplazamiento_flujo = self._tokens_registrados if registrar else None
+        if registrar:
+            self.estado.fase_actual = "P8.A: Análisis léxico"
+            self._fase_analisis_lexico(texto_limpio, self._tokens_registrados)
+            self._tokens_registrados += len(self._flujo)
+            
+            if self.gestor_consultas.hay_pendientes():
+                self._procesar_consultas()
+        
+        # P3-P7
+        self.estado.fase_actual = "P3-P7: Traducción"
+        self._oraciones_traducidas = []
+        
+        workers = normalizar_workers(
+            self.config.workers if workers is None else workers
+        )
+        if workers > 1 and len(self._oraciones_fuente) > 1:
+            self._traducir_oraciones_paralelo(workers)
+        else:
+            self._traducir_oraciones_serial()
+        
+        if len(self._oraciones_traducidas) < len(self._oraciones_fuente):
+            return None
+        
+        # P10.B: Reagrupar oraciones por párrafo
+        traducciones = []
+        cursor = 0
+        for oraciones in oraciones_por_parrafo:
+            traducciones.append(" ".join(self._oraciones_traducidas[cursor:cursor + len(oraciones)]))
+            cursor += len(oraciones)
+        return traducciones
+    
+    def _traducir_oraciones_serial(self) -> None:
+        """P3-P7: Traducir oraciones una a una"""
+        for i, oracion in enumerate(self._oraciones_fuente):
+            if self.estado.pausado:
+                self.logger.info("Proceso pausado")
+                break
+            
+            self.logger.debug(f"Traduciendo oración {i+1}/{self.estado.total_oraciones}")
+            oracion_traducida = self._traducir_oracion(oracion, self._flujo.oracion(i))
+            self._oraciones_traducidas.append(oracion_traducida)
+            self.estado.oraciones_traducidas = i + 1
+    
+    def _traducir_oraciones_paralelo(self, workers: int) -> None:
+        """
+        P3-P7: Traducir oraciones en varios procesos
+        
+        Cada proceso recibe una copia del glosario sellado; sus escrituras
+        se fusionan aquí en orden de oración.
+        """
+        self.logger.info(f"Traducción paralela: {workers} procesos")
+        
+        def progreso(completadas: int) -> bool:
+            self.estado.oraciones_traducidas = completadas
+            if self.estado.pausado:
+                self.logger.info("Proceso pausado")
+                return False
+            return True
+        
+        oraciones = [
+            (oracion, self._flujo.oracion(i))
+            for i, oracion in enumerate(self._oraciones_fuente)
+        ]
+        
+        traductor = TraductorParalelo(workers)
+        self._oraciones_traducidas = traductor.traducir(
+            self.glosario, oraciones, self.config, progreso
+        )
+        if self.cache_oraciones is not None:
+            self.cache_oraciones.aciertos += traductor.cache_aciertos
+            self.cache_oraciones.fallos += traductor.cache_fallos
+        self.proc_nucleos.sumar_estadisticas_cache(traductor.candidatos_aciertos,
+                                                   traductor.candidatos_fallos,
+                                                   traductor.candidatos_desalojos)
     
-    def _traducir_oracion(self, oracion: str) -> str:
+    def _traducir_oracion(self, oracion: str,
+                          tokens_clasificados: Optional[List[TokenClasificado]] = None) -> str:
         """
         Traducir una oración individual
         
         P3 → P4/P5 → P6 → P7 → resultado
+        
+        Con la caché de oraciones activa, una oración ya traducida en el
+        mismo estado (tokens, huellas del glosario, configuración) se
+        toma de la caché y se reaplican sus escrituras de Fase B.
         """
+        if tokens_clasificados is None:
+            tokens_clasificados = [
+                (token, *ClasificadorGramatical.clasificar(token))
+                for token in Tokenizador.tokenizar(oracion)
+            ]
+        
+        if self.cache_oraciones is None:
+            return self._procesar_oracion(oracion, tokens_clasificados)[0]
+        
+        clave = self._clave_oracion(tokens_clasificados)
+        guardada = self.cache_oraciones.obtener(clave)
+        if guardada is not None:
+            traduccion, escrituras = guardada
+            self.glosario.aplicar_escrituras(escrituras)
+            return traduccion
+        
+        with self.glosario.capturar_escrituras() as escrituras:
+            traduccion, exito = self._procesar_oracion(oracion, tokens_clasificados)
+        
+        # Los errores incluyen la oración original: no se guardan
+        if exito:
+            self.cache_oraciones.guardar(clave, traduccion, escrituras)
+        return traduccion
+    
+    def _procesar_oracion(self, oracion: str,
+                          tokens_clasificados: List[TokenClasificado]) -> Tuple[str, bool]:
+        """P3-P7 sobre una oración: (traducción, éxito)"""
         # Crear matriz fuente
-        mtx_s = self._crear_matriz_fuente(oracion)
+        mtx_s = self._crear_matriz_fuente(oracion, tokens_clasificados)
         
         # Procesar con Core
         resultado = self.core.procesar_oracion(mtx_s)
@@ -208,24 +578,68 @@ class SistemaTraduccion:
             self.logger.warning(f"Error en traducción: {resultado.mensaje}")
             # Intentar serializar lo que haya
             if resultado.mtx_t:
-                return self.core.serializar_resultado()
-            return f"[ERROR: {oracion}]"
+                return self.core.serializar_resultado(), False
+            return f"[ERROR: {oracion}]", False
         
         # Serializar resultado
-        return self.core.serializar_resultado()
+        return self.core.serializar_resultado(), True
+    
+    def _clave_oracion(self, tokens_clasificados: List[TokenClasificado]) -> Tuple:
+        """Clave de la caché de oraciones: tokens, huellas y contexto"""
+        tokens = tuple(token for token, _, _ in tokens_clasificados)
+        return (
+            tokens,
+            tuple(self.glosario.huella(token) for token in dict.fromkeys(tokens)),
+            self._contexto_oracion()
+        )
     
-    def _crear_matriz_fuente(self, oracion: str) -> MatrizFuente:
-        """Crear matriz fuente desde oración"""
+    def _contexto_oracion(self) -> Tuple:
+        """
+        Configuración que interviene en la traducción: modos, versión de
+        la base de partículas, reglas activas y léxico (ruta y fecha de
+        modificación)
+        
+        Se recalcula solo cuando cambian las reglas, los modos o la base.
+        """
+        config = self.config
+        modos = (config.modo_transliteracion.name, config.norma_transliteracion.name,
+                 config.modo_salida.name, self.proc_particulas.base_part.version)
+        
+        if self._contexto_cache is None or self._contexto_cache[0] != (config.version_reglas, modos):
+            reglas = tuple(
+                (regla.tipo, regla.condicion, regla.accion)
+                for regla in config.obtener_reglas_activas()
+            )
+            lexicon = config.ruta_lexicon
+            if lexicon and os.path.exists(lexicon):
+                lexicon = (lexicon, os.path.getmtime(lexicon))
+            self._contexto_cache = ((config.version_reglas, modos), modos + (reglas, lexicon))
+        
+        return self._contexto_cache[1]
+    
+    def _crear_matriz_fuente(self, oracion: str,
+                             tokens_clasificados: Optional[List[TokenClasificado]] = None) -> MatrizFuente:
+        """
+        Crear matriz fuente desde oración
+        
+        Args:
+            oracion: Oración fuente
+            tokens_clasificados: Recorte del flujo de tokens para esta
+                                 oración; si falta, se tokeniza la oración
+        """
         mtx = MatrizFuente()
-        tokens = Tokenizador.tokenizar(oracion)
         
-        for i, token in enumerate(tokens):
+        if tokens_clasificados is None:
+            tokens_clasificados = [
+                (token, *ClasificadorGramatical.clasificar(token))
+                for token in Tokenizador.tokenizar(oracion)
+            ]
+        
+        for i, (token, cat, cat_gram) in enumerate(tokens_clasificados):
             # Agregar celda
             mtx.agregar_celda(token, i)
             
-            # Clasificar y crear slot
-            cat, cat_gram = ClasificadorGramatical.clasificar(token)
-            
+            # Crear slot
             if cat == TokenCategoria.NUCLEO:
                 slot = crear_slot_n(token, cat_gram, i)
                 mtx.agregar_slot_n(slot)
@@ -233,9 +647,11 @@ class SistemaTraduccion:
                 slot = crear_slot_p(token, cat_gram, i)
                 mtx.agregar_slot_p(slot)
         
-        # Agregar locuciones del glosario
-        for loc_id, loc in self.glosario.obtener_locuciones().items():
-            mtx.agregar_locucion(loc)
+        # Agregar solo las locuciones presentes en la oración,
+        # en posiciones locales
+        tokens = [token for token, _, _ in tokens_clasificados]
+        for loc, inicio in self.glosario.buscar_locuciones(tokens):
+            mtx.agregar_locucion(loc.ocurrencia_en(inicio))
         
         return mtx
     
@@ -252,6 +668,76 @@ class SistemaTraduccion:
             texto = self.gestor_consultas.formatear_consultas_bloque()
             print(texto)
     
+    # ══════════════════════════════════════════════════════════
+    # RETRADUCCIÓN INCREMENTAL
+    # ══════════════════════════════════════════════════════════
+    
+    def oraciones_afectadas(self, tokens: Iterable[str] = (),
+                            locuciones: Iterable[str] = ()) -> List[int]:
+        """
+        Oraciones del texto actual que contienen los tokens o locuciones
+        
+        Se obtienen de las ocurrencias del glosario (posiciones de token)
+        con una búsqueda binaria sobre los inicios de oración del flujo.
+        Una locución afecta a todas las oraciones de sus componentes: al
+        registrarla, los componentes quedan bloqueados (P8.B2) también
+        fuera de ella.
+        """
+        afectadas: Set[int] = set()
+        
+        for token in tokens:
+            afectadas |= self._oraciones_de_token(token)
+        
+        for loc_id in locuciones:
+            loc = self.glosario.obtener_locucion(loc_id)
+            if loc is not None:
+                for componente in loc.componentes:
+                    afectadas |= self._oraciones_de_token(componente)
+        
+        return sorted(afectadas)
+    
+    def _oraciones_de_token(self, token: str) -> Set[int]:
+        """Oraciones del flujo donde aparece el token"""
+        entrada = self.glosario.obtener_entrada(token)
+        if entrada is None or self._desplazamiento_flujo is None:
+            return set()
+        
+        inicio = self._desplazamiento_flujo
+        fin = inicio + len(self._flujo)
+        return {
+            self._flujo.oracion_de(posicion - inicio)
+            for posicion in entrada.ocurrencias
+            if inicio <= posicion < fin
+        }
+    
+    def retraducir(self, tokens: Iterable[str] = (),
+                   locuciones: Iterable[str] = ()) -> List[int]:
+        """
+        Retraducir solo las oraciones afectadas por cambios en el glosario
+        
+        Cada oración afectada vuelve a pasar por P3-P7 y su traducción se
+        sustituye en el resultado; las demás no se tocan.
+        
+        Returns:
+            Índices de las oraciones retraducidas
+        """
+        afectadas = [
+            i for i in self.oraciones_afectadas(tokens, locuciones)
+            if i < len(self._oraciones_traducidas)
+        ]
+        
+        for i in afectadas:
+            self._oraciones_traducidas[i] = self._traducir_oracion(
+                self._oraciones_fuente[i], self._flujo.oracion(i)
+            )
+        
+        if afectadas:
+            self._texto_traducido = " ".join(self._oraciones_traducidas)
+            self.glosario.sincronizar()
+            self.logger.info(f"Retraducidas {len(afectadas)} oraciones")
+        
+        return afectadas
+    
     # ══════════════════════════════════════════════════════════
     # CALLBACKS DE CONTROL
     # ══════════════════════════════════════════════════════════
@@ -270,15 +756,31 @@ class SistemaTraduccion:
         """Callback para forzar continuación"""
         self.logger.warning("Continuación forzada por usuario")
     
+    def _on_estado(self) -> None:
+        """Callback para estado: volcar contadores del glosario y de cachés"""
+        self._actualizar_estado_glosario(registrar=False)
+        
+        stats = self.proc_nucleos.estadisticas_cache()
+        self.estado.cache_candidatos_aciertos = stats["aciertos"]
+        self.estado.cache_candidatos_fallos = stats["fallos"]
+        self.estado.cache_candidatos_desalojos = stats["desalojos"]
+        
+        if self.cache_oraciones is not None:
+            self.estado.cache_oraciones_aciertos = self.cache_oraciones.aciertos
+            self.estado.cache_oraciones_fallos = self.cache_oraciones.fallos
+    
+    def _on_actualiza(self, token: str) -> None:
+        """Callback tras [ACTUALIZA]: retraducir las oraciones del token"""
+        self.retraducir(tokens=[token])
+    
+    def _on_añade_locucion(self, locucion_id: str) -> None:
+        """Callback tras [AÑADE LOCUCION]: retraducir las oraciones de la locución"""
+        self.retraducir(locuciones=[locucion_id])
+    
     def _on_reiniciar(self) -> None:
         """Callback para reiniciar"""
-        self.glosario = Glosario()
-        self.core = Core(self.glosario)
-        self.core.set_procesador_nucleos(self.proc_nucleos)
-        self.core.set_procesador_particulas(self.proc_particulas)
-        self.core.set_reparador(self.reparador)
+        self.establecer_glosario(Glosario())
         self.estado = EstadoProceso()
-        self.proc_comandos.set_glosario(self.glosario)
         self.proc_comandos.estado = self.estado
         self.logger.info("Sistema reiniciado")
     
@@ -310,15 +812,23 @@ class SistemaTraduccion:
     def importar_glosario(self, datos: str, formato: str = "json") -> bool:
         """Importar glosario"""
         if formato == "json":
-            self.glosario = Glosario.importar_json(datos)
-            self.core = Core(self.glosario)
-            self.core.set_procesador_nucleos(self.proc_nucleos)
-            self.core.set_procesador_particulas(self.proc_particulas)
-            self.core.set_reparador(self.reparador)
-            self.proc_comandos.set_glosario(self.glosario)
+            self.establecer_glosario(Glosario.importar_json(datos))
             return True
         return False
     
+    def establecer_glosario(self, glosario: Glosario) -> None:
+        """Sustituir el glosario y reconstruir el Core sobre él"""
+        if self.config.ruta_diario_glosario and glosario is not self.glosario:
+            # El diario continúa en el glosario nuevo
+            self.glosario.cerrar_diario()
+            glosario.activar_diario(self.config.ruta_diario_glosario)
+        self.glosario = glosario
+        self.core = Core(self.glosario)
+        self.core.set_procesador_nucleos(self.proc_nucleos)
+        self.core.set_procesador_particulas(self.proc_particulas)
+        self.core.set_reparador(self.reparador)
+        self.proc_comandos.set_glosario(self.glosario)
+    
     def obtener_traduccion(self) -> str:
         """Obtener texto traducido"""
         return self._texto_traducido
@@ -328,6 +838,18 @@ class SistemaTraduccion:
         return self.config.modo_salida
 
 
+def _agrupar(elementos: Iterator[str], tamano: int) -> Iterator[List[str]]:
+    """Agrupar un iterador en listas de `tamano` elementos"""
+    grupo: List[str] = []
+    for elemento in elementos:
+        grupo.append(elemento)
+        if len(grupo) == tamano:
+            yield grupo
+            grupo = []
+    if grupo:
+        yield grupo
+
+
 # ──────────────────────────────────────────────────────────────
 # INTERFAZ DE LÍNEA DE COMANDOS
 # ──────────────────────────────────────────────────────────────
@@ -337,8 +859,10 @@ class CLI:
     Interfaz de línea de comandos
     """
     
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None):
         self.sistema = SistemaTraduccion()
+        if workers is not None:
+            self.sistema.config.workers = workers
         self._ejecutando = True
     
     def ejecutar(self) -> None:
@@ -428,27 +952,47 @@ class CLI:
 
 def main():
     """Punto de entrada principal"""
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Sistema de Traducción Isomórfica")
+    parser.add_argument("archivo", nargs="?", help="Archivo de texto a traducir")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Procesos para traducir oraciones (0 = todos los núcleos)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Traducir el archivo por lotes de párrafos (memoria acotada)")
+    parser.add_argument("--lote", type=int, default=SistemaTraduccion.LOTE_PARRAFOS,
+                        help="Párrafos por lote en modo --stream")
+    parser.add_argument("--reanudar", action="store_true",
+                        help="Reanudar desde el último punto de control (modo --stream)")
+    parser.add_argument("--dos-pasadas", action="store_true",
+                        help="Sellar el glosario sobre todo el archivo antes de traducir (modo --stream)")
+    args = parser.parse_args()
     
-    if len(sys.argv) > 1:
+    if args.archivo:
         # Modo archivo
-        archivo = sys.argv[1]
-        if GestorArchivos.existe(archivo):
+        archivo = args.archivo
+        archivo_salida = archivo.rsplit('.', 1)[0] + "_traducido.txt"
+        if args.stream and GestorArchivos.existe(archivo):
+            sistema = SistemaTraduccion()
+            total = sistema.traducir_archivo(archivo, archivo_salida, args.lote,
+                                             reanudar=args.reanudar, workers=args.workers,
+                                             dos_pasadas=args.dos_pasadas)
+            print(f"Traducción guardada en: {archivo_salida} ({total} párrafos)")
+        elif GestorArchivos.existe(archivo):
             texto = GestorArchivos.cargar_texto(archivo)
             if texto:
                 sistema = SistemaTraduccion()
-                traduccion = sistema.traducir(texto)
+                traduccion = sistema.traducir(texto, workers=args.workers)
                 print(traduccion)
                 
                 # Guardar resultado
-                archivo_salida = archivo.rsplit('.', 1)[0] + "_traducido.txt"
                 GestorArchivos.guardar_texto(traduccion, archivo_salida)
                 print(f"\nTraducción guardada en: {archivo_salida}")
         else:
             print(f"Archivo no encontrado: {archivo}")
     else:
         # Modo interactivo
-        cli = CLI()
+        cli = CLI(workers=args.workers)
         cli.ejecutar()
 
 
@@ -5,8 +5,11 @@ Bloque 2/13: Modelos y Estructuras de Datos
 ════════════════════════════════════════════════════════════════
 """
 
+import sys
+import base64
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Set
+from typing import List, Dict, Optional, Any, Set, Union
 from datetime import datetime
 from enum import Enum
 
@@ -22,9 +25,9 @@ from constants import (
 # ESTRUCTURAS DE SLOTS (P1.B.1)
 # ══════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MorfologiaFuente:
-    """Morfología del token fuente"""
+    """Morfología del token fuente (inmutable: puede compartirse entre slots)"""
     numero: str = "singular"  # singular, dual, plural
     genero: Optional[str] = None
     persona: Optional[int] = None  # 1, 2, 3
@@ -34,7 +37,11 @@ class MorfologiaFuente:
     estado: Optional[str] = None  # definido, indefinido, constructo
 
 
-@dataclass
+# Morfología por defecto compartida por los slots sin análisis morfológico
+MORFOLOGIA_FUENTE_DEFECTO = MorfologiaFuente()
+
+
+@dataclass(slots=True)
 class MorfologiaTarget:
     """Morfología aplicada al target"""
     numero: str = "singular"
@@ -44,7 +51,7 @@ class MorfologiaTarget:
     voz: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SlotN:
     """
     Slot de Núcleo Léxico (P1.B.1)
@@ -80,7 +87,7 @@ class SlotN:
         self.status = TokenStatus.ASIGNADO
 
 
-@dataclass
+@dataclass(slots=True)
 class SlotP:
     """
     Slot de Partícula (P1.B.1)
@@ -127,6 +134,12 @@ class Locucion:
     tgt: Optional[str] = None  # ETYM(A)-ETYM(B)-...
     status: str = "UNIDAD_COMPLEJA"
     
+    # Conjunto de posiciones para consultas O(1)
+    _posiciones_set: Set[int] = field(default_factory=set, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._posiciones_set = set(self.posiciones)
+    
     def generar_traduccion(self, traducciones_etym: Dict[str, str]) -> str:
         """
         Generar traducción formato ETYM(A)-ETYM(B)-ETYM(C)-...
@@ -143,17 +156,28 @@ class Locucion:
         return self.tgt
     
     def contiene_posicion(self, pos: int) -> bool:
-        return pos in self.posiciones
+        return pos in self._posiciones_set
     
     def primera_posicion(self) -> int:
         return min(self.posiciones) if self.posiciones else -1
+    
+    def ocurrencia_en(self, inicio: int) -> 'Locucion':
+        """Copia de la locución situada en posiciones consecutivas desde inicio"""
+        return Locucion(
+            id=self.id,
+            src=self.src,
+            componentes=self.componentes,
+            posiciones=list(range(inicio, inicio + len(self.componentes))),
+            tgt=self.tgt,
+            status=self.status
+        )
 
 
 # ══════════════════════════════════════════════════════════════
 # ESTRUCTURAS DE MATRIZ (P1.B.1)
 # ══════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class CeldaMatriz:
     """Celda individual de la matriz"""
     pos: int
@@ -183,6 +207,8 @@ class MatrizFuente:
         self.slots_n: List[SlotN] = []
         self.slots_p: List[SlotP] = []
         self.locuciones: Dict[str, Locucion] = {}
+        # Índice posición → locución (la primera agregada prevalece)
+        self._locucion_por_posicion: Dict[int, Locucion] = {}
     
     def agregar_celda(self, token: str, pos: int) -> CeldaMatriz:
         celda = CeldaMatriz(pos=pos, token_src=token)
@@ -203,6 +229,7 @@ class MatrizFuente:
         self.locuciones[locucion.id] = locucion
         # Marcar componentes como bloqueados
         for pos in locucion.posiciones:
+            self._locucion_por_posicion.setdefault(pos, locucion)
             if pos < len(self.celdas):
                 slot = self.celdas[pos].slot
                 if slot:
@@ -217,10 +244,7 @@ class MatrizFuente:
         return None
     
     def obtener_locucion_en_pos(self, pos: int) -> Optional[Locucion]:
-        for loc in self.locuciones.values():
-            if loc.contiene_posicion(pos):
-                return loc
-        return None
+        return self._locucion_por_posicion.get(pos)
 
 
 class MatrizTarget:
@@ -237,26 +261,67 @@ class MatrizTarget:
             for i in range(size)
         ]
         self.inyecciones: List[CeldaMatriz] = []  # Inyecciones no cuentan en size
+        
+        # Auditoría incremental de isomorfismo (P3.F7):
+        # posiciones esperadas (Mtx_S) y celdas que no coinciden
+        self._pos_esperadas: List[int] = list(range(size))
+        self._tamano_fuente: int = size
+        self._desajustadas: Set[int] = set()
     
     def size(self) -> int:
         return self._size
     
+    def vincular_fuente(self, mtx_s: 'MatrizFuente') -> None:
+        """Fijar Mtx_S como referencia de la auditoría incremental"""
+        self._tamano_fuente = mtx_s.size()
+        self._pos_esperadas = [celda.pos for celda in mtx_s.celdas]
+        self._desajustadas = set()
+        for pos in range(min(self._size, self._tamano_fuente)):
+            self._auditar_celda(pos)
+    
+    def _auditar_celda(self, pos: int) -> None:
+        """Actualizar el contador de desajustes para una celda"""
+        if pos < len(self._pos_esperadas) and self.celdas[pos].pos == self._pos_esperadas[pos]:
+            self._desajustadas.discard(pos)
+        else:
+            self._desajustadas.add(pos)
+    
     def asignar(self, pos: int, token_tgt: str, tipo: str = "normal") -> None:
         if 0 <= pos < self._size:
             self.celdas[pos].token_tgt = token_tgt
             self.celdas[pos].tipo = tipo
+            self._auditar_celda(pos)
+    
+    def establecer_token(self, pos: int, token_tgt: Optional[str]) -> None:
+        """Cambiar solo el token de una celda (conserva el tipo)"""
+        if 0 <= pos < self._size:
+            self.celdas[pos].token_tgt = token_tgt
+            self._auditar_celda(pos)
+    
+    def establecer_tipo(self, pos: int, tipo: str) -> None:
+        """Cambiar solo el tipo de una celda (conserva el token)"""
+        if 0 <= pos < self._size:
+            self.celdas[pos].tipo = tipo
+            self._auditar_celda(pos)
     
     def marcar_absorbido(self, pos: int) -> None:
         if 0 <= pos < self._size:
             self.celdas[pos].tipo = "absorbido"
             self.celdas[pos].token_tgt = "[ABSORBIDO]"
+            self._auditar_celda(pos)
     
     def marcar_nulo(self, pos: int) -> None:
         if 0 <= pos < self._size:
             self.celdas[pos].tipo = "nulo"
+            self._auditar_celda(pos)
     
     def insertar_inyeccion(self, token: str, pos_referencia: int) -> None:
-        """Insertar inyección (no afecta size)"""
+        """
+        Insertar inyección (no afecta size)
+        
+        Las inyecciones viven fuera de celdas: no alteran el contador
+        de desajustes.
+        """
         celda = CeldaMatriz(
             pos=pos_referencia,
             token_src="",
@@ -270,8 +335,17 @@ class MatrizTarget:
             return self.celdas[pos].token_tgt
         return None
     
+    def es_isomorfo(self) -> bool:
+        """
+        Auditoría incremental O(1): Mtx_T[i].pos == Mtx_S[i].pos
+        
+        Válida mientras las celdas se modifiquen con los métodos de la
+        matriz (asignar, marcar_absorbido, marcar_nulo, ...).
+        """
+        return self._size == self._tamano_fuente and not self._desajustadas
+    
     def verificar_isomorfismo(self, mtx_s: MatrizFuente) -> bool:
-        """Verificar que posiciones coinciden (ignorando inyecciones)"""
+        """Verificar que posiciones coinciden (ignorando inyecciones) - recorrido completo"""
         if self._size != mtx_s.size():
             return False
         
@@ -286,15 +360,43 @@ class MatrizTarget:
 # ENTRADA DE GLOSARIO (P1.B.5)
 # ══════════════════════════════════════════════════════════════
 
-@dataclass
+def _nuevas_ocurrencias() -> array:
+    return array('I')
+
+
+def codificar_ocurrencias(ocurrencias: array) -> str:
+    """Codificar ocurrencias como base64 de uint32 little-endian"""
+    if sys.byteorder == 'big':
+        ocurrencias = array('I', ocurrencias)
+        ocurrencias.byteswap()
+    return base64.b64encode(ocurrencias.tobytes()).decode('ascii')
+
+
+def decodificar_ocurrencias(valor: Union[str, List[int]]) -> array:
+    """Decodificar ocurrencias exportadas (base64 o lista de enteros)"""
+    if not isinstance(valor, str):
+        return array('I', valor)
+    ocurrencias = array('I')
+    ocurrencias.frombytes(base64.b64decode(valor))
+    if sys.byteorder == 'big':
+        ocurrencias.byteswap()
+    return ocurrencias
+
+
+@dataclass(slots=True)
 class EntradaGlosario:
-    """Entrada individual del glosario"""
+    """
+    Entrada individual del glosario
+    
+    `ocurrencias` es un array('I') de índices de token (4 bytes por
+    ocurrencia); admite len, índice, iteración y append como una lista.
+    """
     token_src: str
     categoria: TokenCategoria
     token_tgt: Optional[str] = None
     status: TokenStatus = TokenStatus.PENDIENTE
     margen: int = 0
-    ocurrencias: List[int] = field(default_factory=list)
+    ocurrencias: array = field(default_factory=_nuevas_ocurrencias)
     
     # Para partículas: funciones por posición
     func_roles: Dict[int, FuncRole] = field(default_factory=dict)
@@ -305,6 +407,13 @@ class EntradaGlosario:
     # Para polisemia en partículas
     traducciones_por_funcion: Dict[FuncRole, str] = field(default_factory=dict)
     
+    def __post_init__(self):
+        if not isinstance(self.ocurrencias, array):
+            self.ocurrencias = array('I', self.ocurrencias)
+    
+    def num_ocurrencias(self) -> int:
+        return len(self.ocurrencias)
+    
     def es_nucleo(self) -> bool:
         return self.categoria == TokenCategoria.NUCLEO
     
@@ -422,11 +531,24 @@ class EstadoProceso:
     glosario_pendientes: int = 0
     pausado: bool = False
     
+    # Caché de candidatos de núcleos (P4.F3)
+    cache_candidatos_aciertos: int = 0
+    cache_candidatos_fallos: int = 0
+    cache_candidatos_desalojos: int = 0
+    
+    # Caché de oraciones traducidas (P3-P7)
+    cache_oraciones_aciertos: int = 0
+    cache_oraciones_fallos: int = 0
+    
     def progreso_porcentaje(self) -> float:
         if self.total_oraciones == 0:
             return 0.0
         return (self.oraciones_traducidas / self.total_oraciones) * 100
     
+    def tasa_cache_oraciones(self) -> float:
+        consultas = self.cache_oraciones_aciertos + self.cache_oraciones_fallos
+        return (self.cache_oraciones_aciertos / consultas) * 100 if consultas else 0.0
+    
     def formatear(self) -> str:
         return f"""
 ESTADO DEL PROCESO
@@ -437,4 +559,6 @@ Consultas pendientes: {self.consultas_pendientes}
 Errores críticos: {self.errores_criticos}
 
 Glosario: {self.glosario_entradas} entradas ({self.glosario_asignadas} asignadas, {self.glosario_pendientes} pendientes)
+Caché de candidatos (P4): {self.cache_candidatos_aciertos} aciertos, {self.cache_candidatos_fallos} fallos, {self.cache_candidatos_desalojos} desalojos
+Caché de oraciones: {self.cache_oraciones_aciertos} aciertos, {self.cache_oraciones_fallos} fallos ({self.tasa_cache_oraciones():.1f}% aciertos)
 """.strip()
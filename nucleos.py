@@ -26,9 +26,13 @@ from constants import (
     Reason, JERARQUIA_ETIMOLOGICA, FalloCritico
 )
 from models import (
-    SlotN, MorfologiaFuente, MorfologiaTarget, ErrorCritico
+    SlotN, MorfologiaFuente, MorfologiaTarget, ErrorCritico,
+    MORFOLOGIA_FUENTE_DEFECTO
 )
 from glossary import Glosario, SinonimiaError
+from lexicon import LexiconEtimologico, LexiconMemoria, RegistroRaiz, abrir_lexicon
+from config import obtener_config
+from utils import CacheLRU
 
 
 # ══════════════════════════════════════════════════════════════
@@ -81,62 +85,85 @@ class ResultadoNucleo:
 # BASE DE DATOS ETIMOLÓGICA (Simulada)
 # ══════════════════════════════════════════════════════════════
 
+# Léxico de demostración
+# Formato: token_src -> [(termino_es, origen, raiz, derivacion_existe)]
+_RAICES_DEMOSTRACION: Dict[str, List[RegistroRaiz]] = {
+    # Ejemplos árabes
+    "ʿaql": [
+        ("intelecto", "LATINA", "intellec-", True),
+        ("razón", "LATINA", "ration-", True),
+        ("ligadura", "LATINA", "ligatur-", True),  # Etimológico: "atar"
+    ],
+    "nafs": [
+        ("alma", "LATINA", "anim-", True),
+        ("espíritu", "LATINA", "spirit-", True),
+        ("psique", "GRIEGA", "psych-", True),
+    ],
+    "ʿayn": [
+        ("ojo", "LATINA", "ocul-", True),
+        ("esencia", "LATINA", "essent-", True),
+        ("fuente", "LATINA", "font-", True),
+    ],
+    "kalima": [
+        ("palabra", "LATINA", "parabola-", True),
+        ("verbo", "LATINA", "verb-", True),
+    ],
+    "wujūd": [
+        ("existencia", "LATINA", "existent-", True),
+        ("ser", "LATINA", "ess-", True),
+    ],
+    "maʿqūl": [
+        ("inteligido", "LATINA", "intellec-", False),  # Derivación no existe
+        ("intelectado", "LATINA", "intellec-", False),
+    ],
+    "ḥaqq": [
+        ("verdad", "LATINA", "verit-", True),
+        ("derecho", "LATINA", "direct-", True),
+        ("real", "LATINA", "real-", True),
+    ],
+}
+
+
 class BaseEtimologica:
     """
-    Base de datos etimológica simplificada
-    En producción, esto sería una base de datos real
+    Base de datos etimológica
+    
+    Las raíces se consultan en un backend de léxico intercambiable
+    (lexicon.py): en memoria por defecto, o un archivo .lex en disco
+    para léxicos de producción.
     """
     
-    def __init__(self):
-        # Diccionario de raíces conocidas
-        # Formato: token_src -> [(termino_es, origen, raiz, derivacion_existe)]
-        self._raices: Dict[str, List[Tuple[str, str, str, bool]]] = {
-            # Ejemplos árabes
-            "ʿaql": [
-                ("intelecto", "LATINA", "intellec-", True),
-                ("razón", "LATINA", "ration-", True),
-                ("ligadura", "LATINA", "ligatur-", True),  # Etimológico: "atar"
-            ],
-            "nafs": [
-                ("alma", "LATINA", "anim-", True),
-                ("espíritu", "LATINA", "spirit-", True),
-                ("psique", "GRIEGA", "psych-", True),
-            ],
-            "ʿayn": [
-                ("ojo", "LATINA", "ocul-", True),
-                ("esencia", "LATINA", "essent-", True),
-                ("fuente", "LATINA", "font-", True),
-            ],
-            "kalima": [
-                ("palabra", "LATINA", "parabola-", True),
-                ("verbo", "LATINA", "verb-", True),
-            ],
-            "wujūd": [
-                ("existencia", "LATINA", "existent-", True),
-                ("ser", "LATINA", "ess-", True),
-            ],
-            "maʿqūl": [
-                ("inteligido", "LATINA", "intellec-", False),  # Derivación no existe
-                ("intelectado", "LATINA", "intellec-", False),
-            ],
-            "ḥaqq": [
-                ("verdad", "LATINA", "verit-", True),
-                ("derecho", "LATINA", "direct-", True),
-                ("real", "LATINA", "real-", True),
-            ],
-        }
+    def __init__(self, lexicon: Optional[LexiconEtimologico] = None):
+        # Backend de raíces: token_src -> [(termino_es, origen, raiz, derivacion_existe)]
+        self._lexicon: LexiconEtimologico = lexicon or LexiconMemoria(_RAICES_DEMOSTRACION)
         
         # Términos que permiten lectura metafórica
         self._metaforas_viables: Dict[str, List[str]] = {
             "ʿaql": ["ligadura", "sujeción"],  # "lo que ata/sujeta"
             "ʿayn": ["esencia", "fuente"],     # "ojo" como esencia
         }
+        # Misma tabla en minúsculas, para comparar sin recalcular
+        self._metaforas_min: Dict[str, frozenset] = {
+            token.lower(): frozenset(m.lower() for m in metaforas)
+            for token, metaforas in self._metaforas_viables.items()
+        }
+    
+    @property
+    def lexicon(self) -> LexiconEtimologico:
+        return self._lexicon
+    
+    def establecer_lexicon(self, lexicon: LexiconEtimologico) -> None:
+        """Sustituir el backend de léxico"""
+        anterior = self._lexicon
+        self._lexicon = lexicon
+        if anterior is not lexicon:
+            anterior.cerrar()
     
     def buscar_raices(self, token_src: str) -> List[CandidatoEtimologico]:
         """Buscar raíces etimológicas para un token"""
         candidatos = []
         
-        datos = self._raices.get(token_src.lower(), [])
+        datos = self._lexicon.obtener(token_src.lower())
         
         for termino, origen, raiz, deriv_existe in datos:
             cand = CandidatoEtimologico(
@@ -156,12 +183,12 @@ class BaseEtimologica:
     
     def _es_metafora_viable(self, token_src: str, termino: str) -> bool:
         """Verificar si el término permite lectura metafórica"""
-        metaforas = self._metaforas_viables.get(token_src.lower(), [])
-        return termino.lower() in [m.lower() for m in metaforas]
+        metaforas = self._metaforas_min.get(token_src.lower(), frozenset())
+        return termino.lower() in metaforas
     
     def obtener_raiz(self, token_src: str) -> Optional[str]:
         """Obtener raíz principal de un token"""
-        datos = self._raices.get(token_src.lower(), [])
+        datos = self._lexicon.obtener(token_src.lower())
         if datos:
             return datos[0][2]  # Primera raíz
         return None
@@ -176,6 +203,19 @@ def obtener_base_etimologica() -> BaseEtimologica:
     return _base_etimologica
 
 
+# Ruta del léxico cargado en la base global
+_ruta_lexicon_cargada: Optional[str] = None
+
+
+def cargar_lexicon(ruta: str) -> None:
+    """Cargar léxico (.lex, TSV o JSON) en la base etimológica global"""
+    global _ruta_lexicon_cargada
+    if ruta == _ruta_lexicon_cargada:
+        return
+    _base_etimologica.establecer_lexicon(abrir_lexicon(ruta))
+    _ruta_lexicon_cargada = ruta
+
+
 # ══════════════════════════════════════════════════════════════
 # PROCESADOR DE NÚCLEOS (P4)
 # ══════════════════════════════════════════════════════════════
@@ -194,9 +234,17 @@ class ProcesadorNucleos:
       F7. Salida
     """
     
-    def __init__(self, base_etim: BaseEtimologica = None):
+    # Capacidad por defecto de la caché de candidatos (F3)
+    CAPACIDAD_CACHE = 8192
+    
+    def __init__(self, base_etim: BaseEtimologica = None,
+                 capacidad_cache: int = CAPACIDAD_CACHE):
         self.base_etim = base_etim or obtener_base_etimologica()
         self._procesador_casos_dificiles = None  # P6
+        
+        # Caché LRU de candidatos ordenados: (token, versión léxico, versión reglas)
+        self._cache_candidatos = CacheLRU(capacidad_cache)
+        self._version_cache: Optional[Tuple[str, int]] = None
     
     def set_procesador_casos_dificiles(self, procesador) -> None:
         """Inyectar procesador de casos difíciles (P6)"""
@@ -311,12 +359,39 @@ class ProcesadorNucleos:
         """
         F3. Búsqueda de lexemas (P4.F3)
         
-        Buscar raíces etimológicas y ordenar según jerarquía
+        Buscar raíces etimológicas y ordenar según jerarquía.
+        Los candidatos ordenados se cachean por token y versión del léxico
+        y de las reglas; no deben modificarse.
         """
-        candidatos = self.base_etim.buscar_raices(slot_n.token_src)
+        version = (self.base_etim.lexicon.version, obtener_config().version_reglas)
+        if version != self._version_cache:
+            # Léxico o reglas cambiaron: invalidar
+            self._cache_candidatos.limpiar()
+            self._version_cache = version
         
-        # Ya vienen ordenados por prioridad desde la base
-        return candidatos
+        clave = (slot_n.token_src.lower(), version)
+        candidatos = self._cache_candidatos.obtener(clave)
+        
+        if candidatos is None:
+            # Ya vienen ordenados por prioridad desde la base
+            candidatos = tuple(self.base_etim.buscar_raices(slot_n.token_src))
+            self._cache_candidatos.guardar(clave, candidatos)
+        
+        return list(candidatos)
+    
+    def estadisticas_cache(self) -> Dict[str, int]:
+        """Contadores de la caché de candidatos (F3)"""
+        return self._cache_candidatos.estadisticas()
+    
+    def sumar_estadisticas_cache(self, aciertos: int, fallos: int, desalojos: int) -> None:
+        """Sumar contadores de las cachés de otros procesos (traducción paralela)"""
+        self._cache_candidatos.aciertos += aciertos
+        self._cache_candidatos.fallos += fallos
+        self._cache_candidatos.desalojos += desalojos
+    
+    def limpiar_cache(self) -> None:
+        """Invalidar la caché de candidatos"""
+        self._cache_candidatos.limpiar()
     
     # ══════════════════════════════════════════════════════════
     # F4. SELECCIÓN
@@ -531,7 +606,7 @@ def crear_slot_n(token_src: str, cat_src: CategoriaGramatical,
     return SlotN(
         token_src=token_src,
         cat_src=cat_src,
-        morph_src=morph or MorfologiaFuente(),
+        morph_src=morph or MORFOLOGIA_FUENTE_DEFECTO,
         pos_index=pos_index,
         status=TokenStatus.PENDIENTE
     )
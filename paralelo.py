@@ -0,0 +1,204 @@
+"""
+════════════════════════════════════════════════════════════════
+SISTEMA DE TRADUCCIÓN ISOMÓRFICA — VERSIÓN PYTHON
+Extensión: Traducción paralela de oraciones (P3-P7)
+════════════════════════════════════════════════════════════════
+
+PROPÓSITO:
+  Repartir la traducción de oraciones entre varios procesos una vez
+  sellado el glosario (P8.A).
+
+PRINCIPIOS:
+  - Cada proceso trabaja sobre una copia del glosario sellado
+  - Las escrituras de Fase B (fase_b_asignar) se registran en el proceso
+    y se devuelven junto con las traducciones
+  - Fusión determinista: las escrituras se aplican al glosario principal
+    en orden de oración
+  - La salida es idéntica byte a byte a la de la traducción serial
+
+LÍMITE:
+  P4 es determinista respecto del token: lo que una oración lee del
+  glosario en Fase B (traducción de un núcleo ya asignado) coincide con
+  lo que calcularía por sí misma. Por eso las oraciones son
+  independientes dado el glosario sellado.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from config import ConfiguracionSistema, establecer_config
+from glossary import Glosario, EscrituraFaseB
+from utils import TokenClasificado
+
+
+# ══════════════════════════════════════════════════════════════
+# ESTRUCTURAS DE DATOS
+# ══════════════════════════════════════════════════════════════
+
+# Oración con su recorte del flujo de tokens
+OracionClasificada = Tuple[str, List[TokenClasificado]]
+
+# Lote de trabajo: (índice de la primera oración, oraciones)
+LoteOraciones = Tuple[int, List[OracionClasificada]]
+
+
+@dataclass
+class ResultadoLote:
+    """Resultado de un lote traducido en un proceso trabajador"""
+    inicio: int
+    traducciones: List[str] = field(default_factory=list)
+    escrituras: List[EscrituraFaseB] = field(default_factory=list)
+    cache_aciertos: int = 0
+    cache_fallos: int = 0
+    candidatos_aciertos: int = 0
+    candidatos_fallos: int = 0
+    candidatos_desalojos: int = 0
+
+
+# ══════════════════════════════════════════════════════════════
+# PROCESO TRABAJADOR
+# ══════════════════════════════════════════════════════════════
+
+# Sistema de traducción propio de cada proceso trabajador
+_sistema_trabajador = None
+
+
+def _inicializar_trabajador(glosario: Glosario, config: ConfiguracionSistema) -> None:
+    """Construir el sistema del proceso con la copia del glosario sellado"""
+    global _sistema_trabajador
+    # Importación diferida: main importa este módulo
+    from main import SistemaTraduccion
+    
+    # El almacén y el diario del glosario y la caché en disco solo los
+    # abre el proceso principal
+    config.ruta_almacen_glosario = None
+    config.ruta_diario_glosario = None
+    config.ruta_cache_oraciones = None
+    glosario.cerrar_diario()
+    glosario.separar_almacen()
+    establecer_config(config)
+    sistema = SistemaTraduccion()
+    sistema.establecer_glosario(glosario)
+    glosario.iniciar_registro_escrituras()
+    _sistema_trabajador = sistema
+
+
+def _traducir_lote(lote: LoteOraciones) -> ResultadoLote:
+    """Traducir un lote de oraciones consecutivas"""
+    inicio, oraciones = lote
+    sistema = _sistema_trabajador
+    cache = sistema.cache_oraciones
+    aciertos, fallos = (cache.aciertos, cache.fallos) if cache is not None else (0, 0)
+    candidatos = sistema.proc_nucleos.estadisticas_cache()
+    
+    traducciones = [
+        sistema._traducir_oracion(oracion, tokens)
+        for oracion, tokens in oraciones
+    ]
+    
+    resultado = ResultadoLote(
+        inicio=inicio,
+        traducciones=traducciones,
+        escrituras=sistema.glosario.extraer_registro_escrituras()
+    )
+    if cache is not None:
+        resultado.cache_aciertos = cache.aciertos - aciertos
+        resultado.cache_fallos = cache.fallos - fallos
+    
+    estadisticas = sistema.proc_nucleos.estadisticas_cache()
+    resultado.candidatos_aciertos = estadisticas["aciertos"] - candidatos["aciertos"]
+    resultado.candidatos_fallos = estadisticas["fallos"] - candidatos["fallos"]
+    resultado.candidatos_desalojos = estadisticas["desalojos"] - candidatos["desalojos"]
+    return resultado
+
+
+# ══════════════════════════════════════════════════════════════
+# TRADUCTOR PARALELO
+# ══════════════════════════════════════════════════════════════
+
+class TraductorParalelo:
+    """
+    Traducción de oraciones en varios procesos
+    
+    Los lotes son contiguos y se consumen en orden, de modo que las
+    escrituras de cada lote se fusionan en el glosario principal en el
+    mismo orden en que las produciría la traducción serial.
+    """
+    
+    def __init__(self, workers: int, lotes_por_worker: int = 4):
+        self.workers = max(1, workers)
+        self.lotes_por_worker = max(1, lotes_por_worker)
+        
+        # Caché de oraciones de los procesos (suma de la última traducción)
+        self.cache_aciertos: int = 0
+        self.cache_fallos: int = 0
+        
+        # Caché de candidatos de P4 de los procesos (ídem)
+        self.candidatos_aciertos: int = 0
+        self.candidatos_fallos: int = 0
+        self.candidatos_desalojos: int = 0
+    
+    def traducir(self, glosario: Glosario, oraciones: List[OracionClasificada],
+                 config: ConfiguracionSistema,
+                 progreso: Optional[Callable[[int], bool]] = None) -> List[str]:
+        """
+        Traducir oraciones en paralelo
+        
+        Args:
+            glosario: Glosario sellado (recibe las escrituras fusionadas)
+            oraciones: Oraciones fuente en orden, con sus tokens clasificados
+            config: Configuración a replicar en los procesos
+            progreso: Recibe el número de oraciones completadas;
+                      si devuelve False se detiene el proceso (PAUSA)
+        
+        Returns:
+            Oraciones traducidas en orden
+        """
+        lotes = dividir_en_lotes(oraciones, self.workers * self.lotes_por_worker)
+        traducciones: List[str] = []
+        self.cache_aciertos = self.cache_fallos = 0
+        self.candidatos_aciertos = self.candidatos_fallos = self.candidatos_desalojos = 0
+        
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_inicializar_trabajador,
+                                 initargs=(glosario, config)) as ejecutor:
+            for resultado in ejecutor.map(_traducir_lote, lotes):
+                glosario.aplicar_escrituras(resultado.escrituras)
+                traducciones.extend(resultado.traducciones)
+                self.cache_aciertos += resultado.cache_aciertos
+                self.cache_fallos += resultado.cache_fallos
+                self.candidatos_aciertos += resultado.candidatos_aciertos
+                self.candidatos_fallos += resultado.candidatos_fallos
+                self.candidatos_desalojos += resultado.candidatos_desalojos
+                
+                if progreso and not progreso(len(traducciones)):
+                    ejecutor.shutdown(wait=True, cancel_futures=True)
+                    break
+        
+        return traducciones
+
+
+# ══════════════════════════════════════════════════════════════
+# FUNCIONES DE AYUDA
+# ══════════════════════════════════════════════════════════════
+
+def normalizar_workers(workers: int) -> int:
+    """Resolver número de procesos (0 = todos los núcleos disponibles)"""
+    if workers == 0:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def dividir_en_lotes(oraciones: List[OracionClasificada],
+                     num_lotes: int) -> List[LoteOraciones]:
+    """Dividir oraciones en lotes contiguos de tamaño similar"""
+    if not oraciones:
+        return []
+    
+    tamano = max(1, -(-len(oraciones) // num_lotes))
+    return [
+        (inicio, oraciones[inicio:inicio + tamano])
+        for inicio in range(0, len(oraciones), tamano)
+    ]
@@ -11,8 +11,9 @@ OUTPUT:  Cand[] (lista priorizada) | [BLOQUEADO]
 PRINCIPIO: Partículas son POLIVALENTES. Pueden variar según función sintáctica.
 """
 
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Iterator, Mapping, Tuple
 from dataclasses import dataclass
+from types import MappingProxyType
 
 from constants import (
     TokenStatus, TokenCategoria, CategoriaGramatical,
@@ -56,6 +57,15 @@ class ResultadoParticula:
         }
 
 
+# Clave de la tabla de candidatos: (token en minúsculas, función, requisito de régimen)
+ClaveCandidatos = Tuple[str, FuncRole, Tuple[str, ...]]
+
+# Entrada de la tabla: (candidatos en orden, polivalencia)
+CandidatosCompilados = Tuple[Tuple[str, ...], bool]
+
+_SIN_CANDIDATOS: CandidatosCompilados = ((), False)
+
+
 # ══════════════════════════════════════════════════════════════
 # BASE DE DATOS DE PARTÍCULAS
 # ══════════════════════════════════════════════════════════════
@@ -64,9 +74,14 @@ class BaseParticulas:
     """
     Base de datos de partículas y sus equivalentes
     Incluye información etimológica y funcional
+    
+    `version` crece con cada cambio de los datos (las tablas de
+    candidatos compiladas a partir de ella se reconstruyen).
     """
     
     def __init__(self):
+        self.version: int = 0
+        
         # Partículas por token fuente
         # Formato: token_src -> {func_role: [(termino_es, es_etimologico, cierra_regimen)]}
         self._particulas: Dict[str, Dict[FuncRole, List[tuple]]] = {
@@ -253,6 +268,28 @@ class BaseParticulas:
     def obtener_regimen_nucleo(self, nucleo: str) -> List[str]:
         """Obtener preposiciones que cierra el régimen de un núcleo"""
         return self._regimenes.get(nucleo.lower(), [])
+    
+    def agregar_particula(self, token_src: str, func_role: FuncRole, termino: str,
+                          etimologico: bool = False, cierra_regimen: bool = True) -> None:
+        """Agregar un equivalente de partícula para una función"""
+        funciones = self._particulas.setdefault(token_src.lower(), {})
+        funciones.setdefault(func_role, []).append((termino, etimologico, cierra_regimen))
+        self.version += 1
+    
+    def agregar_regimen(self, nucleo: str, preposiciones: List[str]) -> None:
+        """Fijar las preposiciones que cierran el régimen de un núcleo"""
+        self._regimenes[nucleo.lower()] = list(preposiciones)
+        self.version += 1
+    
+    def iterar_funciones(self) -> Iterator[Tuple[str, FuncRole]]:
+        """Pares (token, función) con equivalentes registrados"""
+        for token, funciones in self._particulas.items():
+            for func_role in funciones:
+                yield token, func_role
+    
+    def requisitos_posibles(self) -> Set[Tuple[str, ...]]:
+        """Requisitos de régimen que puede devolver obtener_regimen_nucleo"""
+        return {()} | {tuple(preposiciones) for preposiciones in self._regimenes.values()}
 
 
 # Instancia global
@@ -278,10 +315,17 @@ class ProcesadorParticulas:
       F4. Generación de conjuntos
       F5. Construcción de lista
       F6. Salida
+    
+    F4-F5 solo dependen de (token, función, requisito de régimen), un
+    conjunto finito: se compilan para todas las claves en una tabla
+    inmutable, reconstruida cuando cambia la versión de la base.
     """
     
     def __init__(self, base_part: BaseParticulas = None):
         self.base_part = base_part or obtener_base_particulas()
+        self._tabla: Mapping[ClaveCandidatos, CandidatosCompilados] = MappingProxyType({})
+        self._version_tabla: Optional[int] = None
+        self._tabla_candidatos()
     
     def procesar(self, slot_p: SlotP, mtx_s: MatrizFuente,
                  glosario: Glosario) -> Dict[str, Any]:
@@ -310,15 +354,14 @@ class ProcesadorParticulas:
         # F3. Análisis relacional
         func_role, requisito = self._f3_analisis_relacional(slot_p, datos)
         
-        # F4. Generación de conjuntos
-        set_a, set_b = self._f4_generar_conjuntos(slot_p, func_role, requisito)
-        
-        # F5. Construcción de lista
-        candidatos = self._f5_construir_lista(set_a, set_b)
+        # F4-F5. Conjuntos y lista (tabla compilada)
+        candidatos, polivalencia = self._tabla_candidatos().get(
+            (slot_p.token_src.lower(), func_role, tuple(requisito)), _SIN_CANDIDATOS
+        )
         
         # F6. Salida
-        resultado.candidatos = candidatos
-        resultado.polivalencia = len(set_a) == 0 and len(candidatos) > 0
+        resultado.candidatos = list(candidatos)
+        resultado.polivalencia = polivalencia
         
         if resultado.polivalencia:
             resultado.mensaje = "Polivalencia funcional activa"
@@ -428,11 +471,41 @@ class ProcesadorParticulas:
         
         return requisito
     
+    # ══════════════════════════════════════════════════════════
+    # TABLA DE CANDIDATOS (F4-F5 COMPILADOS)
+    # ══════════════════════════════════════════════════════════
+    
+    def _tabla_candidatos(self) -> Mapping[ClaveCandidatos, CandidatosCompilados]:
+        """Tabla de candidatos, recompilada si cambió la base"""
+        if self._version_tabla != self.base_part.version:
+            self._tabla = MappingProxyType(self._compilar_tabla())
+            self._version_tabla = self.base_part.version
+        return self._tabla
+    
+    def _compilar_tabla(self) -> Dict[ClaveCandidatos, CandidatosCompilados]:
+        """
+        F4-F5 para cada (token, función) de la base y cada requisito
+        posible; las claves ausentes no tienen candidatos
+        """
+        tabla: Dict[ClaveCandidatos, CandidatosCompilados] = {}
+        requisitos = self.base_part.requisitos_posibles()
+        
+        for token, func_role in self.base_part.iterar_funciones():
+            for requisito in requisitos:
+                set_a, set_b = self._f4_generar_conjuntos(token, func_role, list(requisito))
+                candidatos = self._f5_construir_lista(set_a, set_b)
+                tabla[(token, func_role, requisito)] = (
+                    tuple(candidatos),
+                    len(set_a) == 0 and len(candidatos) > 0
+                )
+        
+        return tabla
+    
     # ══════════════════════════════════════════════════════════
     # F4. GENERACIÓN DE CONJUNTOS
     # ══════════════════════════════════════════════════════════
     
-    def _f4_generar_conjuntos(self, slot_p: SlotP, func_role: FuncRole,
+    def _f4_generar_conjuntos(self, token_src: str, func_role: FuncRole,
                                requisito: List[str]) -> tuple:
         """
         F4. Generación de conjuntos
@@ -441,14 +514,14 @@ class ProcesadorParticulas:
         SET B: Funcionales que cierran régimen
         """
         # SET A: Etimológicos
-        set_a = self.base_part.buscar_etimologicos(slot_p.token_src, func_role)
+        set_a = self.base_part.buscar_etimologicos(token_src, func_role)
         
         # Filtrar por requisito si existe
         if requisito:
             set_a = [c for c in set_a if c.termino in requisito or not requisito]
         
         # SET B: Funcionales
-        set_b = self.base_part.buscar_funcionales(slot_p.token_src, func_role)
+        set_b = self.base_part.buscar_funcionales(token_src, func_role)
         
         if requisito:
             set_b = [c for c in set_b if c.termino in requisito or not requisito]
@@ -0,0 +1,181 @@
+"""
+════════════════════════════════════════════════════════════════
+SISTEMA DE TRADUCCIÓN ISOMÓRFICA — VERSIÓN PYTHON
+Extensión: Puntos de control de la traducción por archivo
+════════════════════════════════════════════════════════════════
+
+PROPÓSITO:
+  Reanudar traducir_archivo tras una interrupción sin volver a guardar
+  el glosario completo en cada lote.
+
+PRINCIPIOS:
+  - Diario JSON Lines: una línea por lote con el control (párrafos,
+    bytes de salida, tokens) y el delta del glosario (extraer_delta)
+  - Una línea = un punto de control: glosario y control se confirman
+    juntos con una escritura + fsync; una última línea incompleta
+    (caída a mitad de escritura) se descarta al reanudar
+  - La primera línea es la base (delta_completo). Cuando los deltas
+    ocupan más que la base, el diario se reescribe con una base nueva
+    (archivo temporal + os.replace): el coste total es lineal
+  - Generaciones consecutivas: al reanudar se aplican las líneas en
+    orden y se descarta todo lo que siga a un salto
+
+FORMATO:
+  {"generacion": n, "base": true|false, "control": {...}, "delta": {...}}
+"""
+
+import os
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from glossary import Glosario
+
+
+class PuntoControlError(Exception):
+    """No se pudo guardar el punto de control"""
+    pass
+
+
+# ══════════════════════════════════════════════════════════════
+# DIARIO DE PUNTOS DE CONTROL
+# ══════════════════════════════════════════════════════════════
+
+class PuntoControl:
+    """
+    Diario de puntos de control de un archivo en traducción
+
+    Registra los cambios del glosario entre lotes (iniciar_registro_delta)
+    y los añade al diario con el control de cada lote.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.generacion: int = 0
+        self._glosario: Optional[Glosario] = None
+        self._archivo = None
+        self._bytes_base: int = 0
+
+    def iniciar(self, glosario: Glosario, control: Dict[str, Any]) -> bool:
+        """Empezar un diario nuevo con el glosario completo como base"""
+        return self._escribir_base(glosario, control)
+
+    def guardar(self, glosario: Glosario, control: Dict[str, Any]) -> bool:
+        """
+        Añadir el punto de control de un lote
+
+        Returns:
+            False si no se pudo escribir (el siguiente intento escribe
+            una base nueva)
+        """
+        if glosario is not self._glosario or self._archivo is None:
+            return self._escribir_base(glosario, control)
+
+        linea = _linea(self.generacion + 1, False, control, glosario.extraer_delta())
+        if self._archivo.tell() - self._bytes_base + len(linea) > self._bytes_base:
+            return self._escribir_base(glosario, control)
+
+        try:
+            self._archivo.write(linea)
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+        except OSError as e:
+            print(f"Error al guardar punto de control: {e}")
+            self._cerrar_archivo()
+            return False
+
+        self.generacion += 1
+        return True
+
+    def cargar(self) -> Optional[Tuple[Glosario, Dict[str, Any]]]:
+        """
+        Reconstruir el glosario y el control del último punto confirmado
+
+        Una cola no válida (línea incompleta o generación fuera de orden)
+        se recorta del archivo.
+
+        Returns:
+            (glosario, control), o None si no hay diario con base válida
+        """
+        if not os.path.exists(self.ruta):
+            return None
+
+        glosario = None
+        control = None
+        valido = 0
+
+        with open(self.ruta, "rb") as archivo:
+            for linea in archivo:
+                try:
+                    if not linea.endswith(b"\n"):
+                        break
+                    registro = json.loads(linea)
+                    if registro["base"] != (glosario is None):
+                        break
+                    if glosario is None:
+                        glosario = Glosario()
+                        self._bytes_base = len(linea)
+                    elif registro["generacion"] != self.generacion + 1:
+                        break
+                    glosario.aplicar_delta(registro["delta"])
+                except (ValueError, KeyError):
+                    break
+
+                self.generacion = registro["generacion"]
+                control = registro["control"]
+                valido += len(linea)
+
+        if glosario is None:
+            return None
+
+        if valido < os.path.getsize(self.ruta):
+            os.truncate(self.ruta, valido)
+        self._abrir(glosario)
+        return glosario, control
+
+    def cerrar(self) -> None:
+        """Cerrar el diario y dejar de registrar cambios en el glosario"""
+        self._cerrar_archivo()
+        if self._glosario is not None:
+            self._glosario.detener_registro_delta()
+            self._glosario = None
+
+    def _escribir_base(self, glosario: Glosario, control: Dict[str, Any]) -> bool:
+        """Reescribir el diario con una sola línea: el glosario completo"""
+        self.cerrar()
+        self.generacion += 1
+        linea = _linea(self.generacion, True, control, glosario.delta_completo())
+
+        temporal = self.ruta + ".tmp"
+        try:
+            with open(temporal, "wb") as archivo:
+                archivo.write(linea)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            print(f"Error al guardar punto de control: {e}")
+            return False
+
+        self._bytes_base = len(linea)
+        self._abrir(glosario)
+        return True
+
+    def _abrir(self, glosario: Glosario) -> None:
+        self._archivo = open(self.ruta, "ab")
+        self._glosario = glosario
+        glosario.iniciar_registro_delta()
+
+    def _cerrar_archivo(self) -> None:
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+def _linea(generacion: int, base: bool, control: Dict[str, Any],
+           delta: Dict[str, Any]) -> bytes:
+    return (json.dumps({
+        "generacion": generacion,
+        "base": base,
+        "control": control,
+        "delta": delta
+    }, ensure_ascii=False) + "\n").encode("utf-8")
@@ -4,6 +4,9 @@ class ProtocoloError(Exception):
     """Protocolo 0.5: Error que detiene el proceso hasta intervención."""
     pass
 
+# Protocolo 1.A.4: categorías admitidas en el glosario
+CATEGORIAS = ("NUCLEO", "PARTICULA")
+
 class STI_Core:
     def __init__(self):
         self.glossary = {}  # Protocolo 8
@@ -52,6 +55,33 @@ class STI_Core:
         self.status = "P8_A_COMPLETO"
         return f"Análisis P8.A completado. {nuevos} términos nuevos registrados."
 
+    def p8_aplicar_cambios(self, cambios):
+        """
+        Protocolo 8: Ediciones manuales en bloque.
+        cambios: tuplas (token, traducción, categoría). Se valida todo el
+        lote antes de escribir (token registrado, categoría válida); el
+        estado pasa a ASIGNADO con traducción y a PENDIENTE sin ella.
+        Devuelve el número de entradas modificadas.
+        """
+        cambios = [(t, trad or "", cat) for t, trad, cat in cambios]
+        faltantes = [t for t, _, _ in cambios if t not in self.glossary]
+        invalidas = [f"{t}={cat}" for t, _, cat in cambios
+                     if t in self.glossary and cat not in CATEGORIAS]
+        errores = []
+        if faltantes:
+            errores.append(f"TOKENS NO REGISTRADOS: {faltantes[:5]}... (Total: {len(faltantes)})")
+        if invalidas:
+            errores.append(f"CATEGORÍAS NO VÁLIDAS {CATEGORIAS}: {invalidas[:5]}... (Total: {len(invalidas)})")
+        if errores:
+            raise ProtocoloError(" | ".join(errores))
+
+        for token, trad, categoria in cambios:
+            entry = self.glossary[token]
+            entry['token_tgt'] = trad
+            entry['categoria'] = categoria
+            entry['status'] = "ASIGNADO" if trad else "PENDIENTE"
+        return len(cambios)
+
     def p8_ia_autocompletar(self, api_key):
         """
         Usa IA para sugerir traducciones a los núcleos vacíos (PENDIENTE).
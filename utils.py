@@ -1,7 +1,9 @@
 import re
 import json
 import os
-from typing import List, Dict, Optional, Any, Tuple, Generator
+from typing import List, Dict, Optional, Any, Tuple, Generator, NamedTuple, Iterator
+from bisect import bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
@@ -131,6 +133,180 @@ class ClasificadorGramatical:
         return cat == TokenCategoria.NUCLEO
 
 
+# ──────────────────────────────────────────────────────────────
+# FLUJO DE TOKENS (P10.A / P8.A)
+# ──────────────────────────────────────────────────────────────
+
+# Token clasificado: (token, categoria, cat_gramatical)
+TokenClasificado = Tuple[str, TokenCategoria, CategoriaGramatical]
+
+
+class TokenFlujo(NamedTuple):
+    """Token del flujo con su contexto"""
+    token: str
+    desplazamiento: int  # Posición del primer carácter en el texto limpio
+    oracion: int         # Índice de la oración
+    categoria: TokenCategoria
+    cat_gramatical: CategoriaGramatical
+
+
+class FlujoTokens:
+    """
+    Flujo único de tokens del texto limpio
+    
+    Se tokeniza y clasifica una sola vez: P8.A consume el flujo completo
+    y la construcción de Mtx_S lo recorta por oración.
+    
+    Los índices del flujo coinciden con los de Tokenizador.tokenizar()
+    sobre el texto completo (las oraciones solo se separan en espacios).
+    """
+    
+    def __init__(self):
+        self.tokens: List[str] = []
+        self.desplazamientos: List[int] = []
+        self.categorias: List[TokenCategoria] = []
+        self.cats_gramaticales: List[CategoriaGramatical] = []
+        
+        # Primer índice de token de cada oración
+        self._inicios_oracion: List[int] = []
+    
+    @classmethod
+    def construir(cls, texto: str, oraciones: List[str]) -> 'FlujoTokens':
+        """
+        Construir flujo desde el texto limpio y sus oraciones
+        
+        Args:
+            texto: Texto limpio completo
+            oraciones: Oraciones en orden (Tokenizador.dividir_oraciones)
+        """
+        flujo = cls()
+        clasificaciones: Dict[str, Tuple[TokenCategoria, CategoriaGramatical]] = {}
+        cursor = 0
+        
+        for oracion in oraciones:
+            inicio_oracion = texto.find(oracion, cursor)
+            if inicio_oracion == -1:
+                inicio_oracion = cursor
+            cursor = inicio_oracion + len(oracion)
+            
+            flujo._inicios_oracion.append(len(flujo.tokens))
+            
+            for match in Tokenizador._PATRON_PALABRAS.finditer(oracion):
+                token = match.group()
+                clasificacion = clasificaciones.get(token)
+                if clasificacion is None:
+                    clasificacion = ClasificadorGramatical.clasificar(token)
+                    clasificaciones[token] = clasificacion
+                
+                flujo.tokens.append(token)
+                flujo.desplazamientos.append(inicio_oracion + match.start())
+                flujo.categorias.append(clasificacion[0])
+                flujo.cats_gramaticales.append(clasificacion[1])
+        
+        return flujo
+    
+    def __len__(self) -> int:
+        return len(self.tokens)
+    
+    def __getitem__(self, indice: int) -> TokenFlujo:
+        return TokenFlujo(
+            self.tokens[indice],
+            self.desplazamientos[indice],
+            self.oracion_de(indice),
+            self.categorias[indice],
+            self.cats_gramaticales[indice]
+        )
+    
+    @property
+    def num_oraciones(self) -> int:
+        return len(self._inicios_oracion)
+    
+    def rango_oracion(self, oracion: int) -> Tuple[int, int]:
+        """Rango [inicio, fin) de índices de token de una oración"""
+        inicio = self._inicios_oracion[oracion]
+        if oracion + 1 < len(self._inicios_oracion):
+            return inicio, self._inicios_oracion[oracion + 1]
+        return inicio, len(self.tokens)
+    
+    def oracion_de(self, indice: int) -> int:
+        """Índice de la oración que contiene el token"""
+        return bisect_right(self._inicios_oracion, indice) - 1
+    
+    def tokens_clasificados(self) -> List[TokenClasificado]:
+        """Flujo completo como (token, categoria, cat_gramatical)"""
+        return list(zip(self.tokens, self.categorias, self.cats_gramaticales))
+    
+    def oracion(self, oracion: int) -> List[TokenClasificado]:
+        """Tokens clasificados de una oración"""
+        inicio, fin = self.rango_oracion(oracion)
+        return list(zip(
+            self.tokens[inicio:fin],
+            self.categorias[inicio:fin],
+            self.cats_gramaticales[inicio:fin]
+        ))
+
+
+# ──────────────────────────────────────────────────────────────
+# CACHÉ LRU
+# ──────────────────────────────────────────────────────────────
+
+class CacheLRU:
+    """
+    Caché acotada con desalojo del elemento usado hace más tiempo
+    
+    Lleva contadores de aciertos, fallos y desalojos.
+    """
+    
+    def __init__(self, capacidad: int = 4096):
+        self.capacidad = max(1, capacidad)
+        self._datos: OrderedDict = OrderedDict()
+        self.aciertos: int = 0
+        self.fallos: int = 0
+        self.desalojos: int = 0
+    
+    def obtener(self, clave: Any, defecto: Any = None) -> Any:
+        """Obtener valor (cuenta acierto o fallo)"""
+        try:
+            valor = self._datos[clave]
+        except KeyError:
+            self.fallos += 1
+            return defecto
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+    
+    def guardar(self, clave: Any, valor: Any) -> None:
+        """Guardar valor, desalojando el más antiguo si no cabe"""
+        self._datos[clave] = valor
+        self._datos.move_to_end(clave)
+        if len(self._datos) > self.capacidad:
+            self._datos.popitem(last=False)
+            self.desalojos += 1
+    
+    def limpiar(self) -> None:
+        """Vaciar la caché (los contadores se conservan)"""
+        self._datos.clear()
+    
+    def __len__(self) -> int:
+        return len(self._datos)
+    
+    def __contains__(self, clave: Any) -> bool:
+        return clave in self._datos
+    
+    def tasa_aciertos(self) -> float:
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+    
+    def estadisticas(self) -> Dict[str, int]:
+        return {
+            "tamano": len(self._datos),
+            "capacidad": self.capacidad,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos
+        }
+
+
 # ──────────────────────────────────────────────────────────────
 # GESTOR DE ARCHIVOS
 # ──────────────────────────────────────────────────────────────
@@ -182,6 +358,50 @@ class GestorArchivos:
             print(f"Error al cargar texto: {e}")
             return None
     
+    @staticmethod
+    def guardar_texto_atomico(texto: str, ruta: str) -> bool:
+        """Guardar texto plano reemplazando el archivo de una vez"""
+        temporal = ruta + ".tmp"
+        try:
+            with open(temporal, 'w', encoding='utf-8') as f:
+                f.write(texto)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, ruta)
+            return True
+        except Exception as e:
+            print(f"Error al guardar texto: {e}")
+            return False
+    
+    @staticmethod
+    def leer_parrafos(ruta: str, desde: int = 0) -> Iterator[str]:
+        """
+        Leer texto plano párrafo a párrafo (separados por línea en blanco)
+        
+        Solo mantiene en memoria el párrafo en curso.
+        
+        Args:
+            ruta: Archivo de texto
+            desde: Número de párrafos iniciales que se omiten
+        """
+        indice = 0
+        lineas: List[str] = []
+        
+        with open(ruta, 'r', encoding='utf-8') as f:
+            for linea in f:
+                linea = linea.rstrip('\n')
+                if linea.strip():
+                    lineas.append(linea)
+                    continue
+                if lineas:
+                    if indice >= desde:
+                        yield '\n'.join(lineas)
+                    indice += 1
+                    lineas = []
+        
+        if lineas and indice >= desde:
+            yield '\n'.join(lineas)
+    
     @staticmethod
     def existe(ruta: str) -> bool:
         """Verificar si archivo existe"""